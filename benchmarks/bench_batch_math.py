@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: arithmetic problem throughput, scalar generators vs NumPy batch
+
+The scalar path generates one problem at a time from the same operation mix
+and compiled operand spaces (operation_settings.json) as generate_batch().
+The batch path is timed twice: drawing operands and answers only, and
+additionally formatting every problem as a dict.
+
+Usage:
+    python benchmarks/bench_batch_math.py                    # 200k problems
+    python benchmarks/bench_batch_math.py --problems 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.batch_math import OPERATIONS
+
+
+def scalar_problems(generator, age_group, count):
+    age_spec = generator._age_spec(age_group)
+    distribution = {
+        problem_type: share
+        for problem_type, share in age_spec.distribution(1000).items()
+        if problem_type in OPERATIONS
+    }
+    total = sum(distribution.values())
+    problems = []
+    for operation, share in distribution.items():
+        # The same compiled operand space generate_batch() samples from
+        spec = age_spec.operations[operation]
+        for _ in range(round(count * share / total)):
+            problems.append(generator._arithmetic_problem(spec))
+    return problems
+
+
+def rate(function, count):
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", type=int, default=200_000)
+    args = parser.parse_args()
+    count = args.problems
+
+    print(f"🧮 {count:,} arithmetic problems per age group (problems/second)")
+    for age_group in ["4-5", "6-7", "8-10"]:
+        scalar = rate(
+            lambda: scalar_problems(MathGenerator(seed=1), age_group, count), count
+        )
+        arrays = rate(
+            lambda: MathGenerator(seed=1).generate_batch(age_group, count), count
+        )
+        formatted = rate(
+            lambda: MathGenerator(seed=1).generate_batch(age_group, count).to_dicts(),
+            count,
+        )
+        print(
+            f"  {age_group:<5} scalar {scalar:>12,.0f}   batch {arrays:>12,.0f} "
+            f"({arrays / scalar:5.0f}x)   batch+format {formatted:>10,.0f} "
+            f"({formatted / scalar:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: draws per second of difficulty-graded arithmetic, by band
+
+"rejection" draws a random operand pair of the operation and retries until
+its features match the band, which is what a generator has to do without an
+index. "indexed" draws from the band of the difficulty index directly, and
+"problems" is generate_graded_problems() (uniqueness and Problem records
+included). The "share" column is the fraction of all pairs in the band: the
+smaller it is, the more rejection sampling has to retry.
+
+Usage:
+    python benchmarks/bench_difficulty.py                   # ages 8-10
+    python benchmarks/bench_difficulty.py --max-num 1000    # 3-digit operands
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.difficulty import (
+    MULTI_VALUED_FEATURES,
+    OPERATION_FEATURES,
+    DifficultyIndex,
+    pair_features,
+)
+from worksheet_generator.core.operation_specs import operation_spec
+
+BANDS = [
+    ("addition", {"carries": 0}),
+    ("addition", {"carries": 1}),
+    ("addition", {"carries": 2}),
+    ("addition", {"carries": 2, "result_digits": 3}),
+    ("subtraction", {"borrows": 0}),
+    ("subtraction", {"borrows": 1}),
+    ("subtraction", {"borrows": 2, "digits": 3}),
+    ("multiplication", {"table": 7}),
+    ("division", {"table": 12}),
+]
+
+
+def rejection_rate(spec, filters, draws, rng):
+    positions = [
+        (
+            OPERATION_FEATURES[spec.operation].index(feature),
+            value,
+            (spec.operation, feature) in MULTI_VALUED_FEATURES,
+        )
+        for feature, value in filters.items()
+    ]
+    start = time.perf_counter()
+    for _ in range(draws):
+        while True:
+            pair = spec.space.unrank(rng.randrange(spec.space.size))
+            features = pair_features(spec.operation, *pair)
+            if all(
+                value in features[position] if multi else features[position] == value
+                for position, value, multi in positions
+            ):
+                break
+    return draws / (time.perf_counter() - start)
+
+
+def indexed_rate(band, draws, rng):
+    start = time.perf_counter()
+    for _ in range(draws):
+        band.unrank(rng.randrange(band.size))
+    return draws / (time.perf_counter() - start)
+
+
+def problems_rate(generator, age_group, operation, filters, draws):
+    start = time.perf_counter()
+    generator.generate_graded_problems(age_group, operation, draws, **filters)
+    return draws / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--draws", type=int, default=20_000)
+    parser.add_argument("--age", default="8-10")
+    parser.add_argument(
+        "--max-num", type=int, help="Use non-simple ranges up to this number"
+    )
+    args = parser.parse_args()
+    generator = MathGenerator(seed=1)
+    rng = random.Random(1)
+
+    label = f"max {args.max_num}" if args.max_num else f"ages {args.age}"
+    print(f"🎯 Difficulty bands, {label} (draws/second)")
+    for operation, filters in BANDS:
+        if args.max_num:
+            spec = operation_spec(operation, args.max_num, False)
+        else:
+            spec = generator._age_spec(args.age).operations[operation]
+        start = time.perf_counter()
+        index = DifficultyIndex(spec)
+        build = time.perf_counter() - start
+        band = index.band(**filters)
+        name = f"{operation} " + ", ".join(f"{k}={v}" for k, v in filters.items())
+        if not band.size:
+            print(f"  {name:<42} (empty band)")
+            continue
+
+        rejection = rejection_rate(spec, filters, args.draws, rng)
+        indexed = indexed_rate(band, args.draws, rng)
+        line = (
+            f"  {name:<42} share {band.size / spec.space.size:6.1%}   "
+            f"rejection {rejection:10,.0f}   indexed {indexed:10,.0f} "
+            f"({indexed / rejection:5.1f}x)"
+        )
+        if not args.max_num:
+            problems = problems_rate(
+                generator, args.age, operation, filters, args.draws
+            )
+            line += f"   problems {problems:9,.0f}"
+        print(f"{line}   build {build * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
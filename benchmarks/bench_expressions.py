@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-step expression problems per second as the uniqueness set grows
+
+Streams expression problems of ages 8-10 (with a larger copy of the
+"expressions" settings, so the space holds millions of expressions) and
+times every chunk while the uniqueness registry grows past 100k canonical
+forms. "enumerated" is MathGenerator.iter_problems(), which draws from the
+enumerated expression space; "rejection" builds random trees and retries
+until one meets the rules and has an unused canonical form, which is what a
+generator has to do without the enumeration.
+
+Usage:
+    python benchmarks/bench_expressions.py                  # 100k problems
+    python benchmarks/bench_expressions.py --problems 200000 --chunk 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.expressions import (
+    APPLY,
+    ExpressionRules,
+    canonical,
+    operator_patterns,
+)
+from worksheet_generator.data.data_loader import DataSourceLoader
+
+SETTINGS_FILE = os.path.join("math_source", "operation_settings.json")
+
+EXPRESSIONS = {
+    "number_range": {"min": 1, "max": 20},
+    "max_value": 100,
+    "max_factor": 12,
+    "steps": [2, 3],
+}
+
+
+def build_bank(tmp):
+    data_path = os.path.join(tmp, "data_source")
+    shutil.copytree(project_root / "data_source", data_path)
+    path = os.path.join(data_path, SETTINGS_FILE)
+    with open(path, encoding="utf-8") as f:
+        settings_data = json.load(f)
+    settings_data["operation_settings"]["8-10"]["expressions"] = EXPRESSIONS
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(settings_data, f)
+    return data_path
+
+
+def rejection_chunks(rules, steps, total, chunk, rng):
+    patterns = [
+        pattern
+        for count in steps
+        for pattern in operator_patterns(count, rules.operators)
+    ]
+    seen = set()
+    while len(seen) < total:
+        start = time.perf_counter()
+        attempts = 0
+        target = len(seen) + chunk
+        while len(seen) < target:
+            attempts += 1
+            tree, value = _checked(rng.choice(patterns), rules, rng)
+            if tree is not None:
+                seen.add(canonical(tree))
+        yield len(seen), chunk / (time.perf_counter() - start), attempts / chunk
+
+
+def _checked(pattern, rules, rng):
+    """Random tree of a pattern with every intermediate value in range"""
+    if pattern is None:
+        value = rng.randint(rules.leaf_min, rules.leaf_max)
+        return value, value
+    symbol, left, right = pattern
+    left, x = _checked(left, rules, rng)
+    if left is None:
+        return None, None
+    right, y = _checked(right, rules, rng)
+    if right is None:
+        return None, None
+    if symbol == "×" and not (x >= 2 and y >= 2 and min(x, y) <= rules.max_factor):
+        return None, None
+    if symbol == "÷" and (not 2 <= y <= rules.max_factor or x % y):
+        return None, None
+    value = APPLY[symbol](x, y)
+    if not 1 <= value <= rules.max_value:
+        return None, None
+    return (symbol, left, right), value
+
+
+def enumerated_chunks(generator, total, chunk):
+    stream = generator.iter_problems(
+        "8-10", distribution={"multi_step": 1}, limit=total
+    )
+    produced = 0
+    while produced < total:
+        start = time.perf_counter()
+        for _ in range(chunk):
+            next(stream)["question"]
+        produced += chunk
+        yield generator.registry.count("expr"), chunk / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", type=int, default=100_000)
+    parser.add_argument("--chunk", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = MathGenerator(DataSourceLoader(build_bank(tmp)), seed=1)
+        start = time.perf_counter()
+        space = generator._expression_space(generator._age_spec("8-10"), "multi_step")
+        build = time.perf_counter() - start
+        print(
+            f"🧮 Expression space: {space.size:,} expressions "
+            f"(steps {EXPRESSIONS['steps']}), enumerated in {build * 1000:.0f} ms"
+        )
+
+        print("  enumerated (iter_problems, Problem records and text included)")
+        for unique, rate in enumerated_chunks(generator, args.problems, args.chunk):
+            print(f"    {unique:>9,} unique   {rate:10,.0f} problems/s")
+
+    rules = ExpressionRules(1, 20, 100, 12)
+    print("  rejection (random trees, canonical keys only)")
+    for unique, rate, attempts in rejection_chunks(
+        rules, tuple(EXPRESSIONS["steps"]), args.problems, args.chunk, random.Random(1)
+    ):
+        print(
+            f"    {unique:>9,} unique   {rate:10,.0f} problems/s"
+            f"   {attempts:6.1f} attempts/problem"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-worker private memory when generating with forked workers
+
+Three ways of giving 16 forked workers the content bank are compared:
+
+* reparse   - every worker builds and loads its own DataSourceLoader
+* inherited - the parent preloads mutable content before forking
+* frozen    - the parent calls prepare_for_fork() before forking
+
+Each worker generates worksheets, runs a full garbage collection and then
+reports its unique set size (private clean + private dirty pages from
+/proc/self/smaps_rollup), i.e. the memory that is not shared with the parent.
+
+Usage:
+    python benchmarks/bench_fork_sharing.py
+    python benchmarks/bench_fork_sharing.py --workers 8 --scale 50
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from benchmarks.content_bank import build_scaled_bank
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+from worksheet_generator.data import DataSourceLoader
+
+_shared_loader = None
+
+
+def private_memory_bytes() -> int:
+    """Unique set size of the current process"""
+    total = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def worker(mode: str, bank: str, worksheets: int, results):
+    if mode == "reparse":
+        loader = DataSourceLoader(bank)
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader.preload()
+    else:
+        loader = _shared_loader
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for generator_class in [MathGenerator, LogicGenerator, ReadingGenerator]:
+            generator = generator_class()
+            generator.data_source = loader
+            for i in range(worksheets):
+                age_group = ["4-5", "6-7", "8-10"][i % 3]
+                try:
+                    generator.generate_problems(age_group, 30)
+                except ValueError:
+                    # Word problem templates can hit empty number ranges
+                    pass
+
+    gc.collect()
+    results.put(private_memory_bytes())
+
+
+def run_mode(mode: str, bank: str, workers: int, worksheets: int) -> float:
+    global _shared_loader
+    _shared_loader = None
+    gc.unfreeze()
+    gc.collect()
+
+    if mode != "reparse":
+        _shared_loader = DataSourceLoader(bank)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if mode == "frozen":
+                _shared_loader.prepare_for_fork()
+            else:
+                _shared_loader.preload()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(mode, bank, worksheets, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    sizes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return statistics.mean(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--worksheets", type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("This benchmark reads /proc/self/smaps_rollup and needs Linux")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = build_scaled_bank(tmp, args.scale)
+        print(f"📦 {args.scale}x content bank, {args.workers} forked workers")
+        for mode in ["reparse", "inherited", "frozen"]:
+            size = run_mode(mode, bank, args.workers, args.worksheets)
+            print(
+                f"  {mode:<10} {size / 1024 / 1024:7.1f} MB private per worker   "
+                f"{size * args.workers / 1024 / 1024:8.1f} MB total"
+            )
+
+
+if __name__ == "__main__":
+    main()
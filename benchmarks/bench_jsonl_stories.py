@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sampling stories from a large bank, JSON vs indexed JSON Lines
+
+The story files are scaled up to the requested number of stories per story
+file and converted to JSONL. Each backend is measured in a fresh
+interpreter: time and resident memory growth to serve the first sample of
+stories, and the mean latency of later samples (10 stories each).
+
+Usage:
+    python benchmarks/bench_jsonl_stories.py                  # 50k stories per level
+    python benchmarks/bench_jsonl_stories.py --stories 10000
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from benchmarks.content_bank import build_scaled_bank
+from worksheet_generator.data import DataSourceLoader, convert_story_files
+
+MEASURE_SCRIPT = """
+import contextlib, io, json, os, sys, time
+sys.path.insert(0, {root!r})
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+from worksheet_generator.data import DataSourceLoader
+before = rss_bytes()
+start = time.perf_counter()
+loader = DataSourceLoader({path!r}, use_mmap={use_mmap!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    loader.get_stories("6-7", sample=10)
+first = time.perf_counter() - start
+memory = rss_bytes() - before
+
+ages = ["4-5", "6-7", "8-10"]
+rounds = {rounds}
+start = time.perf_counter()
+for i in range(rounds):
+    loader.get_stories(ages[i % 3], sample=10)
+latency = (time.perf_counter() - start) / rounds
+print(json.dumps({{"first": first, "memory": memory, "latency": latency}}))
+"""
+
+
+def measure(path: str, use_mmap: bool, rounds: int) -> dict:
+    script = MEASURE_SCRIPT.format(
+        root=str(project_root), path=path, use_mmap=use_mmap, rounds=rounds
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stories", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=3000)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/statm"):
+        sys.exit("This benchmark reads /proc/self/statm and needs Linux")
+
+    base_stories = len(DataSourceLoader(str(project_root / "data_source")).get_stories("4-5"))
+    scale = math.ceil(args.stories / base_stories)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_bank = build_scaled_bank(tmp, scale)
+        jsonl_bank = os.path.join(tmp, "jsonl")
+        os.makedirs(os.path.join(jsonl_bank, "reading_source"))
+        for source in Path(json_bank, "reading_source").glob("*_stories.json"):
+            shutil.copy(source, os.path.join(jsonl_bank, "reading_source"))
+        convert_story_files(jsonl_bank)
+        for source in Path(jsonl_bank, "reading_source").glob("*_stories.json"):
+            os.remove(source)
+
+        print(f"📚 {base_stories * scale:,} stories per story level ({scale}x)")
+        for label, path, use_mmap in [
+            ("json", json_bank, False),
+            ("jsonl", jsonl_bank, False),
+            ("jsonl+mmap", jsonl_bank, True),
+        ]:
+            result = measure(path, use_mmap, args.rounds)
+            print(
+                f"  {label:<11} first sample {result['first'] * 1000:8.1f} ms   "
+                f"RSS +{result['memory'] / 1024 / 1024:7.1f} MB   "
+                f"{result['latency'] * 1e6:8.1f} µs/sample"
+            )
+
+
+if __name__ == "__main__":
+    main()
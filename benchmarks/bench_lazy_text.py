@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 100k math problems with lazily rendered question/explanation text
+
+Each run generates the same seeded problems, then reads what a given kind of
+run needs: "answer key" reads both text fields, "worksheet" only the
+questions, "JSON export" dumps question, answer and type, and "generate only"
+reads nothing. The eager column renders both text fields of every problem
+first, which is what every run paid before text became lazy.
+
+Usage:
+    python benchmarks/bench_lazy_text.py                   # 100k problems
+    python benchmarks/bench_lazy_text.py --problems 500000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+
+EXPORT_KEYS = ("question", "answer", "type")
+
+
+def answer_key(problems):
+    for problem in problems:
+        problem["question"], problem["explanation"]
+
+
+def worksheet(problems):
+    for problem in problems:
+        problem["question"]
+
+
+def json_export(problems):
+    json.dumps([problem.to_dict(EXPORT_KEYS) for problem in problems])
+
+
+RUNS = {
+    "answer key": answer_key,
+    "worksheet": worksheet,
+    "JSON export": json_export,
+    "generate only": lambda problems: None,
+}
+
+
+def timed(generate, consume, eager):
+    start = time.perf_counter()
+    problems = generate()
+    if eager:
+        answer_key(problems)
+    consume(problems)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", type=int, default=100_000)
+    parser.add_argument("--age", default="8-10")
+    args = parser.parse_args()
+    count, age_group = args.problems, args.age
+
+    def scalar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return MathGenerator(seed=1).generate_problems(age_group, count)
+
+    def batch():
+        return MathGenerator(seed=1).generate_batch(age_group, count).to_problems()
+
+    print(f"✏️  {count:,} math problems, ages {age_group} (seconds)")
+    for name, generate in [("scalar", scalar), ("batch", batch)]:
+        for run, consume in RUNS.items():
+            eager = timed(generate, consume, eager=True)
+            lazy = timed(generate, consume, eager=False)
+            print(
+                f"  {name:<7} {run:<14} eager {eager:7.3f}   lazy {lazy:7.3f}   "
+                f"({eager / lazy:4.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
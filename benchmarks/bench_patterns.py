@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: drawing every repeating pattern of a template, retries vs unranking
+
+"sample" is the previous approach: random.sample the template's items and
+retry until the sequence has not been used yet, so the last patterns of a
+template take more and more attempts. "unrank" draws pattern numbers from
+the compiled pattern space without replacement, one attempt per pattern.
+
+Usage:
+    python benchmarks/bench_patterns.py
+    python benchmarks/bench_patterns.py --pool 12 --period 4
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core.cyclic_patterns import compile_cyclic_pattern
+from worksheet_generator.utils.sampling import SpaceSampler
+
+FAMILIES = {2: "AB", 3: "ABC", 4: "ABCD"}
+
+
+def template(items, period, length):
+    return {
+        "type": f"{FAMILIES[period]}_shape",
+        "shapes": items,
+        "pattern_length": length,
+    }
+
+
+def sample_all(items, period, length, rng):
+    seen = set()
+    attempts = 0
+    total = len(compile_cyclic_pattern(template(items, period, length)))
+    while len(seen) < total:
+        attempts += 1
+        cycle = rng.sample(items, period)
+        sequence = (cycle * (length // period + 1))[:length]
+        seen.add("_".join(item["symbol"] for item in sequence[:-1]))
+    return attempts
+
+
+def unrank_all(pattern, rng):
+    sampler = SpaceSampler(pattern, rng)
+    questions = set()
+    for _ in range(pattern.size):
+        params = sampler.draw()
+        questions.add(pattern.question(params))
+    return len(questions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool", type=int, default=8, help="Items per template")
+    parser.add_argument("--period", type=int, choices=[2, 3, 4])
+    args = parser.parse_args()
+
+    items = [
+        {"name": f"item {i}", "symbol": chr(0x1F600 + i)} for i in range(args.pool)
+    ]
+    print(f"🔁 Every pattern of a {args.pool}-item template")
+    for period in [args.period] if args.period else [2, 3, 4]:
+        length = 2 * period
+        pattern = compile_cyclic_pattern(template(items, period, length))
+
+        start = time.perf_counter()
+        attempts = sample_all(items, period, length, random.Random(1))
+        sample_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        drawn = unrank_all(pattern, random.Random(1))
+        unrank_time = time.perf_counter() - start
+        assert drawn == pattern.size
+
+        print(
+            f"  {FAMILIES[period]:<4} {pattern.size:>6,} patterns   "
+            f"sample {attempts / pattern.size:5.1f} attempts/pattern "
+            f"{sample_time * 1000:8.1f} ms   "
+            f"unrank 1.0 attempts/pattern {unrank_time * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
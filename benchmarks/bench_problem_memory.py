@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory per problem of a large bank, plain dicts vs Problem records
+
+Measured with tracemalloc while the bank is built, so only the problems (and
+the list holding them) are counted. Three banks are compared:
+
+- generated: arithmetic problems formatted from MathGenerator.generate_batch()
+- tagged: the same problems with a "subject" key, as in comprehensive banks
+- loaded: the bank read back from JSON Lines, where every "type" and
+  "subject" string would otherwise be a separate copy
+
+Usage:
+    python benchmarks/bench_problem_memory.py                    # 1M problems
+    python benchmarks/bench_problem_memory.py --problems 200000
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator, Problem
+
+
+def traced_bytes(build):
+    """Memory held by the result of build(), in bytes"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return current
+
+
+def tagged(problems):
+    for problem in problems:
+        problem["subject"] = "math"
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", type=int, default=1_000_000)
+    args = parser.parse_args()
+    count = args.problems
+
+    batch = MathGenerator(seed=1).generate_batch("8-10", count)
+    lines = [
+        json.dumps({**problem, "subject": "math"}) for problem in batch.to_dicts()
+    ]
+
+    banks = {
+        "generated": (
+            lambda: batch.to_dicts(),
+            lambda: batch.to_problems(),
+        ),
+        "tagged": (
+            lambda: tagged(batch.to_dicts()),
+            lambda: tagged(batch.to_problems()),
+        ),
+        "loaded": (
+            lambda: [json.loads(line) for line in lines],
+            lambda: [Problem.from_dict(json.loads(line)) for line in lines],
+        ),
+    }
+
+    print(f"🧠 {count:,}-problem bank, bytes per problem (tracemalloc)")
+    for name, (as_dicts, as_problems) in banks.items():
+        dict_bytes = traced_bytes(as_dicts) / count
+        problem_bytes = traced_bytes(as_problems) / count
+        print(
+            f"  {name:<10} dict {dict_bytes:7.1f}   Problem {problem_bytes:7.1f}   "
+            f"saved {1 - problem_bytes / dict_bytes:5.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start content loading with and without the compiled snapshot
+
+Each measurement runs in a fresh interpreter so nothing is shared between
+runs except the operating system's file cache.
+
+Usage:
+    python benchmarks/bench_snapshot.py            # 100x content bank
+    python benchmarks/bench_snapshot.py --scale 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from benchmarks.content_bank import build_scaled_bank
+
+LOAD_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+from worksheet_generator.data.data_loader import DataSourceLoader
+start = time.perf_counter()
+loader = DataSourceLoader({path!r}, use_snapshot={use_snapshot})
+loader.get_math_source(); loader.get_logic_source(); loader.get_reading_source()
+print(time.perf_counter() - start)
+"""
+
+
+def time_cold_start(data_source_path: str, use_snapshot: bool, repeats: int) -> float:
+    """Median load time in seconds over several fresh interpreters"""
+    script = LOAD_SCRIPT.format(
+        root=str(project_root), path=data_source_path, use_snapshot=use_snapshot
+    )
+    timings = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = build_scaled_bank(tmp, args.scale)
+        bank_size = sum(
+            os.path.getsize(os.path.join(d, f))
+            for d, _, files in os.walk(bank)
+            for f in files
+            if f.endswith(".json")
+        )
+        print(f"📦 Content bank: {args.scale}x ({bank_size / 1024 / 1024:.1f} MB of JSON)")
+
+        json_time = time_cold_start(bank, use_snapshot=False, repeats=args.repeats)
+
+        # First snapshot run compiles the snapshot; subsequent runs reuse it
+        time_cold_start(bank, use_snapshot=True, repeats=1)
+        snapshot_time = time_cold_start(bank, use_snapshot=True, repeats=args.repeats)
+
+        print(f"  JSON parse:      {json_time * 1000:8.1f} ms")
+        print(f"  Snapshot load:   {snapshot_time * 1000:8.1f} ms")
+        print(f"  Speedup:         {json_time / snapshot_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
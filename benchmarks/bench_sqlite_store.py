@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and per-query latency of the JSON vs SQLite content backends
+
+The reading and logic content banks are scaled up to the requested item
+counts. Each backend is measured in a fresh interpreter: resident memory
+growth after the content is ready to serve, and the mean latency of a
+sampling query (10 random items) as used by the generators.
+
+Usage:
+    python benchmarks/bench_sqlite_store.py                 # 10k and 100k items
+    python benchmarks/bench_sqlite_store.py --items 50000
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from benchmarks.content_bank import build_scaled_bank
+from worksheet_generator.data.sqlite_store import (
+    SQLiteContentStore,
+    STORE_SUBJECTS,
+    _iter_source_items,
+)
+
+MEASURE_SCRIPT = """
+import contextlib, io, json, os, sys, time
+sys.path.insert(0, {root!r})
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+from worksheet_generator.data import DataSourceLoader, SQLiteContentStore
+before = rss_bytes()
+if {backend!r} == "sqlite":
+    loader = DataSourceLoader({path!r}, store=SQLiteContentStore({db!r}))
+else:
+    loader = DataSourceLoader({path!r})
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader.get_reading_source(); loader.get_logic_source()
+
+ages = ["4-5", "6-7", "8-10"]
+queries = [
+    loader.get_stories, loader.get_vocabulary_exercises, loader.get_reasoning_problems
+]
+for query in queries:
+    query("6-7", sample=10)
+memory = rss_bytes() - before
+
+rounds = {rounds}
+start = time.perf_counter()
+for i in range(rounds):
+    queries[i % 3](ages[i % 3], sample=10)
+latency = (time.perf_counter() - start) / rounds
+print(json.dumps({{"memory": memory, "latency": latency}}))
+"""
+
+
+def count_base_items() -> int:
+    """Number of reading and logic items in the current content bank"""
+    total = 0
+    for directory in STORE_SUBJECTS.values():
+        for json_file in (project_root / "data_source" / directory).glob("*.json"):
+            with open(json_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            total += sum(1 for _ in _iter_source_items(json_file.stem, data))
+    return total
+
+
+def measure(backend: str, path: str, db: str, rounds: int) -> dict:
+    script = MEASURE_SCRIPT.format(
+        root=str(project_root), backend=backend, path=path, db=db, rounds=rounds
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, action="append")
+    parser.add_argument("--rounds", type=int, default=3000)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/statm"):
+        sys.exit("This benchmark reads /proc/self/statm and needs Linux")
+
+    base_items = count_base_items()
+    for target in args.items or [10_000, 100_000]:
+        scale = math.ceil(target / base_items)
+        with tempfile.TemporaryDirectory() as tmp:
+            bank = build_scaled_bank(tmp, scale)
+            db = os.path.join(tmp, "content.db")
+            store = SQLiteContentStore(db)
+            imported = store.import_data_source(bank)
+            store.close()
+
+            print(f"📦 {imported:,} reading/logic items ({scale}x)")
+            for backend in ["json", "sqlite"]:
+                result = measure(backend, bank, db, args.rounds)
+                print(
+                    f"  {backend:<7} RSS +{result['memory'] / 1024 / 1024:7.1f} MB   "
+                    f"{result['latency'] * 1e6:8.1f} µs/query"
+                )
+
+
+if __name__ == "__main__":
+    main()
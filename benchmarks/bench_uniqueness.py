@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 1,000-question worksheets with per-type counters vs key scans
+
+Long worksheets exhaust the content bank, after which every question comes
+from a fallback generator that needs to know how many questions of its type
+already exist. The "scan" registry reproduces the previous behaviour of
+counting them with a substring scan over every tracked key; the "registry"
+mode is the per-type UniquenessRegistry the generators use now.
+
+Usage:
+    python benchmarks/bench_uniqueness.py                 # 1,000 questions
+    python benchmarks/bench_uniqueness.py --questions 2000
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, ReadingGenerator
+from worksheet_generator.utils.fingerprint import fingerprint
+from worksheet_generator.utils.uniqueness import UniquenessRegistry
+
+
+class ScanningRegistry(UniquenessRegistry):
+    """One flat set of "<kind>_<fingerprint>" keys, counted by scanning"""
+
+    def __init__(self):
+        super().__init__()
+        self._flat = set()
+
+    def add(self, kind, *parts):
+        question_key = f"{kind}_{fingerprint(kind, *parts)}"
+        if question_key in self._flat:
+            return False
+        self._flat.add(question_key)
+        return True
+
+    def count(self, kind):
+        return len([q for q in self._flat if q.startswith(kind + "_")])
+
+    def family_count(self, family):
+        return len([q for q in self._flat if family in q])
+
+    def clear(self):
+        self._flat.clear()
+
+
+def time_worksheets(generator_class, registry_class, age_group, questions, runs):
+    generator = generator_class()
+    generator.registry = registry_class()
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_problems(age_group, questions)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"📝 {args.questions:,}-question worksheets (best of {args.runs})")
+    for subject, generator_class in [
+        ("logic", LogicGenerator),
+        ("reading", ReadingGenerator),
+    ]:
+        for age_group in ["4-5", "6-7", "8-10"]:
+            scan = time_worksheets(
+                generator_class, ScanningRegistry, age_group, args.questions, args.runs
+            )
+            registry = time_worksheets(
+                generator_class, UniquenessRegistry, age_group, args.questions, args.runs
+            )
+            print(
+                f"  {subject:<8}{age_group:<5} scan {scan * 1000:8.1f} ms   "
+                f"registry {registry * 1000:8.1f} ms   {scan / registry:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
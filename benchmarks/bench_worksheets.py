@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a class set of worksheets, one call per worksheet vs generate_worksheets
+
+The loop is what callers did before: a generate_problems() call (or, for the
+comprehensive path, generate_comprehensive_problems()) per worksheet. The
+batch path makes one generate_worksheets() call, with and without
+cross-worksheet diversity. Console output of both paths is discarded so only
+generation is timed.
+
+Usage:
+    python benchmarks/bench_worksheets.py                  # 500 worksheets
+    python benchmarks/bench_worksheets.py --worksheets 2000 --questions 30
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from cli import generate_comprehensive_problems, generate_comprehensive_worksheets
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+
+GENERATORS = {
+    "math": MathGenerator,
+    "logic": LogicGenerator,
+    "reading": ReadingGenerator,
+}
+
+
+def timed(function):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--worksheets", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--age", default="8-10")
+    args = parser.parse_args()
+    n, count, age_group = args.worksheets, args.questions, args.age
+
+    print(f"📄 {n} worksheets of {count} questions, ages {age_group} (seconds)")
+    for policy in ["allow", "rebalance"]:
+        for subject, generator_class in GENERATORS.items():
+            generator = generator_class(seed=1)
+            loop = timed(
+                lambda: [
+                    generator.generate_problems(age_group, count, on_shortage=policy)
+                    for _ in range(n)
+                ]
+            )
+            batch = timed(
+                lambda: generator_class(seed=1).generate_worksheets(
+                    age_group, count, n, diverse=False, on_shortage=policy
+                )
+            )
+            diverse = timed(
+                lambda: generator_class(seed=1).generate_worksheets(
+                    age_group, count, n, on_shortage=policy
+                )
+            )
+            print(
+                f"  {subject:<8} {policy:<9} loop {loop:6.3f}   batch {batch:6.3f} "
+                f"({loop / batch:4.1f}x)   diverse {diverse:6.3f}"
+            )
+
+    loop = timed(
+        lambda: [
+            generate_comprehensive_problems(age_group, count, seed=index)
+            for index in range(n)
+        ]
+    )
+    batch = timed(
+        lambda: generate_comprehensive_worksheets(age_group, count, n, seed=1, diverse=False)
+    )
+    diverse = timed(lambda: generate_comprehensive_worksheets(age_group, count, n, seed=1))
+    print(
+        f"  {'comprehensive':<18} loop {loop:6.3f}   batch {batch:6.3f} "
+        f"({loop / batch:4.1f}x)   diverse {diverse:6.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
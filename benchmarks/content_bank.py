@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Helpers for building enlarged copies of the data_source content bank.
+
+Every list found in the JSON sources is replicated ``scale`` times. String
+values of the copies get a numbered suffix so the enlarged bank behaves like
+real, distinct content rather than repeated references to the same objects.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+project_root = Path(__file__).parent.parent.absolute()
+DATA_SOURCE_PATH = project_root / "data_source"
+
+
+def _tag_strings(value: Any, suffix: str) -> Any:
+    """Return a copy of value with suffix appended to every string"""
+    if isinstance(value, str):
+        return f"{value}{suffix}"
+    if isinstance(value, list):
+        return [_tag_strings(item, suffix) for item in value]
+    if isinstance(value, dict):
+        return {key: _tag_strings(item, suffix) for key, item in value.items()}
+    return value
+
+
+def _scale_lists(value: Any, scale: int) -> Any:
+    """Replicate every list of records scale times"""
+    if isinstance(value, dict):
+        return {key: _scale_lists(item, scale) for key, item in value.items()}
+    if isinstance(value, list) and value and isinstance(value[0], dict):
+        scaled = list(value)
+        for copy_index in range(1, scale):
+            scaled.extend(_tag_strings(item, f" #{copy_index}") for item in value)
+        return scaled
+    return value
+
+
+def build_scaled_bank(target_dir: str, scale: int) -> str:
+    """Write a copy of data_source with every content list scaled up
+
+    Args:
+        target_dir: Directory to create the scaled data_source in
+        scale: Replication factor (100 means 100x the current content)
+
+    Returns:
+        Path of the scaled data_source directory
+    """
+    target = Path(target_dir) / f"data_source_x{scale}"
+    if target.exists():
+        shutil.rmtree(target)
+
+    for source_file in sorted(DATA_SOURCE_PATH.glob("*/*.json")):
+        with open(source_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        destination = target / source_file.parent.name / source_file.name
+        os.makedirs(destination.parent, exist_ok=True)
+        with open(destination, "w", encoding="utf-8") as f:
+            json.dump(_scale_lists(data, scale), f, ensure_ascii=False)
+
+    return str(target)
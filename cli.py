@@ -4,7 +4,10 @@ Full-featured command-line interface for the Primary School Worksheet Generator
 Enhanced with student name input, customizable question count, and improved UX
 """
 
+import argparse
+import json
 import os
+import random
 import sys
 import re
 from datetime import datetime
@@ -13,7 +16,9 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from worksheet_generator.core import MathGenerator, LogicGenerator, ReadingGenerator
+from worksheet_generator.data import convert_json_to_jsonl, convert_story_files
 from worksheet_generator.output import PDFGenerator
+from worksheet_generator.utils.capacity import AGE_GROUPS, SUBJECTS, capacity_report
 
 
 def get_student_name():
@@ -208,8 +213,17 @@ def get_comprehensive_distribution(age_group, total_questions):
     return distribution
 
 
-def generate_comprehensive_problems(age_group, total_questions):
-    """Generate a comprehensive assessment with problems from all subjects"""
+def generate_comprehensive_problems(age_group, total_questions, data_source=None, scope=None, seed=None):
+    """Generate a comprehensive assessment with problems from all subjects
+
+    data_source optionally selects the DataSourceLoader (content pack) to use.
+    scope optionally shares uniqueness across a batch of worksheets.
+    seed makes the assessment reproducible: the same seed, age group, question
+    count and content give the same problems in the same order.
+    """
+    # One seed per subject generator, all derived from the assessment seed
+    rng = random.Random(seed)
+    subject_seeds = {subject: rng.getrandbits(64) for subject in ["math", "logic", "reading"]}
     print(f"\n🎯 Generating comprehensive assessment with {total_questions} questions for ages {age_group}...")
     
     # Get distribution across subjects
@@ -226,7 +240,7 @@ def generate_comprehensive_problems(age_group, total_questions):
     # Generate math problems
     if distribution["math"] > 0:
         print(f"\n🧮 Generating {distribution['math']} math problems...")
-        math_gen = MathGenerator()
+        math_gen = MathGenerator(data_source, scope, subject_seeds["math"])
         math_problems = math_gen.generate_problems(age_group, distribution["math"])
         # Add subject identifier to each problem
         for problem in math_problems:
@@ -236,7 +250,7 @@ def generate_comprehensive_problems(age_group, total_questions):
     # Generate logic problems
     if distribution["logic"] > 0:
         print(f"\n🧩 Generating {distribution['logic']} logic problems...")
-        logic_gen = LogicGenerator()
+        logic_gen = LogicGenerator(data_source, scope, subject_seeds["logic"])
         logic_problems = logic_gen.generate_problems(age_group, distribution["logic"])
         # Add subject identifier to each problem
         for problem in logic_problems:
@@ -246,7 +260,7 @@ def generate_comprehensive_problems(age_group, total_questions):
     # Generate reading problems
     if distribution["reading"] > 0:
         print(f"\n📚 Generating {distribution['reading']} reading problems...")
-        reading_gen = ReadingGenerator()
+        reading_gen = ReadingGenerator(data_source, scope, subject_seeds["reading"])
         reading_problems = reading_gen.generate_problems(age_group, distribution["reading"])
         # Add subject identifier to each problem
         for problem in reading_problems:
@@ -254,28 +268,66 @@ def generate_comprehensive_problems(age_group, total_questions):
         all_problems.extend(reading_problems)
     
     # Shuffle all problems to mix subjects throughout the assessment
-    import random
-    random.shuffle(all_problems)
+    rng.shuffle(all_problems)
     
     print(f"\n✅ Generated {len(all_problems)} total problems across all subjects")
     return all_problems
 
 
-def generate_problems(subject, age_group, num_questions):
+def generate_comprehensive_worksheets(age_group, total_questions, n, data_source=None, scope=None, seed=None, diverse=True):
+    """Generate n comprehensive assessments in one call
+
+    The subject split is worked out once and every subject generator is
+    created once for the whole run. With diverse=True a question is not
+    repeated on another assessment while the problem space allows (see
+    the generators' generate_worksheets); a scope, if given, is used instead.
+
+    Returns:
+        List of n assessments, each a shuffled list of problems tagged with
+        their subject
+    """
+    rng = random.Random(seed)
+    subject_seeds = {subject: rng.getrandbits(64) for subject in ["math", "logic", "reading"]}
+    print(f"\n🎯 Generating {n} comprehensive assessments with {total_questions} questions for ages {age_group}...")
+
+    distribution = get_comprehensive_distribution(age_group, total_questions)
+
+    generator_classes = {"math": MathGenerator, "logic": LogicGenerator, "reading": ReadingGenerator}
+    assessments = [[] for _ in range(n)]
+    for subject in ["math", "logic", "reading"]:
+        if distribution[subject] <= 0:
+            continue
+        generator = generator_classes[subject](data_source, scope, subject_seeds[subject])
+        worksheets = generator.generate_worksheets(age_group, distribution[subject], n, diverse)
+        for assessment, problems in zip(assessments, worksheets):
+            # Add subject identifier to each problem
+            for problem in problems:
+                problem["subject"] = subject
+            assessment.extend(problems)
+
+    # Shuffle each assessment to mix subjects throughout
+    for assessment in assessments:
+        rng.shuffle(assessment)
+
+    print(f"\n✅ Generated {n} assessments of {total_questions} problems across all subjects")
+    return assessments
+
+
+def generate_problems(subject, age_group, num_questions, data_source=None, scope=None, seed=None):
     """Generate problems based on subject"""
     if subject == "comprehensive":
-        return generate_comprehensive_problems(age_group, num_questions)
+        return generate_comprehensive_problems(age_group, num_questions, data_source, scope, seed)
     
     print(f"\n🔄 Generating {num_questions} {subject} problems for ages {age_group}...")
     
     if subject == "math":
-        generator = MathGenerator()
+        generator = MathGenerator(data_source, scope, seed)
         problems = generator.generate_problems(age_group, num_questions)
     elif subject == "logic":
-        generator = LogicGenerator()
+        generator = LogicGenerator(data_source, scope, seed)
         problems = generator.generate_problems(age_group, num_questions)
     else:  # reading
-        generator = ReadingGenerator()
+        generator = ReadingGenerator(data_source, scope, seed)
         problems = generator.generate_problems(age_group, num_questions)
     
     print(f"✅ Generated {len(problems)} unique problems")
@@ -478,5 +530,135 @@ def main():
         print("• Ensure you have write permissions in the current directory")
 
 
+def convert_stories_command(args):
+    """Convert story JSON files to indexed JSON Lines banks
+
+    Usage: python cli.py convert-stories <data_source dir | story .json file>...
+    """
+    if not args:
+        print("Usage: python cli.py convert-stories <data_source dir | story .json file>...")
+        return 1
+
+    for path in args:
+        if os.path.isdir(path):
+            converted = convert_story_files(path)
+        else:
+            jsonl_path = os.path.splitext(path)[0] + ".jsonl"
+            converted = {jsonl_path: convert_json_to_jsonl(path, jsonl_path)}
+        for jsonl_path, count in converted.items():
+            print(f"✅ {jsonl_path}: {count} stories")
+    return 0
+
+
+def capacity_command(args):
+    """Report how many distinct questions each subject/age/type can produce
+
+    Usage: python cli.py capacity [--subject S] [--age A] [--count N] [--json]
+    """
+    parser = argparse.ArgumentParser(
+        prog="cli.py capacity",
+        description="Maximum distinct questions per subject, age group and problem type",
+    )
+    parser.add_argument("--subject", choices=SUBJECTS, action="append")
+    parser.add_argument("--age", choices=AGE_GROUPS, action="append")
+    parser.add_argument(
+        "--count", type=int, help="Check whether a worksheet of this size fits"
+    )
+    parser.add_argument("--data-source", help="Path to a data_source directory")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    options = parser.parse_args(args)
+
+    data_source = None
+    if options.data_source:
+        from worksheet_generator.data import get_loader
+
+        data_source = get_loader(options.data_source)
+
+    report = capacity_report(options.subject, options.age, data_source)
+    if options.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    generators = {"math": MathGenerator, "logic": LogicGenerator, "reading": ReadingGenerator}
+    short = False
+    for subject, by_age in report.items():
+        print(f"\n📊 {subject.title()}")
+        for age_group, capacity in by_age.items():
+            requested = {}
+            if options.count:
+                generator = generators[subject](data_source)
+                requested = generator._get_structured_distribution(age_group, options.count)
+            print(f"   Ages {age_group}:")
+            for problem_type, entry in capacity.items():
+                approx = "" if entry["exact"] else "~"
+                line = f"      • {problem_type:<15} {approx}{entry['available']:,}"
+                if problem_type in requested:
+                    needed = requested[problem_type]
+                    status = "✅" if needed <= entry["available"] else "❌"
+                    short = short or needed > entry["available"]
+                    line += f"   (needs {needed} {status})"
+                print(line)
+    print("\n~ = estimate (may overcount when templates overlap)")
+    return 1 if short else 0
+
+
+def regenerate_command(args):
+    """Rebuild a worksheet and/or answer key from its seed
+
+    Usage: python cli.py regenerate --subject S --age A --count N --seed SEED
+    """
+    parser = argparse.ArgumentParser(
+        prog="cli.py regenerate",
+        description="Regenerate a seeded worksheet or its answer key",
+    )
+    parser.add_argument("--subject", choices=SUBJECTS + ["comprehensive"], required=True)
+    parser.add_argument("--age", choices=AGE_GROUPS, required=True)
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, required=True)
+    parser.add_argument("--name", default="", help="Student name for the header")
+    parser.add_argument(
+        "--output", choices=["both", "worksheet", "answers"], default="answers"
+    )
+    parser.add_argument("--output-dir", default="generated_worksheets")
+    parser.add_argument("--data-source", help="Path to a data_source directory")
+    options = parser.parse_args(args)
+
+    data_source = None
+    if options.data_source:
+        from worksheet_generator.data import get_loader
+
+        data_source = get_loader(options.data_source)
+
+    problems = generate_problems(
+        options.subject, options.age, options.count, data_source, seed=options.seed
+    )
+
+    os.makedirs(options.output_dir, exist_ok=True)
+    base_name = f"{options.subject}_{options.age.replace('-', '_')}_seed{options.seed}"
+    worksheet_filename = os.path.join(options.output_dir, f"{base_name}_worksheet.pdf")
+    answer_key_filename = os.path.join(options.output_dir, f"{base_name}_answers.pdf")
+    generate_pdfs(
+        PDFGenerator(),
+        options.subject,
+        options.age,
+        problems,
+        options.name,
+        options.output,
+        worksheet_filename,
+        answer_key_filename,
+    )
+    return 0
+
+
+# Non-interactive subcommands: python cli.py <command> [args...]
+COMMANDS = {
+    "capacity": capacity_command,
+    "convert-stories": convert_stories_command,
+    "regenerate": regenerate_command,
+}
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(COMMANDS[sys.argv[1]](sys.argv[2:]))
     main()
@@ -44,6 +44,24 @@ class TestRunner:
                 "test_enhanced_uniqueness.py",
                 "test_uniqueness.py",
                 "test_classification_fix.py",
+                "test_data_loader.py",
+                "test_sqlite_store.py",
+                "test_jsonl_bank.py",
+                "test_math_sampling.py",
+                "test_capacity.py",
+                "test_fingerprint.py",
+                "test_batch_scope.py",
+                "test_question_history.py",
+                "test_seeded_generation.py",
+                "test_batch_math.py",
+                "test_generate_worksheets.py",
+                "test_iter_problems.py",
+                "test_problem.py",
+                "test_word_templates.py",
+                "test_operation_specs.py",
+                "test_difficulty.py",
+                "test_expressions.py",
+                "test_cyclic_patterns.py",
             ],
             "comprehensive": [
                 "test_comprehensive_assessment.py",
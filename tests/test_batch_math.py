@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for NumPy batch generation of arithmetic problems
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.batch_math import OPERATIONS
+
+
+def test_batch_matches_scalar_ranges():
+    """Every batch problem is one the scalar generators could produce"""
+    print("🧪 Testing batch problems against the scalar operand spaces...")
+
+    generator = MathGenerator(seed=16)
+    for age_group in ["4-5", "6-7", "8-10"]:
+        batch = generator.generate_batch(age_group, 5000)
+        assert len(batch) == 5000
+
+        age_spec = generator._age_spec(age_group)
+        for code, operation in enumerate(OPERATIONS):
+            rows = batch.operations == code
+            if not rows.any():
+                continue
+            space = age_spec.operations[operation].space
+            pairs = {space.unrank(i) for i in range(len(space))}
+            if operation == "division":
+                pairs = {(divisor * result, divisor) for divisor, result in pairs}
+            batch_pairs = set(zip(batch.a[rows].tolist(), batch.b[rows].tolist()))
+            assert batch_pairs <= pairs, operation
+
+        for problem in batch.to_dicts(0, 200):
+            expression = problem["question"].replace(" = ____", "")
+            expression = expression.replace("×", "*").replace("÷", "//")
+            assert eval(expression) == problem["answer"], problem["question"]
+
+    print("  ✅ Operands, answers and formatting match the scalar path")
+    return True
+
+
+def test_batch_uniqueness_and_seeding():
+    """Pairs do not repeat while the space allows and seeds reproduce batches"""
+    print("🧪 Testing batch uniqueness and seeding...")
+
+    generator = MathGenerator(seed=1)
+    # 8-10 addition has 10,000 pairs
+    batch = generator.generate_batch("8-10", 3000, operations=["addition"])
+    keys = (batch.a << 32) | batch.b
+    assert len(np.unique(keys)) == 3000
+
+    # 4-5 simple addition has 35 pairs: every pair appears before repeats
+    batch = generator.generate_batch("4-5", 70, operations=["addition"])
+    assert len(np.unique(((batch.a << 32) | batch.b))) == 35
+
+    first = MathGenerator(seed=5).generate_batch("6-7", 500)
+    second = MathGenerator(seed=5).generate_batch("6-7", 500)
+    assert first.to_dicts() == second.to_dicts()
+
+    print("  ✅ Batches are unique within each space and reproducible")
+    return True
+
+
+def test_requested_operations():
+    """Every requested operation gets an equal share of the batch"""
+    print("🧪 Testing requested operations...")
+
+    generator = MathGenerator(seed=3)
+    for age_group, operations in [
+        ("4-5", ["addition", "division"]),
+        ("6-7", ["multiplication", "division"]),
+        ("8-10", ["subtraction", "multiplication", "division"]),
+    ]:
+        batch = generator.generate_batch(age_group, 100, operations=operations)
+        counts = np.bincount(batch.operations, minlength=len(OPERATIONS))
+        shares = [counts[OPERATIONS.index(operation)] for operation in operations]
+        assert sum(shares) == 100 and min(shares) >= 100 // len(operations) - 1, (
+            age_group,
+            shares,
+        )
+
+    try:
+        generator.generate_batch("8-10", 10, operations=["modulo"])
+        assert False, "Expected ValueError for an unknown operation"
+    except ValueError:
+        pass
+
+    print("  ✅ Requested operations all appear")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_batch_matches_scalar_ranges,
+        test_batch_uniqueness_and_seeding,
+        test_requested_operations,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for batch-scoped uniqueness across the worksheets of a class
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+from worksheet_generator.utils.uniqueness import BloomScope, ExactScope, batch_scope
+
+
+def test_bloom_scope():
+    """No false negatives and a false-positive rate close to the target"""
+    print("🧪 Testing the Bloom filter scope...")
+
+    rng = random.Random(13)
+    scope = BloomScope(10_000, false_positive_rate=0.01)
+    members = [rng.getrandbits(64) for _ in range(10_000)]
+    accepted = sum(scope.add(key) for key in members)
+    assert accepted >= 9_900
+    assert all(key in scope for key in members)
+    assert not scope.add(members[0])
+
+    others = [rng.getrandbits(64) for _ in range(20_000)]
+    false_positive_rate = sum(key in scope for key in others) / len(others)
+    assert false_positive_rate < 0.02, false_positive_rate
+
+    stats = scope.stats()
+    assert stats["kind"] == "bloom"
+    # About 9.6 bits per question at 1%
+    assert 11_000 < stats["memory_bytes"] < 13_000
+    assert 0.4 < stats["saturation"] < 0.6
+    assert abs(stats["false_positive_rate"] - 0.01) < 0.005
+
+    print(f"  ✅ Measured false-positive rate {false_positive_rate:.4f}")
+    return True
+
+
+def test_batch_scope_selection():
+    """Small batches get an exact set, large ones a Bloom filter"""
+    print("🧪 Testing batch scope selection...")
+
+    assert isinstance(batch_scope(30 * 40), ExactScope)
+    large = batch_scope(1_000_000, false_positive_rate=0.001)
+    assert isinstance(large, BloomScope)
+    assert large.memory_bytes < 2 * 1024 * 1024
+
+    print("  ✅ Scope type follows the batch size")
+    return True
+
+
+def test_shared_scope_across_worksheets():
+    """Worksheets of one batch share no questions while the space allows"""
+    print("🧪 Testing uniqueness across a batch of worksheets...")
+
+    # 4-5 simple addition has 35 operand pairs
+    scope = batch_scope(35)
+    worksheets = []
+    for _ in range(5):
+        generator = MathGenerator(scope=scope)
+        worksheets.append(
+            [generator.generate_addition(10, simple=True)["question"] for _ in range(7)]
+        )
+    questions = [q for worksheet in worksheets for q in worksheet]
+    assert len(set(questions)) == 35
+    assert len(scope) == 35 and scope.saturation == 1.0
+
+    # One scope serves every subject; generate_problems keeps it across resets
+    scope = batch_scope(200)
+    for generator_class in [LogicGenerator, ReadingGenerator]:
+        generator = generator_class(scope=scope)
+        first = generator.generate_problems("6-7", 10)
+        second = generator.generate_problems("6-7", 10)
+        assert len(generator.registry) == 10
+        overlap = {p["question"] for p in first} & {p["question"] for p in second}
+        assert not overlap, overlap
+    assert len(scope) >= 35
+
+    print("  ✅ Questions are not repeated between worksheets of a batch")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_bloom_scope,
+        test_batch_scope_selection,
+        test_shared_scope_across_worksheets,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
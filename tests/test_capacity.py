@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for capacity planning and shortage handling in generate_problems
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+from worksheet_generator.utils.capacity import (
+    CapacityError,
+    capacity_report,
+    find_shortfalls,
+    rebalance_distribution,
+)
+
+
+def test_capacity_report():
+    """Every subject, age group and problem type gets a capacity"""
+    print("🧪 Testing capacity report...")
+
+    report = capacity_report()
+    for subject, generator_class in [
+        ("math", MathGenerator),
+        ("logic", LogicGenerator),
+        ("reading", ReadingGenerator),
+    ]:
+        for age_group in ["4-5", "6-7", "8-10"]:
+            capacity = report[subject][age_group]
+            types = generator_class()._get_structured_distribution(age_group, 10)
+            assert set(capacity) == set(types), (subject, age_group)
+            assert all(entry["available"] > 0 for entry in capacity.values())
+
+    # 4-5 simple addition: a in 1..5 with a + b <= 10
+    assert report["math"]["4-5"]["addition"] == {"available": 35, "exact": True}
+
+    print("  ✅ Capacity reported for every problem type")
+    return True
+
+
+def test_rebalance_distribution():
+    """Overflow moves to the types with the most spare capacity"""
+    print("🧪 Testing distribution rebalancing...")
+
+    capacity = {
+        "a": {"available": 5, "exact": True},
+        "b": {"available": 10, "exact": True},
+        "c": {"available": 100, "exact": True},
+    }
+    balanced = rebalance_distribution({"a": 10, "b": 10, "c": 10}, capacity)
+    assert balanced == {"a": 5, "b": 10, "c": 15}
+    assert not find_shortfalls(balanced, capacity)
+
+    # More than the total capacity: the rest stays on the short type
+    balanced = rebalance_distribution({"a": 200, "b": 0, "c": 0}, capacity)
+    assert sum(balanced.values()) == 200
+    assert balanced["b"] == 10 and balanced["c"] == 100
+
+    print("  ✅ Rebalancing keeps the total and respects capacity")
+    return True
+
+
+def test_generate_problems_shortage_policies():
+    """generate_problems fails fast or rebalances before generating"""
+    print("🧪 Testing on_shortage policies...")
+
+    generator = ReadingGenerator()
+    capacity = generator.get_capacity("4-5")
+    count = 50
+    assert find_shortfalls(generator._get_structured_distribution("4-5", count), capacity)
+
+    try:
+        generator.generate_problems("4-5", count, on_shortage="error")
+        assert False, "Expected CapacityError"
+    except CapacityError as e:
+        assert "vocabulary" in e.shortfalls
+
+    problems = generator.generate_problems("4-5", count, on_shortage="rebalance")
+    assert len(problems) == count
+    problem_types = {
+        "vocabulary": "vocabulary",
+        "sentence_building": "sentence",
+        "story_comprehension": "story",
+    }
+    for problem_type, capacity_type in problem_types.items():
+        generated = sum(1 for p in problems if p["type"] == problem_type)
+        assert generated <= capacity[capacity_type]["available"], problem_type
+
+    try:
+        generator.generate_problems("4-5", 5, on_shortage="ignore")
+        assert False, "Expected ValueError for an unknown policy"
+    except ValueError:
+        pass
+
+    print("  ✅ Shortages are reported or rebalanced up front")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_capacity_report,
+        test_rebalance_distribution,
+        test_generate_problems_shortage_policies,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the cyclic (AB, ABC, ABCD) pattern engine
+"""
+
+import os
+import sys
+import tempfile
+from itertools import permutations
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, logic_generator
+from worksheet_generator.core.cyclic_patterns import (
+    CyclicPattern,
+    compile_cyclic_pattern,
+    unrank_arrangement,
+)
+from worksheet_generator.data import DataSourceLoader, SQLiteContentStore
+
+DATA_SOURCE_PATH = str(project_root / "data_source")
+
+SHAPES = [
+    {"name": "circle", "symbol": "⭕"},
+    {"name": "square", "symbol": "⬜"},
+    {"name": "triangle", "symbol": "🔺"},
+    {"name": "star", "symbol": "⭐"},
+    {"name": "heart", "symbol": "❤️"},
+]
+
+
+def test_unrank_arrangement():
+    """Unranking numbers every ordered selection once, in order"""
+    print("🧪 Testing arrangement unranking...")
+
+    for n, k in [(5, 2), (6, 3), (8, 4), (4, 4)]:
+        expected = list(permutations(range(n), k))
+        unranked = [unrank_arrangement(n, k, i) for i in range(len(expected))]
+        assert unranked == expected, (n, k)
+
+    print("  ✅ Arrangements match itertools.permutations")
+    return True
+
+
+def test_compiled_pattern_space():
+    """A template's space is every cycle of its pools at every length"""
+    print("🧪 Testing compiled pattern spaces...")
+
+    pattern = compile_cyclic_pattern(
+        {"type": "ABC_shape", "shapes": SHAPES, "pattern_lengths": [7, 9]}
+    )
+    assert pattern.period == 3 and len(pattern) == 5 * 4 * 3 * 2
+    drawn = [pattern.unrank(i) for i in range(len(pattern))]
+    assert len({pattern.question(params) for params in drawn}) == len(pattern)
+    for params in drawn:
+        cycle, length = params
+        sequence = pattern.sequence(params)
+        assert len(sequence) == length and len({s for s, _ in cycle}) == 3
+        assert sequence[:3] == [symbol for symbol, _ in cycle]
+        assert pattern.answer(params) == sequence[-1]
+
+    # Pools may sit under "items"; AB_number repeats consecutive numbers
+    mixed = compile_cyclic_pattern(
+        {"type": "ABC_items", "items": {"colors": SHAPES[:3], "shapes": SHAPES}}
+    )
+    assert len(mixed) == 6 + 60
+    numbers = compile_cyclic_pattern(
+        {"type": "AB_number", "number_range": {"min": 1, "max": 5}}
+    )
+    assert numbers.question(numbers.unrank(2)) == (
+        "Complete the pattern: 3 - 4 - 3 - 4 - 3 - ____"
+    )
+    # Templates without a usable pool repeat the default items
+    assert len(compile_cyclic_pattern({"type": "ABCD_pattern", "items": {}})) == 1
+
+    print("  ✅ Pattern spaces are exact")
+    return True
+
+
+def test_patterns_drawn_without_replacement():
+    """Every repeating pattern is drawn once before any repeats"""
+    print("🧪 Testing pattern draws...")
+
+    generator = LogicGenerator(seed=4)
+    total = generator.get_remaining_patterns("4-5")
+    assert total == generator.get_capacity("4-5")["pattern"]["available"]
+
+    questions = [
+        generator.generate_pattern_sequence("4-5")["question"] for _ in range(total)
+    ]
+    assert len(set(questions)) == total
+    assert generator.get_remaining_patterns("4-5") == 0
+
+    generator.reset_generated_questions()
+    assert generator.get_remaining_patterns("4-5") == total
+
+    first, second = [
+        [
+            problem["question"]
+            for problem in LogicGenerator(seed=9).iter_problems(
+                "6-7", distribution={"pattern": 1}, limit=20
+            )
+        ]
+        for _ in range(2)
+    ]
+    assert first == second
+
+    print("  ✅ Draws are unique, counted and seeded")
+    return True
+
+
+def test_templates_compiled_once():
+    """Templates are compiled once per age group"""
+    print("🧪 Testing compiled template cache...")
+
+    generator = LogicGenerator()
+    templates = generator._compiled_pattern_templates("8-10")
+    assert generator._compiled_pattern_templates("8-10") is templates
+    cyclic = [pattern for pattern in templates if isinstance(pattern, CyclicPattern)]
+    assert {pattern.pattern_type for pattern in cyclic} == {
+        "ABCD_pattern",
+        "complex_visual_pattern",
+    }
+
+    print("  ✅ Compiled templates are reused")
+    return True
+
+
+def test_templates_compiled_once_from_store():
+    """A SQLite store's templates are read and compiled once per content version"""
+    print("🧪 Testing compiled templates with a SQLite content store...")
+
+    compile_calls = []
+    original = logic_generator.compile_cyclic_pattern
+
+    def counting_compile(template):
+        compile_calls.append(template.get("type"))
+        return original(template)
+
+    logic_generator.compile_cyclic_pattern = counting_compile
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteContentStore.from_data_source(
+                os.path.join(tmp, "content.db"), DATA_SOURCE_PATH
+            )
+            loader = DataSourceLoader(DATA_SOURCE_PATH, store=store)
+            generator = LogicGenerator(loader, seed=3)
+            for _ in range(50):
+                generator.generate_pattern_sequence("4-5")
+            generator.get_capacity("4-5")
+            cyclic = len(compile_calls)
+            assert 0 < cyclic < 50
+
+            # Replacing the store's contents recompiles them once more
+            store.import_data_source(DATA_SOURCE_PATH)
+            generator.generate_pattern_sequence("4-5")
+            generator.get_capacity("4-5")
+            assert len(compile_calls) == 2 * cyclic
+            store.close()
+    finally:
+        logic_generator.compile_cyclic_pattern = original
+
+    print("  ✅ Store-backed templates compile once")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_unrank_arrangement,
+        test_compiled_pattern_space,
+        test_patterns_drawn_without_replacement,
+        test_templates_compiled_once,
+        test_templates_compiled_once_from_store,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Test script for the DataSourceLoader content loading behaviour
+"""
+
+import sys
+import os
+import json
+import pickle
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, ReadingGenerator
+from worksheet_generator.data.data_loader import DataSourceLoader, LoaderRegistry
+from worksheet_generator.data.frozen import FrozenDict
+
+DATA_SOURCE_PATH = str(project_root / "data_source")
+
+
+def test_import_is_lazy():
+    """Importing the package must not read or print anything"""
+    print("🧪 Testing that importing the package does no I/O...")
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import worksheet_generator\n"
+            "from worksheet_generator.data import data_loader\n"
+            "assert data_loader._cache == {}, data_loader._cache\n",
+        ],
+        cwd=str(project_root),
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "", f"Unexpected output at import: {result.stdout!r}"
+    print("  ✅ Import is silent and nothing is loaded")
+    return True
+
+
+def test_loads_only_requested_files():
+    """Accessing one source loads only that file"""
+    print("🧪 Testing per-file lazy loading...")
+
+    loader = DataSourceLoader(DATA_SOURCE_PATH)
+
+    templates = loader.get_word_problems("addition", "4-5")
+    assert templates, "Expected addition word problems for 4-5"
+
+    info = loader.get_cache_info()
+    assert list(info.keys()) == ["math"], info
+    assert info["math"]["source_files"] == ["word_problems"], info
+
+    loader.get_stories("6-7")
+    info = loader.get_cache_info()
+    assert info["reading"]["source_files"] == ["intermediate_stories"], info
+    assert "logic" not in info
+    print("  ✅ Only the requested files were loaded")
+    return True
+
+
+def test_preload_loads_everything():
+    """preload() eagerly loads every subject"""
+    print("🧪 Testing preload()...")
+
+    loader = DataSourceLoader(DATA_SOURCE_PATH).preload()
+    info = loader.get_cache_info()
+
+    assert set(info.keys()) == {"math", "logic", "reading"}, info
+    assert info["math"]["total_files"] == 2
+    assert info["logic"]["total_files"] == 3
+    assert info["reading"]["total_files"] == 4
+    print("  ✅ All subjects preloaded")
+    return True
+
+
+def test_missing_directory_is_empty():
+    """A missing content root yields empty content instead of an error"""
+    print("🧪 Testing missing data source directory...")
+
+    loader = DataSourceLoader(str(project_root / "does_not_exist"))
+    assert loader.get_math_source() == {}
+    assert loader.get_word_problems("addition", "4-5") == []
+    print("  ✅ Missing directory handled gracefully")
+    return True
+
+
+def test_snapshot_roundtrip_and_staleness():
+    """The snapshot is reused when valid and rebuilt when sources change"""
+    print("🧪 Testing compiled content snapshot...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data_source")
+        shutil.copytree(DATA_SOURCE_PATH, data_path)
+
+        loader = DataSourceLoader(data_path, use_snapshot=True)
+        expected = DataSourceLoader(data_path).get_reading_source()
+        assert loader.get_reading_source() == expected
+        assert os.path.exists(loader.snapshot_path)
+
+        # Touching a file without changing it keeps the snapshot valid
+        word_file = os.path.join(data_path, "math_source", "word_problems.json")
+        os.utime(word_file, ns=(0, 0))
+        assert DataSourceLoader(data_path, use_snapshot=True)._read_valid_snapshot()
+
+        # Changing content makes it stale and it is rebuilt transparently
+        with open(word_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["word_problems"]["addition"] = data["word_problems"]["addition"][:1]
+        with open(word_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        reloaded = DataSourceLoader(data_path, use_snapshot=True)
+        assert reloaded._read_valid_snapshot() is None
+        assert len(reloaded.get_word_problems("addition", "4-5")) == 1
+        assert DataSourceLoader(data_path, use_snapshot=True)._read_valid_snapshot()
+
+    print("  ✅ Snapshot reused when valid and rebuilt when stale")
+    return True
+
+
+def test_word_problem_index():
+    """Word problem templates are indexed once and never mutated"""
+    print("🧪 Testing word problem template index...")
+
+    loader = DataSourceLoader(DATA_SOURCE_PATH)
+    raw = loader.get_math_source("word_problems")["word_problems"]
+
+    for age_group in ["4-5", "6-7", "8-10"]:
+        templates = loader.get_word_problem_templates(age_group)
+        expected = [
+            template
+            for operation in ["addition", "subtraction", "multiplication", "division"]
+            for template in raw[operation]
+            if age_group in template["age_groups"]
+        ]
+        assert len(templates) == len(expected), age_group
+        assert all(age_group in t["age_groups"] for t in templates)
+
+        division = loader.get_word_problem_templates(age_group, "division")
+        assert all(t["operation"] == "division" for t in division)
+
+    # The index is cached and the source templates are left untouched
+    assert loader.get_word_problem_templates("8-10") is loader.get_word_problem_templates("8-10")
+    assert all("operation" not in t for t in raw["addition"])
+    try:
+        loader.get_word_problem_templates("8-10")[0]["operation"] = "changed"
+        assert False, "Index entries should be read-only"
+    except TypeError:
+        pass
+
+    print("  ✅ Word problem index is correct and read-only")
+    return True
+
+
+def test_frozen_content():
+    """Frozen content is read-only, picklable and usable by the generators"""
+    print("🧪 Testing frozen, fork-shareable content...")
+
+    loader = DataSourceLoader(DATA_SOURCE_PATH)
+    mutable = loader.get_vocabulary_exercises("6-7")
+    loader.freeze()
+
+    frozen = loader.get_vocabulary_exercises("6-7")
+    assert isinstance(frozen, tuple) and isinstance(frozen[0], FrozenDict)
+    assert [item["word"] for item in frozen] == [item["word"] for item in mutable]
+    try:
+        frozen[0]["word"] = "changed"
+        assert False, "Frozen content should be read-only"
+    except TypeError:
+        pass
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert frozen[0].copy() == frozen[0]
+
+    templates = loader.get_word_problem_templates("6-7")
+    assert all(isinstance(t, FrozenDict) for t in templates)
+
+    for generator_class in [LogicGenerator, ReadingGenerator]:
+        generator = generator_class()
+        generator.data_source = loader
+        problems = generator.generate_problems("4-5", 10)
+        assert len(problems) == 10
+
+    print("  ✅ Frozen content works end to end")
+    return True
+
+
+def _truncate_list(json_path, path, length):
+    """Rewrite a JSON file keeping only the first items of a nested list"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    container = data
+    for key in path[:-1]:
+        container = container[key]
+    container[path[-1]] = container[path[-1]][:length]
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_incremental_reload():
+    """Only changed files are re-parsed and only dependent indexes rebuilt"""
+    print("🧪 Testing incremental reload...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data_source")
+        shutil.copytree(DATA_SOURCE_PATH, data_path)
+
+        loader = DataSourceLoader(data_path)
+        stories_before = loader.get_stories("4-5")
+        vocabulary = loader.get_reading_source("vocabulary_exercises")
+        word_index = loader.get_word_problem_templates("6-7")
+        assert loader.reload_changed_sources() == []
+
+        stories_file = os.path.join(data_path, "reading_source", "simple_stories.json")
+        _truncate_list(stories_file, ["simple_stories"], 2)
+
+        assert loader.reload_sources(incremental=True) == ["reading/simple_stories"]
+        assert len(loader.get_stories("4-5")) == 2
+        # In-flight references keep their consistent view
+        assert len(stories_before) == 10
+        # Unchanged files and unrelated indexes are reused as-is
+        assert loader.get_reading_source("vocabulary_exercises") is vocabulary
+        assert loader.get_word_problem_templates("6-7") is word_index
+
+        word_file = os.path.join(data_path, "math_source", "word_problems.json")
+        _truncate_list(word_file, ["word_problems", "addition"], 1)
+        assert loader.reload_changed_sources() == ["math/word_problems"]
+        assert len(loader.get_word_problem_templates("6-7", "addition")) == 1
+
+    print("  ✅ Only changed files were reloaded")
+    return True
+
+
+def test_content_watcher():
+    """The polling watcher reloads changed files in the background"""
+    print("🧪 Testing content watcher thread...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data_source")
+        shutil.copytree(DATA_SOURCE_PATH, data_path)
+
+        loader = DataSourceLoader(data_path)
+        loader.get_vocabulary_exercises("4-5")
+
+        reloaded = []
+        event = threading.Event()
+
+        def on_reload(changed):
+            reloaded.extend(changed)
+            event.set()
+
+        watcher = loader.start_watching(interval=0.05, on_reload=on_reload)
+        try:
+            vocab_file = os.path.join(
+                data_path, "reading_source", "vocabulary_exercises.json"
+            )
+            _truncate_list(vocab_file, ["vocabulary_exercises", "4-5"], 3)
+            assert event.wait(5), "Watcher did not pick up the change"
+        finally:
+            watcher.stop(timeout=5)
+
+        assert reloaded == ["reading/vocabulary_exercises"]
+        assert len(loader.get_vocabulary_exercises("4-5")) == 3
+        assert not watcher.is_alive()
+
+    print("  ✅ Watcher reloaded the changed file")
+    return True
+
+
+def test_per_instance_content_roots():
+    """Generators use the injected loader and the registry is a bounded LRU"""
+    print("🧪 Testing per-instance content roots...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = []
+        for name in ["school_a", "school_b", "school_c"]:
+            data_path = os.path.join(tmp, name)
+            shutil.copytree(DATA_SOURCE_PATH, data_path)
+            roots.append(data_path)
+
+        # School B only has a single vocabulary exercise for 4-5
+        vocab_file = os.path.join(roots[1], "reading_source", "vocabulary_exercises.json")
+        _truncate_list(vocab_file, ["vocabulary_exercises", "4-5"], 1)
+
+        registry = LoaderRegistry(max_loaders=2)
+        loader_a = registry.get(roots[0])
+        loader_b = registry.get(roots[1])
+        assert registry.get(roots[0]) is loader_a
+        assert registry.get(os.path.join(roots[1], "")) is loader_b
+
+        only_word = loader_b.get_vocabulary_exercises("4-5")[0]["word"]
+        generator = ReadingGenerator(loader_b)
+        assert generator.data_source is loader_b
+        problem = generator.generate_vocabulary_exercise("4-5")
+        assert f"'{only_word}'" in problem["question"]
+        assert len(ReadingGenerator(loader_a).data_source.get_vocabulary_exercises("4-5")) > 1
+
+        # A third root evicts the least recently used one (school B)
+        registry.get(roots[0])
+        registry.get(roots[2])
+        assert registry.roots() == [os.path.realpath(roots[0]), os.path.realpath(roots[2])]
+        assert registry.get(roots[1]) is not loader_b
+
+    print("  ✅ Content roots are isolated and bounded")
+    return True
+
+
+def test_default_root_is_cwd_independent():
+    """The default loader finds the bundled content from any directory"""
+    print("🧪 Testing the default content root outside the project directory...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.path.insert(0, sys.argv[1]);"
+                "from worksheet_generator.data import data_loader;"
+                "print(len(data_loader.get_vocabulary_exercises('4-5')))",
+                str(project_root),
+            ],
+            cwd=tmp,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert int(result.stdout.strip().splitlines()[-1]) > 0
+
+    print("  ✅ Default content root does not depend on the working directory")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_import_is_lazy,
+        test_loads_only_requested_files,
+        test_preload_loads_everything,
+        test_missing_directory_is_empty,
+        test_snapshot_roundtrip_and_staleness,
+        test_word_problem_index,
+        test_frozen_content,
+        test_incremental_reload,
+        test_content_watcher,
+        test_per_instance_content_roots,
+        test_default_root_is_cwd_independent,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
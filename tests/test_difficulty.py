@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for difficulty-graded arithmetic (carries, borrows, digit counts)
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.difficulty import (
+    MULTI_VALUED_FEATURES,
+    OPERATION_FEATURES,
+    count_borrows,
+    count_carries,
+    pair_features,
+)
+
+OPERATIONS = ["addition", "subtraction", "multiplication", "division"]
+
+
+def has_feature(operation, pair, feature, value):
+    position = OPERATION_FEATURES[operation].index(feature)
+    found = pair_features(operation, *pair)[position]
+    if (operation, feature) in MULTI_VALUED_FEATURES:
+        return value in found
+    return found == value
+
+
+def test_column_arithmetic_features():
+    """Carries and borrows are counted per column"""
+    print("🧪 Testing carry and borrow counts...")
+
+    assert count_carries(23, 45) == 0
+    assert count_carries(47, 38) == 1
+    assert count_carries(99, 1) == 2
+    assert count_carries(56, 78) == 2
+    assert count_borrows(58, 23) == 0
+    assert count_borrows(52, 27) == 1
+    assert count_borrows(100, 1) == 2
+    assert count_borrows(10, 10) == 0
+
+    print("  ✅ Column features match working on paper")
+    return True
+
+
+def test_bands_match_a_full_scan():
+    """Each band holds exactly the pairs whose features match"""
+    print("🧪 Testing difficulty bands against a full scan...")
+
+    generator = MathGenerator()
+    for age_group in ["4-5", "6-7", "8-10"]:
+        for operation in OPERATIONS:
+            spec = generator._age_spec(age_group).operations[operation]
+            index = generator.get_difficulty_index(age_group, operation)
+            space_pairs = [spec.space.unrank(i) for i in range(len(spec.space))]
+            assert sum(index.counts().values()) == len(space_pairs)
+
+            for feature in OPERATION_FEATURES[operation]:
+                for value in index.values(feature):
+                    band = index.band(**{feature: value})
+                    expected = {
+                        pair
+                        for pair in space_pairs
+                        if has_feature(operation, pair, feature, value)
+                    }
+                    band_pairs = [band.unrank(i) for i in range(len(band))]
+                    assert len(band_pairs) == len(expected)
+                    assert set(band_pairs) == expected, (operation, feature, value)
+
+    print("  ✅ Bands are exact and cover every pair")
+    return True
+
+
+def test_graded_problems_match_filters():
+    """Graded problems have the requested features and do not repeat"""
+    print("🧪 Testing graded problems...")
+
+    generator = MathGenerator(seed=7)
+    problems = generator.generate_graded_problems("8-10", "addition", 30, carries=1)
+    for problem in problems:
+        a, b = problem.params
+        assert count_carries(a, b) == 1 and problem["answer"] == a + b
+    assert len({problem["question"] for problem in problems}) == 30
+
+    problems = generator.generate_graded_problems(
+        "8-10", "subtraction", 20, borrows=(1, None), digits=2
+    )
+    for problem in problems:
+        a, b = problem.params
+        assert count_borrows(a, b) >= 1 and a < 100 and a - b == problem["answer"]
+
+    problems = generator.generate_graded_problems("8-10", "division", 16, table={7, 8})
+    for problem in problems:
+        dividend, divisor = problem.params
+        assert divisor in (7, 8) and dividend == divisor * problem["answer"]
+
+    # The 5 times table of 6-7 has 5 × 1..10 plus 2 × 5, 3 × 5 and 10 × 5 from
+    # the other tables; then the facts repeat
+    problems = generator.generate_graded_problems("6-7", "multiplication", 15, table=5)
+    assert len({problem["question"] for problem in problems}) == 13
+
+    first, second = [
+        MathGenerator(seed=3).generate_graded_problems("8-10", "addition", 9, carries=2)
+        for _ in range(2)
+    ]
+    assert first == second
+
+    print("  ✅ Graded problems follow the band and the seed")
+    return True
+
+
+def test_multiplication_tables_cover_both_orders():
+    """A multiplication fact is in the tables of both its factors"""
+    print("🧪 Testing multiplication table bands...")
+
+    generator = MathGenerator()
+    index = generator.get_difficulty_index("8-10", "multiplication")
+    band = index.band(table={7})
+    pairs = {band.unrank(i) for i in range(len(band))}
+    assert (7, 3) in pairs and (3, 7) in pairs
+    assert all(7 in pair for pair in pairs)
+    assert len(pairs) == 2 * len(range(2, 13)) - 1
+    assert 7 in index.values("table")
+
+    # A division fact is only in the table of its divisor
+    band = generator.get_difficulty_index("8-10", "division").band(table=7)
+    assert all(band.unrank(i)[0] == 7 for i in range(len(band)))
+
+    print("  ✅ table=7 holds 7 × n and n × 7")
+    return True
+
+
+def test_invalid_bands():
+    """Unknown features and empty bands raise ValueError"""
+    print("🧪 Testing invalid difficulty requests...")
+
+    generator = MathGenerator()
+    for operation, features in [
+        ("addition", {"borrows": 1}),
+        ("addition", {"carries": 3}),
+        ("modulo", {"digits": 1}),
+    ]:
+        try:
+            generator.generate_graded_problems("8-10", operation, 5, **features)
+            assert False, f"Expected ValueError for {operation} {features}"
+        except ValueError:
+            pass
+
+    print("  ✅ Invalid requests raise ValueError")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_column_arithmetic_features,
+        test_bands_match_a_full_scan,
+        test_graded_problems_match_filters,
+        test_multiplication_tables_cover_both_orders,
+        test_invalid_bands,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-step and missing-operand expression problems
+"""
+
+import sys
+from itertools import product
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.expressions import (
+    APPLY,
+    BLANK,
+    ExpressionRules,
+    ExpressionSpace,
+    canonical,
+    evaluate,
+    operator_patterns,
+    render,
+    with_blank,
+)
+
+
+def follows_rules(tree, rules):
+    if not isinstance(tree, tuple):
+        return rules.leaf_min <= tree <= rules.leaf_max
+    symbol, left, right = tree
+    x, y = evaluate(left), evaluate(right)
+    if symbol == "×" and not (x >= 2 and y >= 2 and min(x, y) <= rules.max_factor):
+        return False
+    if symbol == "÷" and (not 2 <= y <= rules.max_factor or x % y):
+        return False
+    return (
+        1 <= APPLY[symbol](x, y) <= rules.max_value
+        and follows_rules(left, rules)
+        and follows_rules(right, rules)
+    )
+
+
+def brute_force(rules, steps):
+    """Every rule-abiding tree, by filling every pattern with every number"""
+    numbers = range(rules.leaf_min, rules.leaf_max + 1)
+    trees = set()
+    for pattern in operator_patterns(steps, rules.operators):
+
+        def fill(node, leaves):
+            if node is None:
+                return next(leaves)
+            return node[0], fill(node[1], leaves), fill(node[2], leaves)
+
+        for leaves in product(numbers, repeat=steps + 1):
+            tree = fill(pattern, iter(leaves))
+            if follows_rules(tree, rules):
+                trees.add(tree)
+    return trees
+
+
+def test_canonical_forms():
+    """Commutative and associative variants share one canonical form"""
+    print("🧪 Testing canonical forms...")
+
+    variants = [
+        ("×", ("+", 12, 7), 3),
+        ("×", 3, ("+", 7, 12)),
+        ("×", ("+", 7, 12), 3),
+    ]
+    assert len({canonical(tree) for tree in variants}) == 1
+    assert canonical(("+", ("+", 1, 2), 3)) == canonical(("+", 3, ("+", 2, 1)))
+    # Order matters for - and ÷, and so does grouping across operators
+    assert canonical(("-", 9, 4)) != canonical(("-", 4, 9))
+    assert canonical(("-", ("-", 9, 4), 2)) != canonical(("-", 9, ("-", 4, 2)))
+    assert canonical(("×", ("+", 2, 3), 4)) != canonical(("+", 2, ("×", 3, 4)))
+
+    print("  ✅ Variants collapse, distinct expressions do not")
+    return True
+
+
+def test_rendering_and_blanks():
+    """Expressions print with the parentheses they need"""
+    print("🧪 Testing rendering...")
+
+    assert render(("×", ("+", 12, 7), 3)) == "(12 + 7) × 3"
+    assert render(("+", 12, ("×", 7, 3))) == "12 + 7 × 3"
+    assert render(("-", 20, ("-", 8, 3))) == "20 - (8 - 3)"
+    assert render(("-", ("-", 20, 8), 3)) == "20 - 8 - 3"
+    assert render(("÷", ("×", 6, 4), 3)) == "6 × 4 ÷ 3"
+    assert evaluate(("÷", ("×", 6, 4), 3)) == 8
+
+    blanked, hidden = with_blank(("+", 7, 8), 0)
+    assert blanked == ("+", BLANK, 8) and hidden == 7
+    blanked, hidden = with_blank(("×", ("+", 12, 7), 3), 1)
+    assert render(blanked) == "(12 + __) × 3" and hidden == 7
+
+    print("  ✅ Parentheses and blanks are placed correctly")
+    return True
+
+
+def test_space_matches_brute_force():
+    """The enumerated space holds exactly the trees that follow the rules"""
+    print("🧪 Testing expression spaces against brute force...")
+
+    for rules, steps in [
+        (ExpressionRules(1, 9, 30, 6), 1),
+        (ExpressionRules(1, 6, 20, 4), 2),
+        (ExpressionRules(2, 5, 12, 3, ("+", "-", "÷")), 2),
+    ]:
+        expected = brute_force(rules, steps)
+        space = ExpressionSpace(rules, (steps,), False)
+        trees = [space.unrank(i)[0] for i in range(space.size)]
+        assert len(trees) == len(expected), (rules, len(trees), len(expected))
+        assert set(trees) == expected
+
+        missing = ExpressionSpace(rules, (steps,), True)
+        assert missing.size == len(expected) * (steps + 1)
+        drawn = {missing.unrank(i) for i in range(missing.size)}
+        assert drawn == {
+            (tree, blank) for tree in expected for blank in range(steps + 1)
+        }
+
+    print("  ✅ Spaces are exact, with and without blanks")
+    return True
+
+
+def test_bracketed_sums_multiplied():
+    """A bracketed sum above max_factor can still be multiplied"""
+    print("🧪 Testing products of bracketed sums...")
+
+    generator = MathGenerator(seed=3)
+    space = generator._expression_space(generator._age_spec("8-10"), "multi_step")
+    max_factor = space.rules.max_factor
+    trees = {space.unrank(i)[0] for i in range(space.size)}
+    assert ("×", ("+", 12, 7), 3) in trees and ("×", 3, ("+", 12, 7)) in trees
+    assert 12 + 7 > max_factor
+
+    def multiplies_large_sum(tree):
+        return tree[0] == "×" and any(
+            isinstance(factor, tuple) and evaluate(factor) > max_factor
+            for factor in tree[1:]
+        )
+
+    problems = generator.generate_expression_problems("8-10", 300)
+    assert any(multiplies_large_sum(problem.params[0]) for problem in problems)
+
+    print("  ✅ (a + b) × c is generated when a + b > max_factor")
+    return True
+
+
+def test_generated_problems():
+    """Generated problems are correct, within the rules and unique"""
+    print("🧪 Testing generated expression problems...")
+
+    generator = MathGenerator(seed=11)
+    settings = generator._age_spec("8-10").expressions
+    rules = ExpressionRules(
+        settings["number_range"]["min"],
+        settings["number_range"]["max"],
+        settings["max_value"],
+        settings["max_factor"],
+    )
+
+    problems = generator.generate_expression_problems("8-10", 200)
+    for problem in problems:
+        tree, blank = problem.params
+        assert blank is None and follows_rules(tree, rules)
+        assert problem["answer"] == evaluate(tree)
+        assert problem["question"] == f"{render(tree)} = ____"
+        assert problem["type"] == "multi_step"
+    assert len({canonical(problem.params[0]) for problem in problems}) == 200
+
+    problems = generator.generate_expression_problems("8-10", 100, missing=True)
+    for problem in problems:
+        tree, blank = problem.params
+        blanked, hidden = with_blank(tree, blank)
+        assert problem["answer"] == hidden
+        assert problem["question"] == f"{render(blanked)} = {evaluate(tree)}"
+        assert BLANK in problem["question"]
+    keys = {
+        (canonical(with_blank(*problem.params)[0]), evaluate(problem.params[0]))
+        for problem in problems
+    }
+    assert len(keys) == 100
+
+    first, second = [
+        MathGenerator(seed=5).generate_expression_problems("8-10", 12)
+        for _ in range(2)
+    ]
+    assert first == second
+
+    mixed = generator.iter_problems(
+        "8-10", distribution={"multi_step": 2, "missing_operand": 1}, limit=30
+    )
+    assert sorted(problem["type"] for problem in mixed) == sorted(
+        ["multi_step"] * 20 + ["missing_operand"] * 10
+    )
+
+    print("  ✅ Expression problems follow the rules and the seed")
+    return True
+
+
+def test_ages_without_expressions():
+    """Ages without "expressions" settings raise ValueError"""
+    print("🧪 Testing ages without expression settings...")
+
+    generator = MathGenerator()
+    for age_group in ["4-5", "11-12"]:
+        try:
+            generator.generate_expression_problems(age_group, 5)
+            assert False, f"Expected ValueError for {age_group}"
+        except ValueError:
+            pass
+
+    print("  ✅ Unconfigured ages raise ValueError")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_canonical_forms,
+        test_rendering_and_blanks,
+        test_space_matches_brute_force,
+        test_bracketed_sums_multiplied,
+        test_generated_problems,
+        test_ages_without_expressions,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for question fingerprints and the per-type uniqueness registry
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+from worksheet_generator.utils.fingerprint import fingerprint
+from worksheet_generator.utils.uniqueness import UniquenessRegistry
+
+SAMPLE_PARTS = ("vocab", "big", "large", ["large", "small", "tiny"], "4-5")
+
+
+def test_fingerprint_values():
+    """Fingerprints are 64-bit and distinguish types and part boundaries"""
+    print("🧪 Testing fingerprint values...")
+
+    value = fingerprint(*SAMPLE_PARTS)
+    assert isinstance(value, int) and 0 <= value < 2**64
+    assert value == fingerprint(*SAMPLE_PARTS)
+    assert fingerprint("add", 1, 2) != fingerprint("add", "1", "2")
+    assert fingerprint("add", 12, 3) != fingerprint("add", 1, 23)
+    assert fingerprint("a", ("b", "c")) != fingerprint("a", "b", "c")
+
+    print("  ✅ Fingerprints are stable and unambiguous")
+    return True
+
+
+def test_fingerprint_is_process_independent():
+    """Different PYTHONHASHSEED values give the same fingerprint"""
+    print("🧪 Testing fingerprints across processes...")
+
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from worksheet_generator.utils.fingerprint import fingerprint;"
+        f"print(fingerprint(*{SAMPLE_PARTS!r}))"
+    )
+    values = set()
+    for seed in ["1", "2", "random"]:
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(project_root)],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        values.add(int(result.stdout))
+    assert values == {fingerprint(*SAMPLE_PARTS)}
+
+    print("  ✅ Same fingerprint under every hash seed")
+    return True
+
+
+def test_uniqueness_registry():
+    """Counts per kind and per family stay in step with the key sets"""
+    print("🧪 Testing the uniqueness registry...")
+
+    registry = UniquenessRegistry()
+    assert registry.add("vocab", "big", "large")
+    assert not registry.add("vocab", "big", "large")
+    assert registry.add("vocab_fallback", "big", "large")
+    assert registry.add("vocab_dynamic", "good", 0)
+    assert registry.add("sentence", "The cat is ____.")
+
+    assert registry.count("vocab") == 1
+    assert registry.count("vocab_fallback") == 1
+    assert registry.family_count("vocab") == 3
+    assert registry.family_count("sentence") == 1
+    assert registry.family_count("pattern") == 0
+    assert len(registry) == 4
+    assert registry.keys("vocab") == {fingerprint("vocab", "big", "large")}
+
+    registry.clear()
+    assert len(registry) == 0 and registry.count("vocab") == 0
+
+    print("  ✅ Registry counts are exact")
+    return True
+
+
+def test_generators_track_fingerprints():
+    """Every generator stores integer keys and still avoids duplicates"""
+    print("🧪 Testing fingerprint-based uniqueness tracking...")
+
+    for generator in [MathGenerator(), LogicGenerator(), ReadingGenerator()]:
+        problems = generator.generate_problems("6-7", 20)
+        kinds = generator.registry.kinds()
+        assert kinds and sum(kinds.values()) == len(generator.registry)
+        for kind in kinds:
+            assert all(isinstance(key, int) for key in generator.registry.keys(kind))
+        questions = [p["question"] for p in problems]
+        assert len(set(questions)) == len(questions), type(generator).__name__
+
+    # Fallback variety is driven by per-kind counts
+    generator = ReadingGenerator()
+    generator._generate_fallback_vocabulary("4-5")
+    generator._generate_fallback_vocabulary("4-5")
+    assert generator.registry.family_count("vocab") == 2
+    generator.reset_generated_questions()
+    assert len(generator.registry) == 0 and not generator.registry.kinds()
+
+    print("  ✅ Generators track questions by fingerprint")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_fingerprint_values,
+        test_fingerprint_is_process_independent,
+        test_uniqueness_registry,
+        test_generators_track_fingerprints,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for generating a whole set of worksheets in one call
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from cli import generate_comprehensive_worksheets, get_comprehensive_distribution
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+from worksheet_generator.utils import ExactScope
+from worksheet_generator.utils.capacity import diversity_window
+
+GENERATORS = [MathGenerator, LogicGenerator, ReadingGenerator]
+
+
+def questions(worksheet):
+    return {problem["question"] for problem in worksheet}
+
+
+def test_generate_worksheets_shape():
+    """n worksheets of count problems, each free of duplicates"""
+    print("🧪 Testing generate_worksheets output...")
+
+    for generator_class in GENERATORS:
+        generator = generator_class(seed=11)
+        worksheets = generator.generate_worksheets("8-10", 15, 12)
+        assert len(worksheets) == 12, generator_class.__name__
+        for worksheet in worksheets:
+            assert len(worksheet) == 15, generator_class.__name__
+            assert len(questions(worksheet)) == 15, generator_class.__name__
+        # The run's own scope is dropped afterwards
+        assert generator.registry.scope is None
+
+    print("  ✅ Every worksheet is complete and unique")
+    return True
+
+
+def test_diverse_worksheets_share_no_questions():
+    """Worksheets within a diversity window never repeat a question"""
+    print("🧪 Testing cross-worksheet diversity...")
+
+    for generator_class, age_group in [(MathGenerator, "6-7"), (LogicGenerator, "6-7")]:
+        generator = generator_class(seed=5)
+        window = diversity_window(
+            generator._get_structured_distribution(age_group, 20),
+            generator.get_capacity(age_group),
+        )
+        assert window > 1, generator_class.__name__
+
+        worksheets = generator.generate_worksheets(age_group, 20, window)
+        seen = set()
+        for worksheet in worksheets:
+            assert not seen & questions(worksheet), generator_class.__name__
+            seen |= questions(worksheet)
+
+    print("  ✅ No question repeats within a window")
+    return True
+
+
+def test_diversity_window():
+    """The problem type that runs out first limits the window"""
+    print("🧪 Testing diversity window...")
+
+    capacity = {
+        "a": {"available": 100, "exact": True},
+        "b": {"available": 25, "exact": True},
+    }
+    assert diversity_window({"a": 10, "b": 5}, capacity) == 5
+    assert diversity_window({"a": 10, "b": 0}, capacity) == 10
+    assert diversity_window({"a": 10, "b": 50}, capacity) == 1
+
+    print("  ✅ Window follows the scarcest problem type")
+    return True
+
+
+def test_generate_worksheets_uses_given_scope():
+    """A scope passed to the generator spans the run and is kept"""
+    print("🧪 Testing generate_worksheets with a batch scope...")
+
+    scope = ExactScope()
+    generator = MathGenerator(scope=scope, seed=2)
+    worksheets = generator.generate_worksheets("8-10", 10, 4)
+    assert generator.registry.scope is scope
+    assert len(scope) == sum(len(worksheet) for worksheet in worksheets)
+
+    print("  ✅ The generator's scope is used")
+    return True
+
+
+def test_generate_worksheets_is_reproducible():
+    """The same seed gives the same set of worksheets"""
+    print("🧪 Testing seeded worksheet sets...")
+
+    for generator_class in GENERATORS:
+        first = generator_class(seed=9).generate_worksheets("8-10", 10, 5)
+        second = generator_class(seed=9).generate_worksheets("8-10", 10, 5)
+        assert first == second, generator_class.__name__
+
+    first = generate_comprehensive_worksheets("8-10", 20, 4, seed=3)
+    second = generate_comprehensive_worksheets("8-10", 20, 4, seed=3)
+    assert first == second
+
+    print("  ✅ Seeded runs repeat exactly")
+    return True
+
+
+def test_comprehensive_worksheets():
+    """Each assessment has the usual subject split"""
+    print("🧪 Testing comprehensive worksheet sets...")
+
+    assessments = generate_comprehensive_worksheets("6-7", 30, 6, seed=1)
+    distribution = get_comprehensive_distribution("6-7", 30)
+    assert len(assessments) == 6
+    for assessment in assessments:
+        assert len(assessment) == 30
+        for subject, count in distribution.items():
+            assert sum(1 for p in assessment if p["subject"] == subject) == count
+
+    print("  ✅ Assessments keep the subject split")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_generate_worksheets_shape,
+        test_diverse_worksheets_share_no_questions,
+        test_diversity_window,
+        test_generate_worksheets_uses_given_scope,
+        test_generate_worksheets_is_reproducible,
+        test_comprehensive_worksheets,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for lazily streamed problems (iter_problems) and stream cursors
+"""
+
+import itertools
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, MathGenerator, ReadingGenerator
+from worksheet_generator.utils import batch_scope
+
+GENERATORS = [MathGenerator, LogicGenerator, ReadingGenerator]
+
+# Problem "type" field of each math distribution type
+MATH_TYPES = {
+    "addition": "addition",
+    "subtraction": "subtraction",
+    "multiplication": "multiplication",
+    "division": "division",
+    "word": "word_problem",
+}
+
+
+def test_limited_stream_matches_distribution():
+    """A stream of limit problems has the worksheet's type counts"""
+    print("🧪 Testing limited streams...")
+
+    generator = MathGenerator(seed=1)
+    distribution = generator._get_structured_distribution("8-10", 20)
+    problems = list(generator.iter_problems("8-10", limit=20))
+    assert len(problems) == 20
+
+    counts = Counter(problem["type"] for problem in problems)
+    for problem_type, count in distribution.items():
+        assert counts[MATH_TYPES[problem_type]] == count, problem_type
+    assert len({problem["question"] for problem in problems}) == 20
+
+    print("  ✅ Type counts and uniqueness match generate_problems")
+    return True
+
+
+def test_stream_is_lazy():
+    """Only the problems read are generated"""
+    print("🧪 Testing lazy generation...")
+
+    for generator_class in GENERATORS:
+        generator = generator_class(seed=2)
+        stream = generator.iter_problems("6-7")
+        next(stream)
+        next(stream)
+        assert len(generator.registry) == 2, generator_class.__name__
+        assert stream.cursor["position"] == 2
+
+    print("  ✅ Nothing is generated ahead of the reader")
+    return True
+
+
+def test_unbounded_stream_interleaves_types():
+    """Every cycle of an endless stream holds the requested counts"""
+    print("🧪 Testing endless streams...")
+
+    distribution = {"pattern": 2, "reasoning": 1}
+    stream = LogicGenerator(seed=3).iter_problems("8-10", distribution=distribution)
+    problems = list(itertools.islice(stream, 30))
+    for start in range(0, 30, 3):
+        cycle = Counter(problem["type"] for problem in problems[start : start + 3])
+        assert cycle == {"pattern": 2, "logical_reasoning": 1}, cycle
+
+    print("  ✅ Types are interleaved cycle by cycle")
+    return True
+
+
+def test_resume_from_cursor():
+    """A resumed stream continues exactly where the cursor was taken"""
+    print("🧪 Testing stream cursors...")
+
+    for generator_class in GENERATORS:
+        stream = generator_class(seed=4).iter_problems("8-10")
+        list(itertools.islice(stream, 12))
+        cursor = json.loads(json.dumps(stream.cursor))
+        expected = list(itertools.islice(stream, 8))
+
+        resumed = generator_class().iter_problems("8-10", cursor=cursor, limit=8)
+        assert list(resumed) == expected, generator_class.__name__
+        assert resumed.cursor["position"] == 20
+
+    print("  ✅ Cursors survive JSON and resume exactly")
+    return True
+
+
+def test_resume_with_shared_scope():
+    """Resuming with a batch scope does not collide with the stream's own keys"""
+    print("🧪 Testing stream cursors with a shared scope...")
+
+    for generator_class in GENERATORS:
+        scope = batch_scope(100)
+        stream = generator_class(seed=4, scope=scope).iter_problems("8-10")
+        list(itertools.islice(stream, 12))
+        cursor = json.loads(json.dumps(stream.cursor))
+        used = len(scope)
+
+        expected = list(generator_class().iter_problems("8-10", cursor=cursor, limit=8))
+        resumed = generator_class(scope=scope).iter_problems(
+            "8-10", cursor=cursor, limit=8
+        )
+        assert list(resumed) == expected, generator_class.__name__
+        assert len(scope) == used + 8, generator_class.__name__
+
+    print("  ✅ Resumed streams only add problems after the cursor to the scope")
+    return True
+
+
+def test_seeded_streams_repeat():
+    """Seeded generators give the same stream"""
+    print("🧪 Testing seeded streams...")
+
+    for generator_class in GENERATORS:
+        first = list(generator_class(seed=5).iter_problems("4-5", limit=10))
+        second = list(generator_class(seed=5).iter_problems("4-5", limit=10))
+        assert first == second, generator_class.__name__
+
+    print("  ✅ Same seed, same stream")
+    return True
+
+
+def test_invalid_distributions():
+    """Empty distributions and unknown types are rejected"""
+    print("🧪 Testing invalid distributions...")
+
+    try:
+        ReadingGenerator().iter_problems("6-7", distribution={"story": 0})
+        assert False, "Expected ValueError for an empty distribution"
+    except ValueError:
+        pass
+
+    stream = ReadingGenerator().iter_problems("6-7", distribution={"riddle": 1})
+    try:
+        next(stream)
+        assert False, "Expected ValueError for an unknown problem type"
+    except ValueError:
+        pass
+
+    print("  ✅ Invalid distributions raise ValueError")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_limited_stream_matches_distribution,
+        test_stream_is_lazy,
+        test_unbounded_stream_interleaves_types,
+        test_resume_from_cursor,
+        test_resume_with_shared_scope,
+        test_seeded_streams_repeat,
+        test_invalid_distributions,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script for JSON Lines story banks with a byte-offset index
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import ReadingGenerator
+from worksheet_generator.data import (
+    DataSourceLoader,
+    JSONLContentBank,
+    convert_json_to_jsonl,
+    convert_story_files,
+)
+
+DATA_SOURCE_PATH = str(project_root / "data_source")
+AGE_GROUPS = ["4-5", "6-7", "8-10"]
+
+
+def _jsonl_data_source(tmp):
+    """Copy of data_source whose stories only exist as JSONL banks"""
+    data_path = os.path.join(tmp, "data_source")
+    shutil.copytree(DATA_SOURCE_PATH, data_path)
+    convert_story_files(data_path)
+    for name in ["simple", "intermediate", "advanced"]:
+        os.remove(os.path.join(data_path, "reading_source", f"{name}_stories.json"))
+    return data_path
+
+
+def test_jsonl_matches_json_stories():
+    """JSONL banks return the same stories as the JSON files"""
+    print("🧪 Testing JSONL story banks against the JSON story files...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = _jsonl_data_source(tmp)
+        json_loader = DataSourceLoader(DATA_SOURCE_PATH)
+
+        for use_mmap in [False, True]:
+            loader = DataSourceLoader(data_path, use_mmap=use_mmap)
+            for age_group in AGE_GROUPS:
+                expected = json_loader.get_stories(age_group)
+                assert loader.get_stories(age_group) == expected, age_group
+
+                sample = loader.get_stories(age_group, sample=7)
+                assert len(sample) == 7
+                assert all(story in expected for story in sample)
+
+            # Story JSON was never parsed through the regular loader
+            assert "reading" not in loader.get_cache_info()
+
+        problems = ReadingGenerator(DataSourceLoader(data_path)).generate_problems("6-7", 10)
+        assert len(problems) == 10
+
+    print("  ✅ JSONL banks serve the same stories")
+    return True
+
+
+def test_index_is_rebuilt_when_stale():
+    """A missing or outdated sidecar index is rebuilt; blank lines are skipped"""
+    print("🧪 Testing JSONL offset index maintenance...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "simple_stories.json")
+        shutil.copy(os.path.join(DATA_SOURCE_PATH, "reading_source", "simple_stories.json"), json_path)
+        jsonl_path = os.path.join(tmp, "simple_stories.jsonl")
+        count = convert_json_to_jsonl(json_path)
+        assert os.path.exists(jsonl_path + ".idx")
+
+        bank = JSONLContentBank(jsonl_path)
+        assert len(bank) == count
+        first = bank.get(0)
+        bank.close()
+
+        # Append a story after a blank line; the old index no longer matches
+        time.sleep(0.01)
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write("\n" + json.dumps({"title": "Extra", "text": "The end."}) + "\n")
+
+        bank = JSONLContentBank(jsonl_path)
+        assert len(bank) == count + 1
+        assert bank.get(0) == first
+        assert bank.get(count)["title"] == "Extra"
+        bank.close()
+
+        os.remove(jsonl_path + ".idx")
+        bank = JSONLContentBank(jsonl_path, use_mmap=True)
+        assert len(bank) == count + 1
+        assert bank.get_items()[-1]["title"] == "Extra"
+        bank.close()
+
+    print("  ✅ Offset index is rebuilt when needed")
+    return True
+
+
+def test_reload_detects_jsonl_changes():
+    """Incremental reloads pick up edited JSONL banks"""
+    print("🧪 Testing incremental reload of JSONL story banks...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = _jsonl_data_source(tmp)
+        loader = DataSourceLoader(data_path)
+        assert len(loader.get_stories("4-5")) > 1
+
+        jsonl_path = os.path.join(data_path, "reading_source", "simple_stories.jsonl")
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            first_line = f.readline()
+        time.sleep(0.01)
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            f.write(first_line)
+
+        assert loader.reload_changed_sources() == ["reading/simple_stories.jsonl"]
+        assert len(loader.get_stories("4-5")) == 1
+        assert loader.reload_changed_sources() == []
+
+    print("  ✅ Changed JSONL banks are reopened")
+    return True
+
+
+def test_dropped_banks_are_closed():
+    """Banks dropped by a reload release their file once no reader holds them"""
+    print("🧪 Testing dropped JSONL banks release their handles...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = _jsonl_data_source(tmp)
+        loader = DataSourceLoader(data_path, use_mmap=True)
+        jsonl_path = os.path.join(data_path, "reading_source", "simple_stories.jsonl")
+
+        # A reader still holding the old bank can finish with it
+        held = loader._get_story_bank("simple_stories")
+        first = held.get(0)
+        held_file = held._file
+        time.sleep(0.01)
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(first) + "\n")
+        assert loader.reload_changed_sources() == ["reading/simple_stories.jsonl"]
+        assert held.get(0) == first and not held_file.closed
+        del held
+        assert held_file.closed
+
+        # Without readers the dropped bank is released by the reload itself
+        bank_file = loader._get_story_bank("simple_stories")._file
+        time.sleep(0.01)
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(first) + "\n")
+        assert loader.reload_changed_sources() == ["reading/simple_stories.jsonl"]
+        assert bank_file.closed
+
+        bank = JSONLContentBank(jsonl_path, use_mmap=True)
+        bank.close()
+        bank.close()
+        assert bank._file.closed
+
+    print("  ✅ Dropped banks close their file and memory map")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_jsonl_matches_json_stories,
+        test_index_is_rebuilt_when_stale,
+        test_reload_detects_jsonl_changes,
+        test_dropped_banks_are_closed,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for sampling math problems without replacement
+"""
+
+import sys
+import random
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.operation_specs import operation_spec
+from worksheet_generator.utils.sampling import LazyPermutation, RowSpace, SpaceSampler
+
+OPERATION_SETTINGS = [
+    ("addition", 10, True),
+    ("addition", 20, False),
+    ("subtraction", 10, True),
+    ("subtraction", 50, False),
+    ("multiplication", 100, True),
+    ("multiplication", 100, False),
+    ("division", 100, True),
+    ("division", 100, False),
+]
+
+
+def test_lazy_permutation():
+    """Every index is drawn exactly once"""
+    print("🧪 Testing lazy Fisher–Yates permutation...")
+
+    for n in [0, 1, 7, 1000]:
+        permutation = LazyPermutation(n, random.Random(n))
+        assert sorted(permutation) == list(range(n))
+        assert permutation.remaining == 0
+
+    space = RowSpace([(1, 1, 3), (2, 5, 4), (3, 1, 1)])
+    assert len(space) == 4
+    assert [space.unrank(i) for i in range(4)] == [(1, 1), (1, 2), (1, 3), (3, 1)]
+
+    print("  ✅ Permutation and unranking are complete and exact")
+    return True
+
+
+def test_operations_exhaust_space_without_duplicates():
+    """Each operation yields every operand pair once before repeating"""
+    print("🧪 Testing math sampling without replacement...")
+
+    generator = MathGenerator()
+    for operation, max_num, simple in OPERATION_SETTINGS:
+        space_size = len(operation_spec(operation, max_num, simple).space)
+        generate = getattr(generator, f"generate_{operation}")
+
+        generator.reset_generated_questions()
+        problems = [generate(max_num, simple=simple) for _ in range(space_size)]
+        questions = [p["question"] for p in problems]
+        assert len(set(questions)) == space_size, operation
+
+        for problem in problems:
+            expression = problem["question"].replace(" = ____", "")
+            expression = expression.replace("×", "*").replace("÷", "//")
+            assert eval(expression) == problem["answer"], problem["question"]
+
+        # The space is exhausted: the next problem is a repeat
+        assert generate(max_num, simple=simple)["question"] in questions
+
+    print("  ✅ Problems are unique until the operand space is exhausted")
+    return True
+
+
+def test_long_worksheet_of_simple_addition():
+    """4-5 simple addition has 35 pairs and a 35-question run never repeats"""
+    print("🧪 Testing a full run of 4-5 simple addition...")
+
+    generator = MathGenerator()
+    for _ in range(20):
+        generator.reset_generated_questions()
+        questions = [
+            generator.generate_addition(10, simple=True)["question"] for _ in range(35)
+        ]
+        assert len(set(questions)) == 35
+        for question in questions:
+            a, b = [int(x) for x in question.replace(" = ____", "").split(" + ")]
+            assert 1 <= a <= 5 and 1 <= b and a + b <= 10
+
+    print("  ✅ No duplicates in a full simple addition run")
+    return True
+
+
+def test_exhausted_space_draws_once_per_problem():
+    """Once a space is used up, each problem takes a single draw"""
+    print("🧪 Testing draws after the operand space is exhausted...")
+
+    sampler = SpaceSampler(RowSpace([(1, 1, 3)]), random.Random(1))
+    assert not sampler.exhausted
+    [sampler.draw() for _ in range(3)]
+    assert sampler.exhausted and sampler.remaining == 0
+    sampler.draw()
+    # A new pass has started, but repeats are now expected
+    assert sampler.exhausted and sampler.remaining == 2
+
+    # Repeats are accepted instead of rescanning the permutation for an
+    # unused question, which made long runs quadratic
+    generator = MathGenerator(seed=2)
+    for _ in range(35):
+        generator.generate_addition(10, simple=True)
+    (sampler,) = generator._operand_samplers.values()
+    for _ in range(100):
+        remaining = sampler.remaining
+        generator.generate_addition(10, simple=True)
+        assert sampler.remaining == (remaining - 1) % 35
+
+    print("  ✅ Exhausted spaces cost one draw per problem")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_lazy_permutation,
+        test_operations_exhaust_space_without_duplicates,
+        test_long_worksheet_of_simple_addition,
+        test_exhausted_space_draws_once_per_problem,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
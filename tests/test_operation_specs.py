@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for operation specs compiled from operation_settings.json
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.operation_specs import compile_age_spec, operation_spec
+from worksheet_generator.data.data_loader import DataSourceLoader
+
+DATA_SOURCE_PATH = str(project_root / "data_source")
+SETTINGS_FILE = os.path.join("math_source", "operation_settings.json")
+
+def pairs(spec):
+    return [spec.space.unrank(i) for i in range(len(spec.space))]
+
+
+def edit_settings(data_path, edit):
+    path = os.path.join(data_path, SETTINGS_FILE)
+    with open(path, encoding="utf-8") as f:
+        settings_data = json.load(f)
+    edit(settings_data)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(settings_data, f)
+
+
+def test_specs_follow_settings():
+    """Tables, simple flags and max_divisor come from the settings file"""
+    print("🧪 Testing compiled operation specs...")
+
+    generator = MathGenerator()
+    young = generator._age_spec("6-7").operations["multiplication"]
+    assert young.simple and {a for a, _ in pairs(young)} == {2, 3, 5, 10}
+
+    # 8-10: "Multiplication tables up to 12" and divisors up to max_divisor
+    older = generator._age_spec("8-10")
+    assert not older.operations["multiplication"].simple
+    assert max(a for a, _ in pairs(older.operations["multiplication"])) == 12
+    division = pairs(older.operations["division"])
+    assert max(b for b, _ in division) == 12
+    assert all(b * result <= older.max_num for b, result in division)
+
+    # Equal settings share one compiled spec
+    assert operation_spec("addition", 50) is operation_spec("addition", 50)
+    assert generator._age_spec("6-7").operations["addition"] is operation_spec(
+        "addition", 50, False, None, None, True
+    )
+
+    print("  ✅ Specs honour operation_settings.json")
+    return True
+
+
+def test_distribution_weights():
+    """Worksheet type counts come from the settings' distribution weights"""
+    print("🧪 Testing distribution weights...")
+
+    generator = MathGenerator()
+    assert generator._get_structured_distribution("4-5", 20) == {
+        "addition": 10,
+        "subtraction": 5,
+        "word": 5,
+    }
+    for age_group in ["4-5", "6-7", "8-10"]:
+        for count in range(0, 60):
+            distribution = generator._get_structured_distribution(age_group, count)
+            assert sum(distribution.values()) == count, (age_group, count)
+
+    settings_data = {"operation_settings": {"x": {"addition": {"simple": True}}}}
+    # Equal default weights; the rounding difference goes to the first type
+    assert compile_age_spec("x", settings_data).distribution(7) == {
+        "addition": 3,
+        "word": 4,
+    }
+    try:
+        compile_age_spec("11-12", settings_data)
+        assert False, "Expected ValueError for an unknown age group"
+    except ValueError:
+        pass
+
+    print("  ✅ Weights, rounding and defaults are data-driven")
+    return True
+
+
+def test_new_age_group_needs_no_code():
+    """An age group added to the settings file generates worksheets"""
+    print("🧪 Testing a new age group from settings only...")
+
+    def add_age_group(settings_data):
+        settings_data["operation_settings"]["11-12"] = {
+            "addition": {"simple": False},
+            "multiplication": {"simple": True, "tables": [6, 7, 8, 9]},
+        }
+        settings_data["number_ranges"]["11-12"] = {"min": 1, "max": 1000}
+        settings_data["distributions"]["11-12"] = {
+            "weights": {"addition": 1, "multiplication": 3},
+            "remainder": "multiplication",
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data_source")
+        shutil.copytree(DATA_SOURCE_PATH, data_path)
+        edit_settings(data_path, add_age_group)
+
+        generator = MathGenerator(DataSourceLoader(data_path), seed=1)
+        problems = generator.generate_problems("11-12", 40)
+        assert Counter(p["type"] for p in problems) == {
+            "addition": 10,
+            "multiplication": 30,
+        }
+        for problem in problems:
+            a, b = problem.params
+            if problem["type"] == "multiplication":
+                assert a in (6, 7, 8, 9) and 1 <= b <= 10
+            else:
+                assert a <= 1000 and b <= 1000
+
+    print("  ✅ New age groups and number ranges need no code")
+    return True
+
+
+def test_reloaded_settings_are_recompiled():
+    """Reloading the content recompiles the generator's specs"""
+    print("🧪 Testing reloaded settings...")
+
+    def only_tables_of_two(settings_data):
+        settings_data["operation_settings"]["6-7"]["multiplication"]["tables"] = [2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data_source")
+        shutil.copytree(DATA_SOURCE_PATH, data_path)
+        loader = DataSourceLoader(data_path)
+        generator = MathGenerator(loader, seed=2)
+        assert generator.get_capacity("6-7")["multiplication"]["available"] == 40
+
+        edit_settings(data_path, only_tables_of_two)
+        loader.reload_sources()
+        assert generator.get_capacity("6-7")["multiplication"]["available"] == 10
+        problems = generator.iter_problems(
+            "6-7", distribution={"multiplication": 1}, limit=10
+        )
+        assert {problem.params[0] for problem in problems} == {2}
+
+    print("  ✅ Settings changes apply after a reload")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_specs_follow_settings,
+        test_distribution_weights,
+        test_new_age_group_needs_no_code,
+        test_reloaded_settings_are_recompiled,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for the slotted Problem record and its dict compatibility
+"""
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, MathGenerator, Problem, ReadingGenerator
+from worksheet_generator.core.problem import ArithmeticText, TemplateText
+
+
+def make_problem():
+    return Problem(
+        question="3 + 4 = ____",
+        answer=7,
+        explanation="3 + 4 = 7",
+        type="addition",
+    )
+
+
+def test_problem_reads_like_a_dict():
+    """Item access, get, in, len, iteration and equality with dicts"""
+    print("🧪 Testing Problem dict compatibility...")
+
+    problem = make_problem()
+    as_dict = {
+        "question": "3 + 4 = ____",
+        "answer": 7,
+        "explanation": "3 + 4 = 7",
+        "type": "addition",
+    }
+    assert problem == as_dict and as_dict == problem
+    assert problem["answer"] == 7
+    assert problem.get("subject") is None
+    assert problem.get("subject", "unknown") == "unknown"
+    assert "explanation" in problem and "subject" not in problem
+    assert list(problem) == list(as_dict) and len(problem) == 4
+
+    try:
+        problem["subject"]
+        assert False, "Expected KeyError for a missing key"
+    except KeyError:
+        pass
+
+    print("  ✅ Problem behaves like the old problem dicts")
+    return True
+
+
+def test_problem_writes_like_a_dict():
+    """Setting and deleting keys, including keys outside the slots"""
+    print("🧪 Testing Problem updates...")
+
+    problem = make_problem()
+    problem["subject"] = "math"
+    problem["story_title"] = "The Big Race"
+    assert problem["subject"] == "math"
+    assert problem.to_dict()["story_title"] == "The Big Race"
+    assert len(problem) == 6
+
+    del problem["story_title"]
+    del problem["subject"]
+    assert problem == make_problem()
+    assert not hasattr(problem, "__dict__")
+
+    print("  ✅ Keys can be added and removed")
+    return True
+
+
+def test_type_and_subject_are_interned():
+    """Problems loaded separately share one type and subject string"""
+    print("🧪 Testing interned type and subject...")
+
+    line = json.dumps({**make_problem().to_dict(), "subject": "math"})
+    first = Problem.from_dict(json.loads(line))
+    second = Problem.from_dict(json.loads(line))
+    assert first == second
+    assert first["type"] is second["type"]
+    assert first["subject"] is second["subject"]
+
+    print("  ✅ Type and subject names are shared")
+    return True
+
+
+def test_problem_round_trips():
+    """Pickle and JSON (via to_dict) keep every key"""
+    print("🧪 Testing Problem serialisation...")
+
+    problem = make_problem()
+    problem["subject"] = "math"
+    assert pickle.loads(pickle.dumps(problem)) == problem
+    assert Problem.from_dict(json.loads(json.dumps(problem.to_dict()))) == problem
+
+    print("  ✅ Pickle and JSON round trips")
+    return True
+
+
+class CountingText(ArithmeticText):
+    """ArithmeticText that counts how often each field is rendered"""
+
+    __slots__ = ("renders",)
+
+    def __init__(self, symbol):
+        super().__init__(symbol)
+        self.renders = {"question": 0, "explanation": 0}
+
+    def question(self, params):
+        self.renders["question"] += 1
+        return super().question(params)
+
+    def explanation(self, params, answer):
+        self.renders["explanation"] += 1
+        return super().explanation(params, answer)
+
+
+def test_lazy_text_is_rendered_once_on_access():
+    """Lazy problems render each text field on first read only"""
+    print("🧪 Testing lazy question/explanation rendering...")
+
+    text = CountingText("+")
+    problem = Problem.lazy(text, (3, 4), 7, "addition")
+    assert problem.params == (3, 4)
+
+    # Presence checks, iteration and partial exports do not render
+    assert "explanation" in problem and len(problem) == 4
+    assert list(problem) == ["question", "answer", "explanation", "type"]
+    exported = problem.to_dict(("question", "answer", "type"))
+    assert exported == {"question": "3 + 4 = ____", "answer": 7, "type": "addition"}
+    assert text.renders == {"question": 1, "explanation": 0}
+
+    assert problem == make_problem()
+    problem["question"], problem["explanation"]
+    assert text.renders == {"question": 1, "explanation": 1}
+
+    # Deleting one field keeps the other
+    del problem["question"]
+    assert "question" not in problem
+    assert problem["explanation"] == "3 + 4 = 7"
+
+    print("  ✅ Text is rendered on demand and cached")
+    return True
+
+
+def test_lazy_word_problem_text():
+    """Template params fill the question and the explanation"""
+    print("🧪 Testing template text...")
+
+    text = TemplateText("Tom has {a} cars and gets {b} more.", "Answer: {answer}")
+    problem = Problem.lazy(text, {"a": 2, "b": 3}, 5, "word_problem")
+    assert problem["question"] == "Tom has 2 cars and gets 3 more."
+    assert problem["explanation"] == "Answer: 5"
+    assert pickle.loads(pickle.dumps(problem)) == problem
+
+    print("  ✅ Templates render from params")
+    return True
+
+
+def test_generators_return_problems():
+    """Every generator and the batch path produce Problem records"""
+    print("🧪 Testing generator output type...")
+
+    for generator_class in [MathGenerator, LogicGenerator, ReadingGenerator]:
+        problems = generator_class(seed=1).generate_problems("8-10", 15)
+        assert all(isinstance(problem, Problem) for problem in problems)
+
+    batch = MathGenerator(seed=1).generate_batch("8-10", 20)
+    assert all(isinstance(problem, Problem) for problem in batch.to_problems())
+    assert batch.to_problems() == batch.to_dicts()
+    assert all(type(problem) is dict for problem in batch.to_dicts())
+
+    print("  ✅ Generators return Problem records")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_problem_reads_like_a_dict,
+        test_problem_writes_like_a_dict,
+        test_type_and_subject_are_interned,
+        test_problem_round_trips,
+        test_lazy_text_is_rendered_once_on_access,
+        test_lazy_word_problem_text,
+        test_generators_return_problems,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
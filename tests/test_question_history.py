@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent per-student question history
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator import create_math_worksheet
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.data import QuestionHistory
+
+DAY = 86400
+
+
+def test_record_and_load():
+    """Fingerprints round-trip, including values above the signed range"""
+    print("🧪 Testing history record and load...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = QuestionHistory(os.path.join(tmp, "history.db"))
+        keys = {1, 2**63 - 1, 2**63, 2**64 - 1}
+        assert history.record("student-1", keys) == 4
+        history.record("student-1", {1})
+        assert history.load("student-1") == keys
+        assert history.load("student-2") == set()
+        assert history.stats() == {"students": 1, "entries": 4}
+
+        assert history.forget("student-1") == 4
+        assert history.load("student-1") == set()
+        history.close()
+
+    print("  ✅ History round-trips 64-bit fingerprints")
+    return True
+
+
+def test_eviction_policies():
+    """Old entries and entries beyond the per-student cap are pruned"""
+    print("🧪 Testing history eviction policies...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        now = time.time()
+
+        history = QuestionHistory(path, max_per_student=3)
+        history.record("a", [1, 2], seen_at=now - 3 * DAY)
+        history.record("a", [3, 4], seen_at=now - 2 * DAY)
+        history.record("b", [5], seen_at=now)
+        assert history.load("a") == {2, 3, 4} or history.load("a") == {1, 3, 4}
+        assert history.load("b") == {5}
+        history.close()
+
+        history = QuestionHistory(path, max_age_days=2.5)
+        # Expired entries are ignored until a prune removes them
+        assert history.load("a") == {3, 4}
+        assert history.prune(now) == 1
+        assert history.stats() == {"students": 2, "entries": 3}
+        # Recording prunes the student's own expired entries
+        history.record("c", [6], seen_at=now - 10 * DAY)
+        assert history.stats() == {"students": 2, "entries": 3}
+        history.close()
+
+    print("  ✅ Age and per-student limits keep the store small")
+    return True
+
+
+def test_history_scope_avoids_repeats():
+    """A student gets new questions until the problem space runs out"""
+    print("🧪 Testing repeats across a student's worksheets...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = QuestionHistory(os.path.join(tmp, "history.db"))
+
+        # 4-5 simple addition has 35 operand pairs
+        seen_questions = set()
+        for week in range(5):
+            scope = history.scope("student-1")
+            generator = MathGenerator(scope=scope)
+            questions = {
+                generator.generate_addition(10, simple=True)["question"] for _ in range(7)
+            }
+            assert len(questions) == 7
+            assert not questions & seen_questions, week
+            seen_questions |= questions
+            assert scope.commit() == 7
+        assert len(history.load("student-1")) == 35
+
+        # Another student starts from an empty history
+        assert len(history.scope("student-2").seen) == 0
+
+        # The history is extended after the PDF has been written
+        output_file = os.path.join(tmp, "worksheet.pdf")
+        create_math_worksheet(
+            "6-7", 10, output_file=output_file, student_id="student-3", history=history
+        )
+        assert os.path.exists(output_file)
+        assert len(history.load("student-3")) >= 10
+        history.close()
+
+    print("  ✅ Questions are not repeated across worksheets")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_record_and_load,
+        test_eviction_policies,
+        test_history_scope_avoids_repeats,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the optional SQLite content store backend
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import LogicGenerator, ReadingGenerator
+from worksheet_generator.data import DataSourceLoader, SQLiteContentStore
+
+DATA_SOURCE_PATH = str(project_root / "data_source")
+
+GETTERS = [
+    "get_stories",
+    "get_vocabulary_exercises",
+    "get_sentence_building_exercises",
+    "get_pattern_templates",
+    "get_classification_problems",
+    "get_reasoning_problems",
+]
+
+
+def test_store_matches_json_backend():
+    """Every getter returns the same items from SQLite as from JSON"""
+    print("🧪 Testing SQLite store parity with the JSON backend...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteContentStore.from_data_source(
+            os.path.join(tmp, "content.db"), DATA_SOURCE_PATH
+        )
+        json_loader = DataSourceLoader(DATA_SOURCE_PATH)
+        sqlite_loader = DataSourceLoader(DATA_SOURCE_PATH, store=store)
+
+        for age_group in ["4-5", "6-7", "8-10"]:
+            for getter in GETTERS:
+                expected = getattr(json_loader, getter)(age_group)
+                actual = getattr(sqlite_loader, getter)(age_group)
+                assert expected, f"{getter}({age_group}) has no content"
+                assert actual == expected, f"{getter}({age_group}) differs"
+
+                sample = getattr(sqlite_loader, getter)(age_group, sample=5)
+                assert len(sample) == 5
+                assert all(item in expected for item in sample)
+
+        # The reading/logic JSON files were never needed by the SQLite loader
+        assert "reading" not in sqlite_loader.get_cache_info()
+        store.close()
+
+    print("  ✅ SQLite store returns the same content as JSON")
+    return True
+
+
+def test_generators_with_sqlite_store():
+    """Generators produce unique worksheets from the SQLite backend"""
+    print("🧪 Testing generators backed by the SQLite store...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteContentStore.from_data_source(
+            os.path.join(tmp, "content.db"), DATA_SOURCE_PATH
+        )
+        loader = DataSourceLoader(DATA_SOURCE_PATH, store=store)
+
+        for generator_class in [LogicGenerator, ReadingGenerator]:
+            generator = generator_class()
+            generator.data_source = loader
+            problems = generator.generate_problems("6-7", 15)
+            questions = [p["question"] for p in problems]
+            assert len(problems) == 15
+            assert len(set(questions)) == len(questions)
+
+        store.close()
+
+    print("  ✅ Generators work with the SQLite store")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [test_store_matches_json_backend, test_generators_with_sqlite_store]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
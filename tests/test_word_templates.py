@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for compiled word problem templates (solved number ranges)
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(project_root))
+
+from worksheet_generator.core import MathGenerator
+from worksheet_generator.core.word_templates import (
+    WordTemplate,
+    compile_word_templates,
+)
+from worksheet_generator.data.data_loader import data_loader
+
+AGE_GROUPS = ["4-5", "6-7", "8-10"]
+
+
+def max_num_for(age_group):
+    settings = data_loader.get_operation_settings_with_ranges(age_group)
+    return settings["number_range"]["max"]
+
+
+def brute_force_params(template_data, max_num):
+    """Every valid parameter pair, found by checking all small numbers"""
+    setup = template_data.get("setup", {})
+    operation = template_data["operation"]
+    numbers = range(0, max_num + 1)
+    if operation == "division" and "{total}" in template_data["template"]:
+        b_range, result_range = setup["b"], setup["result"]
+        return {
+            (b * result, b)
+            for b in numbers
+            for result in numbers
+            if b_range["min"] <= b <= b_range["max"]
+            and result_range["min"] <= result <= result_range["max"]
+            and b * result <= max_num
+        }
+    a_range, b_range = setup["a"], setup["b"]
+    return {
+        (a, b)
+        for a in numbers
+        for b in numbers
+        if a_range["min"] <= a <= a_range["max"]
+        and b_range["min"] <= b <= b_range["max"]
+        and (operation != "subtraction" or b <= a)
+    }
+
+
+def test_counts_match_enumeration():
+    """Each compiled template counts exactly the problems its setup allows"""
+    print("🧪 Testing solved template ranges...")
+
+    for age_group in AGE_GROUPS:
+        max_num = max_num_for(age_group)
+        for template_data in data_loader.get_word_problem_templates(age_group):
+            template = WordTemplate(template_data, max_num)
+            expected = brute_force_params(template_data, max_num)
+            assert len(template) == len(expected), template
+            assert set(template.params()) == expected, template
+
+    print("  ✅ Counts and params match a brute-force enumeration")
+    return True
+
+
+def test_infeasible_templates_are_dropped():
+    """Templates whose ranges cannot fit the age group are not compiled"""
+    print("🧪 Testing infeasible templates...")
+
+    cookies = {
+        "operation": "subtraction",
+        "template": "Mom baked {a} cookies. The family ate {b}.",
+        "setup": {"a": {"min": 12, "max": 40}, "b": {"min": 4, "max": 18}},
+    }
+    eggs = {
+        "operation": "division",
+        "template": "{total} eggs go into cartons of {b}.",
+        "setup": {"b": {"min": 6, "max": 12}, "result": {"min": 2, "max": 8}},
+    }
+    assert len(WordTemplate(cookies, 10)) == 0
+    assert len(WordTemplate(eggs, 10)) == 0
+    assert set(WordTemplate(eggs, 14).params()) == {(12, 6), (14, 7)}
+    assert compile_word_templates([cookies, eggs], 10) == ()
+
+    print("  ✅ Empty ranges are solved away at compile time")
+    return True
+
+
+def test_word_problems_never_raise():
+    """Drawing word problems never hits an empty range"""
+    print("🧪 Testing word problem sampling...")
+
+    for age_group in AGE_GROUPS:
+        for seed in range(20):
+            generator = MathGenerator(seed=seed)
+            for _ in range(50):
+                problem = generator.generate_word_problem(age_group)
+                assert problem["type"] == "word_problem"
+                assert "{" not in problem["question"], problem["question"]
+                assert problem["explanation"] == f"Answer: {problem['answer']}"
+                assert problem["answer"] >= 0
+
+    print("  ✅ 3,000 word problems drawn without errors")
+    return True
+
+
+def test_rendering_matches_str_format():
+    """Compiled text renders like str.format and survives pickling"""
+    print("🧪 Testing compiled template text...")
+
+    template_data = {
+        "operation": "division",
+        "template": "Share {total} sweets (100%) among {b} kids: {result:>2} each",
+        "setup": {"b": {"min": 2, "max": 4}, "result": {"min": 2, "max": 5}},
+    }
+    template = WordTemplate(template_data, 20)
+    for params in template.params():
+        total, b = params
+        expected = template_data["template"].format(
+            total=total, b=b, result=total // b
+        )
+        assert template.question(params) == expected
+        assert template.answer(params) == total // b
+    assert pickle.loads(pickle.dumps(template)).question((8, 4)) == template.question(
+        (8, 4)
+    )
+
+    try:
+        WordTemplate({"operation": "addition", "template": "{a} and {c}"}, 10)
+        assert False, "Expected ValueError for an unknown field"
+    except ValueError:
+        pass
+
+    print("  ✅ Pre-parsed templates render the same text")
+    return True
+
+
+if __name__ == "__main__":
+    tests = [
+        test_counts_match_enumeration,
+        test_infeasible_templates_are_dropped,
+        test_word_problems_never_raise,
+        test_rendering_matches_str_format,
+    ]
+    success = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    sys.exit(0 if success else 1)
@@ -10,7 +10,7 @@ __author__ = "henry0hai "
 __email__ = "henry0hai@gmail.com"
 
 # Import main classes for easy access
-from .core import MathGenerator, LogicGenerator, ReadingGenerator
+from .core import MathGenerator, LogicGenerator, ReadingGenerator, Problem
 from .output.pdf_generator import PDFGenerator
 
 
@@ -20,12 +20,26 @@ def create_math_worksheet(
     num_questions: int = 20,
     student_name: str = "",
     output_file: str = None,
+    data_source=None,
+    scope=None,
+    student_id: str = None,
+    history=None,
+    seed: int = None,
 ):
-    """Create a math worksheet quickly"""
+    """Create a math worksheet quickly
+
+    data_source optionally selects the DataSourceLoader (content pack) to use.
+    scope optionally shares uniqueness across a batch of worksheets.
+    With a QuestionHistory and a student_id, questions the student has seen
+    before are avoided and the new ones are recorded once the PDF is written.
+    seed makes the problems reproducible.
+    """
     from .core import MathGenerator
     from .output.pdf_generator import PDFGenerator
 
-    generator = MathGenerator()
+    if history is not None and student_id:
+        scope = history.scope(student_id, parent=scope)
+    generator = MathGenerator(data_source, scope, seed)
     pdf_gen = PDFGenerator()
 
     problems = generator.generate_problems(age_group=age_group, count=num_questions)
@@ -36,13 +50,16 @@ def create_math_worksheet(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"math_worksheet_{timestamp}.pdf"
 
-    return pdf_gen.generate_worksheet(
+    output_path = pdf_gen.generate_worksheet(
         subject="math",
         age_group=age_group,
         problems=problems,
         output_filename=output_file,
         student_name=student_name,
     )
+    if history is not None and student_id:
+        scope.commit()
+    return output_path
 
 
 def create_comprehensive_assessment(
@@ -50,8 +67,20 @@ def create_comprehensive_assessment(
     num_questions: int = 30,
     student_name: str = "",
     output_file: str = None,
+    data_source=None,
+    scope=None,
+    student_id: str = None,
+    history=None,
+    seed: int = None,
 ):
-    """Create a comprehensive assessment quickly"""
+    """Create a comprehensive assessment quickly
+
+    data_source optionally selects the DataSourceLoader (content pack) to use.
+    scope optionally shares uniqueness across a batch of worksheets.
+    With a QuestionHistory and a student_id, questions the student has seen
+    before are avoided and the new ones are recorded once the PDF is written.
+    seed makes the problems reproducible.
+    """
     # Import the function from cli.py since that's where it actually exists
     import sys
     import os
@@ -64,7 +93,11 @@ def create_comprehensive_assessment(
 
     pdf_gen = PDFGenerator()
 
-    problems = generate_comprehensive_problems(age_group, num_questions)
+    if history is not None and student_id:
+        scope = history.scope(student_id, parent=scope)
+    problems = generate_comprehensive_problems(
+        age_group, num_questions, data_source, scope, seed
+    )
 
     if output_file is None:
         from datetime import datetime
@@ -72,13 +105,16 @@ def create_comprehensive_assessment(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = f"comprehensive_assessment_{timestamp}.pdf"
 
-    return pdf_gen.generate_worksheet(
+    output_path = pdf_gen.generate_worksheet(
         subject="comprehensive",
         age_group=age_group,
         problems=problems,
         output_filename=output_file,
         student_name=student_name,
     )
+    if history is not None and student_id:
+        scope.commit()
+    return output_path
 
 
 # Export main classes and functions
@@ -86,6 +122,7 @@ __all__ = [
     "MathGenerator",
     "LogicGenerator",
     "ReadingGenerator",
+    "Problem",
     "PDFGenerator",
     "create_math_worksheet",
     "create_comprehensive_assessment",
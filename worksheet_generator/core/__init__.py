@@ -6,5 +6,6 @@ Core generators for different subject types.
 from .math_generator import MathGenerator
 from .logic_generator import LogicGenerator
 from .reading_generator import ReadingGenerator
+from .problem import Problem
 
-__all__ = ["MathGenerator", "LogicGenerator", "ReadingGenerator"]
+__all__ = ["MathGenerator", "LogicGenerator", "ReadingGenerator", "Problem"]
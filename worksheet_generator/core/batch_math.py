@@ -0,0 +1,156 @@
+"""
+Batch arithmetic generation for the Primary School Worksheet Generator
+Draws operands for many problems at once with NumPy (drill sheets, problem banks)
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from ..utils.sampling import RowSpace
+from .problem import ArithmeticText, Problem
+
+# Operation code (index) -> name and symbol, as used in ArithmeticBatch
+OPERATIONS = ("addition", "subtraction", "multiplication", "division")
+SYMBOLS = ("+", "-", "×", "÷")
+
+# Operation name -> renderer of its question and explanation text
+ARITHMETIC_TEXT = {
+    operation: ArithmeticText(symbol) for operation, symbol in zip(OPERATIONS, SYMBOLS)
+}
+
+
+def require_numpy():
+    """Raise a helpful error when NumPy is missing"""
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "Batch math generation requires NumPy: pip install numpy"
+        )
+
+
+def _unrank(space: RowSpace, indices):
+    """Map pair numbers of a RowSpace to (row, column) arrays"""
+    segments = np.array(space.segments(), dtype=np.int64).reshape(-1, 3)
+    starts, rows, lows = segments[:, 0], segments[:, 1], segments[:, 2]
+    position = np.searchsorted(starts, indices, side="right") - 1
+    return rows[position], lows[position] + indices - starts[position]
+
+
+def draw_operand_arrays(operation: str, space: RowSpace, count: int, rng, unique: bool = True):
+    """Draw count (a, b) operand pairs of an operation
+
+    With unique=True no pair repeats until the whole space has been used:
+    small requests oversample with replacement and drop repeated packed
+    ``a << 32 | b`` keys with np.unique, large requests take a permutation
+    of the space (repeated as often as needed).
+
+    Args:
+        operation: addition, subtraction, multiplication or division
+        space: Operand space of the operation (see OperationSpec.space)
+        count: Number of pairs
+        rng: numpy.random.Generator
+        unique: Avoid repeated pairs while the space allows
+
+    Returns:
+        (a, b) int64 arrays; for division a is the dividend and b the divisor
+    """
+    size = len(space)
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if size == 0:
+        raise ValueError("cannot sample from an empty problem space")
+
+    if not unique:
+        rows, columns = _unrank(space, rng.integers(0, size, count))
+    elif 2 * count >= size:
+        cycles = -(-count // size)
+        indices = np.concatenate([rng.permutation(size) for _ in range(cycles)])
+        rows, columns = _unrank(space, indices[:count])
+    else:
+        rows = np.zeros(0, dtype=np.int64)
+        columns = np.zeros(0, dtype=np.int64)
+        while len(rows) < count:
+            draw = count + count // 4 + 16
+            new_rows, new_columns = _unrank(space, rng.integers(0, size, draw))
+            rows = np.concatenate([rows, new_rows])
+            columns = np.concatenate([columns, new_columns])
+            keys = (rows << 32) | columns
+            # First occurrence of every key, kept in draw order
+            _, first = np.unique(keys, return_index=True)
+            first.sort()
+            rows, columns = rows[first], columns[first]
+        rows, columns = rows[:count], columns[:count]
+
+    if operation == "division":
+        # (divisor, result) -> (dividend, divisor)
+        return rows * columns, rows
+    return rows, columns
+
+
+class ArithmeticBatch:
+    """Arithmetic problems held as NumPy arrays
+
+    Answers are computed for the whole batch at once; question strings are
+    only formatted for the rows that are read, so a large bank can be
+    sliced, filtered or written out without building every dict up front.
+    """
+
+    def __init__(self, operations, a, b):
+        """Initialize the batch
+
+        Args:
+            operations: Operation codes (indices into OPERATIONS)
+            a: First operands (dividends for division)
+            b: Second operands (divisors for division)
+        """
+        self.operations = operations
+        self.a = a
+        self.b = b
+        self.answers = np.select(
+            [operations == 0, operations == 1, operations == 2],
+            [a + b, a - b, a * b],
+            default=a // np.maximum(b, 1),
+        )
+
+    def __len__(self) -> int:
+        return len(self.a)
+
+    def _fields(self, index: int) -> Tuple[str, int, str, str]:
+        """(question, answer, explanation, type) of one problem"""
+        code = int(self.operations[index])
+        a, b, answer = int(self.a[index]), int(self.b[index]), int(self.answers[index])
+        expression = f"{a} {SYMBOLS[code]} {b}"
+        question = f"{expression} = ____"
+        return question, answer, f"{expression} = {answer}", OPERATIONS[code]
+
+    def __getitem__(self, index: int) -> Problem:
+        """One problem, rendered as the scalar generators do when read"""
+        operation = OPERATIONS[int(self.operations[index])]
+        return Problem.lazy(
+            ARITHMETIC_TEXT[operation],
+            (int(self.a[index]), int(self.b[index])),
+            int(self.answers[index]),
+            operation,
+        )
+
+    def __iter__(self) -> Iterator[Problem]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_problems(self, start: int = 0, stop: Optional[int] = None) -> List[Problem]:
+        """Format a range of problems as Problem records"""
+        return [self[index] for index in range(*slice(start, stop).indices(len(self)))]
+
+    def to_dicts(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """Format a range of problems as plain dicts"""
+        keys = ("question", "answer", "explanation", "type")
+        return [
+            dict(zip(keys, self._fields(index)))
+            for index in range(*slice(start, stop).indices(len(self)))
+        ]
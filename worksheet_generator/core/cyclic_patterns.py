@@ -0,0 +1,233 @@
+"""
+Cyclic patterns for the Primary School Worksheet Generator
+AB, ABC and ABCD repeating patterns drawn by unranking ordered item selections
+"""
+
+from bisect import bisect_right
+from math import perm
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+# A pattern item: (symbol shown in the question, name)
+Item = Tuple[str, str]
+
+# Period of each repeating pattern family ("AB_color" -> AB -> 2)
+PATTERN_PERIODS = {"AB": 2, "ABC": 3, "ABCD": 4}
+
+# Complex visual patterns repeat two shapes (their colors are not shown)
+COMPLEX_VISUAL_TYPES = ("complex_visual_pattern", "complex_visual")
+
+# Template keys whose entries form item pools, in the order they are used
+ITEM_POOL_KEYS = ("colors", "shapes", "animals")
+
+# Items of templates without a usable pool
+DEFAULT_ITEMS: Tuple[Item, ...] = (
+    ("🔴", "red"),
+    ("🔵", "blue"),
+    ("🟢", "green"),
+    ("🟡", "yellow"),
+)
+
+# Pattern length of templates without one, per period
+DEFAULT_LENGTHS = {2: 6, 3: 9, 4: 8}
+
+
+def unrank_arrangement(n: int, k: int, index: int) -> Tuple[int, ...]:
+    """The index-th ordered selection of k of the positions 0..n-1
+
+    Selections are numbered in lexicographic order, from 0 to perm(n, k) - 1.
+    """
+    positions = list(range(n))
+    chosen = []
+    for picked in range(k):
+        position, index = divmod(index, perm(n - 1 - picked, k - 1 - picked))
+        chosen.append(positions.pop(position))
+    return tuple(chosen)
+
+
+def pattern_items(entries: Optional[Sequence[Any]]) -> Tuple[Item, ...]:
+    """(symbol, name) items of a template list, without repeated symbols
+
+    Entries are dicts with a symbol (or unicode/name) and a name, or plain
+    strings used as both.
+    """
+    items = []
+    seen = set()
+    for entry in entries or ():
+        if isinstance(entry, dict):
+            symbol = entry.get("symbol", entry.get("unicode", entry.get("name", "●")))
+            item = (symbol, entry.get("name", symbol))
+        else:
+            item = (str(entry), str(entry))
+        if item[0] not in seen:
+            seen.add(item[0])
+            items.append(item)
+    return tuple(items)
+
+
+class Arrangements:
+    """Cycles made of period distinct items of a pool, in every order"""
+
+    __slots__ = ("items", "period", "size", "key")
+
+    def __init__(self, items: Tuple[Item, ...], period: int):
+        self.items = items
+        self.period = period
+        self.size = perm(len(items), period)
+        self.key = ("items", items, period)
+
+    def unrank(self, index: int) -> Tuple[Item, ...]:
+        positions = unrank_arrangement(len(self.items), self.period, index)
+        return tuple(self.items[position] for position in positions)
+
+
+class NumberRuns:
+    """Cycles of period consecutive numbers, e.g. 3, 4 for an AB pattern"""
+
+    __slots__ = ("low", "period", "size", "key")
+
+    def __init__(self, low: int, high: int, period: int):
+        self.low = low
+        self.period = period
+        self.size = max(0, high - low + 1)
+        self.key = ("runs", low, high, period)
+
+    def unrank(self, index: int) -> Tuple[Item, ...]:
+        start = self.low + index
+        return tuple((str(n), str(n)) for n in range(start, start + self.period))
+
+
+class FixedCycle:
+    """The single cycle of a template without a usable item pool"""
+
+    __slots__ = ("cycle", "size", "key")
+
+    def __init__(self, cycle: Tuple[Item, ...]):
+        self.cycle = cycle
+        self.size = 1
+        self.key = ("fixed", cycle)
+
+    def unrank(self, index: int) -> Tuple[Item, ...]:
+        return self.cycle
+
+
+class CyclicPattern:
+    """A repeating pattern template, compiled once
+
+    The template's pattern space is every cycle its item pools can form
+    (ordered selections of ``period`` distinct items, so a pool of n items
+    gives perm(n, period) cycles) at every pattern length. Pattern number i
+    is built by unranking i, so the space has an exact size and can be
+    drawn from without replacement with a SpaceSampler. The pattern also
+    renders its questions for Problem.lazy() from (cycle, length) params.
+    """
+
+    __slots__ = (
+        "pattern_type",
+        "period",
+        "lengths",
+        "key",
+        "_sources",
+        "_starts",
+        "size",
+    )
+
+    def __init__(
+        self,
+        pattern_type: str,
+        period: int,
+        sources: List[Any],
+        lengths: Tuple[int, ...],
+    ):
+        """Build the pattern space
+
+        Args:
+            pattern_type: Template type, e.g. "ABC_shape"
+            period: Number of items in a cycle
+            sources: Cycle sources (Arrangements, NumberRuns or FixedCycle)
+            lengths: Pattern lengths, answer included
+        """
+        self.pattern_type = pattern_type
+        self.period = period
+        self.lengths = lengths
+        self._sources = [source for source in sources if source.size]
+        self._starts = []
+        size = 0
+        for source in self._sources:
+            self._starts.append(size)
+            size += source.size * len(lengths)
+        self.size = size
+        # Equal templates share samplers, even across recompiles
+        self.key = (
+            pattern_type,
+            period,
+            lengths,
+            tuple(source.key for source in self._sources),
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def unrank(self, index: int) -> Tuple[Tuple[Item, ...], int]:
+        """Return the (cycle, length) of the pattern with the given number"""
+        position = bisect_right(self._starts, index) - 1
+        cycle_index, length_index = divmod(
+            index - self._starts[position], len(self.lengths)
+        )
+        return self._sources[position].unrank(cycle_index), self.lengths[length_index]
+
+    @staticmethod
+    def sequence(params) -> List[str]:
+        cycle, length = params
+        return [cycle[i % len(cycle)][0] for i in range(length)]
+
+    def answer(self, params) -> str:
+        cycle, length = params
+        return cycle[(length - 1) % len(cycle)][0]
+
+    def question(self, params) -> str:
+        shown = self.sequence(params)[:-1]
+        return f"Complete the pattern: {' - '.join(shown)} - ____"
+
+    def explanation(self, params, answer) -> str:
+        cycle, _ = params
+        symbols = " - ".join(symbol for symbol, _ in cycle)
+        return f"The pattern repeats {symbols}, so the next item is: {answer}"
+
+
+def compile_cyclic_pattern(template: Mapping[str, Any]) -> CyclicPattern:
+    """Compile a repeating pattern template
+
+    AB_*, ABC_* and ABCD_* templates repeat 2, 3 or 4 items of each of their
+    "colors", "shapes" and "animals" lists (top level or under "items");
+    AB_number repeats consecutive numbers of its "number_range" and complex
+    visual patterns repeat two of their shapes. A template with an optional
+    "pattern_lengths" list is drawn at each of them. Templates of other
+    types repeat the default items.
+
+    Args:
+        template: Pattern template, e.g. from get_pattern_templates()
+    """
+    pattern_type = template.get("type", "AB_color")
+    if pattern_type in COMPLEX_VISUAL_TYPES:
+        period = 2
+        pools = [template.get("visual_elements", {}).get("shapes")]
+    else:
+        period = PATTERN_PERIODS.get(pattern_type.split("_", 1)[0], 2)
+        items_data = template.get("items", {})
+        pools = [template.get(key) or items_data.get(key) for key in ITEM_POOL_KEYS]
+
+    sources: List[Any] = []
+    if pattern_type == "AB_number":
+        number_range = template.get("number_range", {"min": 1, "max": 5})
+        sources.append(NumberRuns(number_range["min"], number_range["max"], period))
+    for pool in pools:
+        items = pattern_items(pool)
+        if len(items) >= period:
+            sources.append(Arrangements(items, period))
+    if not any(source.size for source in sources):
+        sources = [FixedCycle(DEFAULT_ITEMS[:period])]
+
+    lengths = template.get("pattern_lengths") or [
+        template.get("pattern_length", DEFAULT_LENGTHS[period])
+    ]
+    return CyclicPattern(pattern_type, period, sources, tuple(lengths))
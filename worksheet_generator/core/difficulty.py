@@ -0,0 +1,216 @@
+"""
+Difficulty index for the Primary School Worksheet Generator
+Groups the operand pairs of an operation by carries, borrows and digit counts
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from .operation_specs import OperationSpec
+
+# Difficulty features of each operation, in the order of a group key
+OPERATION_FEATURES = {
+    "addition": ("carries", "digits", "result_digits"),
+    "subtraction": ("borrows", "digits", "result_digits"),
+    "multiplication": ("table", "digits", "result_digits"),
+    "division": ("table", "digits", "result_digits"),
+}
+
+# Features a pair has several values of, kept as a sorted tuple; a filter
+# matches the pair if any of them does. A multiplication fact is in the
+# tables of both its factors (3 × 7 is in the 3 and the 7 times table), while
+# a division fact is only in the table of its divisor
+MULTI_VALUED_FEATURES = {("multiplication", "table")}
+
+# A feature filter: an exact value, an inclusive (low, high) range with None
+# for an open end, or a set of allowed values
+FeatureFilter = Union[int, Tuple[Optional[int], Optional[int]], Iterable[int]]
+
+
+def count_carries(a: int, b: int) -> int:
+    """Number of carries when adding a and b in columns"""
+    carries = carry = 0
+    while a or b:
+        carry = a % 10 + b % 10 + carry >= 10
+        carries += carry
+        a //= 10
+        b //= 10
+    return carries
+
+
+def count_borrows(a: int, b: int) -> int:
+    """Number of borrows when subtracting b from a (a >= b) in columns"""
+    borrows = borrow = 0
+    while a or b:
+        borrow = a % 10 - borrow < b % 10
+        borrows += borrow
+        a //= 10
+        b //= 10
+    return borrows
+
+
+def digit_count(n: int) -> int:
+    return len(str(abs(n)))
+
+
+def pair_features(operation: str, row: int, column: int) -> Tuple[int, ...]:
+    """Difficulty features of one operand space pair (see OPERATION_FEATURES)"""
+    if operation == "addition":
+        digits = max(digit_count(row), digit_count(column))
+        return count_carries(row, column), digits, digit_count(row + column)
+    if operation == "subtraction":
+        a, b = max(row, column), min(row, column)
+        return count_borrows(a, b), digit_count(a), digit_count(a - b)
+    if operation == "multiplication":
+        digits = max(digit_count(row), digit_count(column))
+        tables = tuple(sorted({row, column}))
+        return tables, digits, digit_count(row * column)
+    if operation == "division":
+        # Row is the divisor (the table) and column the quotient; the largest
+        # number written is the dividend
+        return row, digit_count(row * column), digit_count(column)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+class DifficultyBand:
+    """Operand pairs of one operation that match a set of feature filters
+
+    Pairs are kept in two flat arrays, so ``unrank`` is a direct lookup. A
+    band has the same size/unrank interface as a RowSpace and can be drawn
+    from with a SpaceSampler.
+    """
+
+    __slots__ = ("key", "rows", "columns", "size")
+
+    def __init__(self, key: Tuple, rows: array, columns: array):
+        self.key = key
+        self.rows = rows
+        self.columns = columns
+        self.size = len(rows)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def unrank(self, index: int) -> Tuple[int, int]:
+        """Return the pair with the given number"""
+        return self.rows[index], self.columns[index]
+
+
+class DifficultyIndex:
+    """Every operand pair of an operation spec, grouped by difficulty features
+
+    Pairs are tagged with the features of their operation (see
+    OPERATION_FEATURES) when the index is built, so selecting a band never
+    scans or rejects pairs. Pairs are (row, column) pairs of the spec's
+    operand space, i.e. (divisor, quotient) for division.
+    """
+
+    def __init__(self, spec: OperationSpec):
+        """Build the index
+
+        Args:
+            spec: Operation spec whose operand space is indexed
+        """
+        self.operation = spec.operation
+        self.features = OPERATION_FEATURES[spec.operation]
+        self._groups: Dict[Tuple[int, ...], Tuple[array, array]] = {}
+        self._bands: Dict[Tuple, DifficultyBand] = {}
+
+        segments = spec.space.segments()
+        ends = [start for start, _, _ in segments[1:]] + [spec.space.size]
+        for (start, row, low), end in zip(segments, ends):
+            previous = None
+            for column in range(low, low + end - start):
+                features = pair_features(self.operation, row, column)
+                if features != previous:
+                    group = self._groups.get(features)
+                    if group is None:
+                        group = (array("l"), array("l"))
+                        self._groups[features] = group
+                    previous = features
+                group[0].append(row)
+                group[1].append(column)
+
+    def counts(self) -> Dict[Tuple[int, ...], int]:
+        """Number of pairs for every combination of feature values"""
+        return {features: len(rows) for features, (rows, _) in self._groups.items()}
+
+    def values(self, feature: str) -> Tuple[int, ...]:
+        """Sorted values a feature takes in this index"""
+        position = self._position(feature)
+        if (self.operation, feature) in MULTI_VALUED_FEATURES:
+            values = {
+                value for features in self._groups for value in features[position]
+            }
+            return tuple(sorted(values))
+        return tuple(sorted({features[position] for features in self._groups}))
+
+    def band(self, **filters: FeatureFilter) -> DifficultyBand:
+        """Pairs matching every feature filter (cached per filter set)
+
+        Args:
+            **filters: Feature name -> exact value, inclusive (low, high)
+                range (None for an open end) or set of allowed values,
+                e.g. carries=1, digits=(2, None) or table={6, 7, 8}; a
+                multiplication table filter matches either factor
+
+        Raises:
+            ValueError: If a feature does not apply to the operation
+        """
+        checks = [
+            (
+                self._position(feature),
+                _matcher(wanted, (self.operation, feature) in MULTI_VALUED_FEATURES),
+            )
+            for feature, wanted in sorted(filters.items())
+        ]
+        key = tuple(
+            (feature, _hashable(wanted)) for feature, wanted in sorted(filters.items())
+        )
+        band = self._bands.get(key)
+        if band is None:
+            rows, columns = array("l"), array("l")
+            for features, (group_rows, group_columns) in sorted(self._groups.items()):
+                if all(matches(features[position]) for position, matches in checks):
+                    rows.extend(group_rows)
+                    columns.extend(group_columns)
+            band = DifficultyBand(key, rows, columns)
+            self._bands[key] = band
+        return band
+
+    def _position(self, feature: str) -> int:
+        try:
+            return self.features.index(feature)
+        except ValueError:
+            raise ValueError(
+                f"{self.operation} problems have no {feature!r} feature; "
+                f"use one of {', '.join(self.features)}"
+            ) from None
+
+
+def _matcher(wanted: FeatureFilter, multi_valued: bool = False):
+    if multi_valued:
+        matches = _matcher(wanted)
+        return lambda values: any(matches(value) for value in values)
+    if isinstance(wanted, int):
+        return lambda value: value == wanted
+    if isinstance(wanted, tuple) and len(wanted) == 2:
+        low, high = wanted
+        return lambda value: (low is None or value >= low) and (
+            high is None or value <= high
+        )
+    allowed = frozenset(wanted)
+    return lambda value: value in allowed
+
+
+def _hashable(wanted: FeatureFilter):
+    if isinstance(wanted, (int, tuple)):
+        return wanted
+    return frozenset(wanted)
+
+
+@lru_cache(maxsize=None)
+def difficulty_index(spec: OperationSpec) -> DifficultyIndex:
+    """Return the (cached) difficulty index of an operation spec"""
+    return DifficultyIndex(spec)
@@ -0,0 +1,338 @@
+"""
+Expression problems for the Primary School Worksheet Generator
+Multi-step and missing-operand arithmetic built from enumerated expression trees
+"""
+
+import operator
+from bisect import bisect_right
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# An expression tree: a number, the BLANK placeholder, or (symbol, left, right)
+Tree = Union[int, str, Tuple[str, Any, Any]]
+
+OPERATORS = ("+", "-", "×", "÷")
+
+APPLY = {
+    "+": operator.add,
+    "-": operator.sub,
+    "×": operator.mul,
+    "÷": operator.floordiv,
+}
+
+PRECEDENCE = {"+": 1, "-": 1, "×": 2, "÷": 2}
+
+# Operators whose chains can be reordered freely (commutative and associative)
+REORDERABLE = ("+", "×")
+
+# Placeholder of the hidden operand in missing-operand questions
+BLANK = "__"
+
+# Problem type -> (whether an operand is hidden, uniqueness registry kind)
+EXPRESSION_TYPES = {
+    "multi_step": (False, "expr"),
+    "missing_operand": (True, "expr_missing"),
+}
+
+
+class ExpressionRules(NamedTuple):
+    """Per-age constraints on expression problems
+
+    Every number shown or computed along the way is a whole number from 1 to
+    max_value and division is exact. Divisors are 2..max_factor; a product
+    needs factors of at least 2, one of them at most max_factor, so a
+    bracketed sum can still be multiplied, as in (12 + 7) × 3.
+    """
+
+    leaf_min: int
+    leaf_max: int
+    max_value: int
+    max_factor: int
+    operators: Tuple[str, ...] = OPERATORS
+
+
+@lru_cache(maxsize=1 << 16)
+def evaluate(tree: Tree) -> int:
+    """Value of an expression tree (memoised, subtrees included)"""
+    if not isinstance(tree, tuple):
+        return tree
+    symbol, left, right = tree
+    return APPLY[symbol](evaluate(left), evaluate(right))
+
+
+def _chain(tree: Tree, symbol: str) -> Iterator[Tree]:
+    """Terms of a chain of the same operator, e.g. a, b, c of (a + b) + c"""
+    if isinstance(tree, tuple) and tree[0] == symbol:
+        yield from _chain(tree[1], symbol)
+        yield from _chain(tree[2], symbol)
+    else:
+        yield tree
+
+
+@lru_cache(maxsize=1 << 16)
+def canonical(tree: Tree) -> str:
+    """Canonical text of an expression tree, used as its uniqueness key
+
+    Chains of + or × are flattened and their terms sorted, so every
+    commutative or associative variant of an expression has the same form:
+    (12 + 7) × 3, 3 × (7 + 12) and 3 × (12 + 7) all give "((12+7)×3)".
+    """
+    if not isinstance(tree, tuple):
+        return str(tree)
+    symbol, left, right = tree
+    if symbol in REORDERABLE:
+        terms = sorted(canonical(term) for term in _chain(tree, symbol))
+        return "(" + symbol.join(terms) + ")"
+    return f"({canonical(left)}{symbol}{canonical(right)})"
+
+
+def render(tree: Tree) -> str:
+    """Infix text with the parentheses the tree needs"""
+    if not isinstance(tree, tuple):
+        return str(tree)
+    symbol, left, right = tree
+    return (
+        f"{_operand_text(left, symbol, False)} {symbol} "
+        f"{_operand_text(right, symbol, True)}"
+    )
+
+
+def _operand_text(tree: Tree, parent: str, right: bool) -> str:
+    text = render(tree)
+    if isinstance(tree, tuple):
+        # Same-precedence right operands keep theirs: 20 - (8 - 3), 2 × (3 × 4)
+        precedence, outer = PRECEDENCE[tree[0]], PRECEDENCE[parent]
+        if precedence < outer or (right and precedence == outer):
+            return f"({text})"
+    return text
+
+
+def with_blank(tree: Tree, position: int) -> Tuple[Tree, int]:
+    """Replace the position-th number (left to right) with BLANK
+
+    Returns:
+        (tree with the blank, the hidden number)
+    """
+    hidden: List[int] = []
+
+    def replace(node: Tree, index: int) -> Tuple[Tree, int]:
+        if not isinstance(node, tuple):
+            if index == position:
+                hidden.append(node)
+                return BLANK, index + 1
+            return node, index + 1
+        symbol, left, right = node
+        left, index = replace(left, index)
+        right, index = replace(right, index)
+        return (symbol, left, right), index
+
+    blanked, _ = replace(tree, 0)
+    return blanked, hidden[0]
+
+
+def _combine(symbol: str, x: int, y: int, rules: ExpressionRules) -> Optional[int]:
+    """Value of x <symbol> y, or None if it breaks the rules"""
+    if symbol == "×":
+        if min(x, y) < 2 or min(x, y) > rules.max_factor:
+            return None
+    elif symbol == "÷":
+        if not 2 <= y <= rules.max_factor or x % y:
+            return None
+    value = APPLY[symbol](x, y)
+    return value if 1 <= value <= rules.max_value else None
+
+
+class _Slot:
+    """One node of an operator pattern, compiled for a set of rules
+
+    ``counts`` maps every value the subtree can take to the number of
+    distinct subtrees with that value. Trees of a value are numbered
+    0..count-1 and unrank() maps a number back to its tree.
+    """
+
+    __slots__ = ("symbol", "left", "right", "counts", "_pairs", "_starts")
+
+    def __init__(self, pattern, rules: ExpressionRules):
+        if pattern is None:
+            self.symbol = None
+            self.counts = {
+                value: 1 for value in range(rules.leaf_min, rules.leaf_max + 1)
+            }
+            return
+
+        self.symbol, left, right = pattern
+        self.left = _Slot(left, rules)
+        self.right = _Slot(right, rules)
+        pairs: Dict[int, List[Tuple[int, int, int]]] = {}
+        for x, x_count in self.left.counts.items():
+            for y, y_count in self.right.counts.items():
+                value = _combine(self.symbol, x, y, rules)
+                if value is not None:
+                    pairs.setdefault(value, []).append((x, y, x_count * y_count))
+
+        self.counts: Dict[int, int] = {}
+        self._pairs = pairs
+        self._starts: Dict[int, List[int]] = {}
+        for value, value_pairs in pairs.items():
+            starts = []
+            total = 0
+            for _, _, count in value_pairs:
+                starts.append(total)
+                total += count
+            self.counts[value] = total
+            self._starts[value] = starts
+
+    def unrank(self, value: int, index: int) -> Tree:
+        if self.symbol is None:
+            return value
+        starts = self._starts[value]
+        position = bisect_right(starts, index) - 1
+        x, y, _ = self._pairs[value][position]
+        left_index, right_index = divmod(
+            index - starts[position], self.right.counts[y]
+        )
+        return (
+            self.symbol,
+            self.left.unrank(x, left_index),
+            self.right.unrank(y, right_index),
+        )
+
+
+def operator_patterns(steps: int, operators: Tuple[str, ...]) -> Iterator[Tree]:
+    """Every tree shape with steps operators, with every operator choice
+
+    Numbers are left as None, e.g. ("×", ("+", None, None), None).
+    """
+    if steps == 0:
+        yield None
+        return
+    for left_steps in range(steps):
+        for left in operator_patterns(left_steps, operators):
+            for right in operator_patterns(steps - 1 - left_steps, operators):
+                for symbol in operators:
+                    yield symbol, left, right
+
+
+class ExpressionSpace:
+    """Every expression tree allowed by a set of rules, numbered
+
+    Tree shapes and operators are enumerated, and each pattern counts its
+    trees value by value, so the space knows its exact size and unrank()
+    builds the tree with a given number directly: nothing is generated and
+    rejected. With ``missing`` every tree appears once per number, with
+    that number hidden. The space has the same size/unrank interface as a
+    RowSpace and can be drawn from with a SpaceSampler.
+    """
+
+    def __init__(
+        self, rules: ExpressionRules, steps: Tuple[int, ...], missing: bool
+    ):
+        """Enumerate the space
+
+        Args:
+            rules: Constraints on numbers and results
+            steps: Numbers of operators per expression, e.g. (2,)
+            missing: Hide one number of each expression
+        """
+        self.rules = rules
+        self.missing = missing
+        self._patterns: List[Tuple[_Slot, List[int], List[int], int]] = []
+        self._starts: List[int] = []
+        size = 0
+        for step_count in steps:
+            for pattern in operator_patterns(step_count, rules.operators):
+                root = _Slot(pattern, rules)
+                values = sorted(root.counts)
+                starts = []
+                total = 0
+                for value in values:
+                    starts.append(total)
+                    total += root.counts[value]
+                if not total:
+                    continue
+                numbers = step_count + 1
+                self._patterns.append((root, values, starts, numbers))
+                self._starts.append(size)
+                size += total * numbers if missing else total
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def unrank(self, index: int) -> Tuple[Tree, Optional[int]]:
+        """Return (tree, position of the hidden number or None)"""
+        if not 0 <= index < self.size:
+            raise IndexError("expression index out of range")
+        position = bisect_right(self._starts, index) - 1
+        root, values, starts, numbers = self._patterns[position]
+        index -= self._starts[position]
+        blank = None
+        if self.missing:
+            index, blank = divmod(index, numbers)
+        value_position = bisect_right(starts, index) - 1
+        value = values[value_position]
+        return root.unrank(value, index - starts[value_position]), blank
+
+
+@lru_cache(maxsize=None)
+def expression_space(
+    rules: ExpressionRules, steps: Tuple[int, ...], missing: bool
+) -> ExpressionSpace:
+    """Return the (cached) expression space of a set of rules"""
+    return ExpressionSpace(rules, steps, missing)
+
+
+def space_from_settings(
+    settings: Mapping[str, Any], max_num: int, missing: bool
+) -> ExpressionSpace:
+    """Expression space of an age group's "expressions" settings
+
+    Args:
+        settings: {"number_range": {"min", "max"}, "max_value", "max_factor",
+            "operators", "steps", "missing_steps"}; all optional
+        max_num: Largest number of the age group (default max_value)
+        missing: Missing-operand problems (missing_steps, default 1 operator)
+            instead of multi-step problems (steps, default 2 operators)
+    """
+    numbers = settings.get("number_range", {"min": 1, "max": min(20, max_num)})
+    rules = ExpressionRules(
+        numbers["min"],
+        numbers["max"],
+        settings.get("max_value", max_num),
+        settings.get("max_factor", 12),
+        tuple(settings.get("operators", OPERATORS)),
+    )
+    if missing:
+        steps = tuple(settings.get("missing_steps", [1]))
+    else:
+        steps = tuple(settings.get("steps", [2]))
+    return expression_space(rules, steps, missing)
+
+
+class ExpressionText:
+    """Renders expression questions from (tree, blank position) params"""
+
+    __slots__ = ()
+
+    def question(self, params) -> str:
+        tree, blank = params
+        if blank is None:
+            return f"{render(tree)} = ____"
+        return f"{render(with_blank(tree, blank)[0])} = {evaluate(tree)}"
+
+    def explanation(self, params, answer) -> str:
+        tree, _ = params
+        return f"{render(tree)} = {evaluate(tree)}"
+
+
+EXPRESSION_TEXT = ExpressionText()
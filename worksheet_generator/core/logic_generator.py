@@ -1,353 +1,166 @@
 import random
-from typing import List, Dict, Set
-from ..data.data_loader import data_loader
+from math import comb
+from typing import List, Dict, Optional, Tuple
+from ..data.data_loader import DataSourceLoader, data_loader
+from ..utils.capacity import apply_shortage_policy
+from ..utils.sampling import SpaceSampler
+from ..utils.streaming import DEFAULT_STREAM_CYCLE, ProblemStream, open_stream
+from ..utils.uniqueness import UniquenessRegistry, fill_worksheets
+from .cyclic_patterns import CyclicPattern, compile_cyclic_pattern
+from .problem import Problem
+
+# Number sequence pattern types and their generator methods; every other
+# pattern type is a repeating pattern (see cyclic_patterns)
+NUMBER_PATTERN_GENERATORS = {
+    "number_sequence": "_generate_number_sequence_pattern",
+    "skip_counting": "_generate_skip_counting_pattern",
+    "large_skip_counting": "_generate_skip_counting_pattern",
+    "growing_pattern": "_generate_growing_pattern",
+    "growing_sequence": "_generate_growing_pattern",
+    "fibonacci_like": "_generate_fibonacci_pattern",
+}
 
 
 class LogicGenerator:
     """Generates logic and reasoning problems for primary school children"""
 
-    def __init__(self):
-        # Load data from data source
-        self.data_source = data_loader
-        # Track generated questions to ensure uniqueness
-        self.generated_questions: Set[str] = set()
+    def __init__(
+        self,
+        data_source: Optional[DataSourceLoader] = None,
+        scope=None,
+        seed: Optional[int] = None,
+    ):
+        # Load data from data source (the shared default bank unless one is injected)
+        self.data_source = data_source if data_source is not None else data_loader
+        # Track generated questions per kind to ensure uniqueness; an optional
+        # batch scope (see utils.uniqueness.batch_scope) spans worksheets
+        self.registry = UniquenessRegistry(scope)
+        # Private random generator, seeded for reproducible worksheets
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # CyclicPattern.key -> sampler over that template's pattern space
+        self._pattern_samplers: Dict[Tuple, SpaceSampler] = {}
+        # age group -> (content version, compiled templates)
+        self._pattern_templates: Dict[str, Tuple] = {}
 
     def reset_generated_questions(self):
         """Reset the tracking of generated questions for a new worksheet"""
-        self.generated_questions.clear()
-
-    def generate_pattern_sequence(self, age_group: str, max_attempts: int = 20) -> Dict:
-        """Generate pattern completion problems"""
-        # Get pattern templates from data source
-        pattern_templates = self.data_source.get_pattern_templates(age_group)
-
-        if not pattern_templates:
-            return self._generate_fallback_pattern(age_group)
+        self.registry.clear()
+        self._pattern_samplers.clear()
+
+    def generate_pattern_sequence(self, age_group: str, max_attempts: int = 20) -> Problem:
+        """Generate pattern completion problems
+
+        Repeating (AB, ABC, ABCD) patterns are drawn without replacement from
+        the compiled pattern space of their template, so they never need a
+        retry; number sequences are drawn at random.
+        """
+        templates = self._compiled_pattern_templates(age_group)
+
+        for _ in range(max_attempts):
+            # Templates whose patterns are all used on this worksheet sit out
+            candidates = [
+                template
+                for template in templates
+                if not isinstance(template, CyclicPattern)
+                or self._remaining_patterns(template)
+            ]
+            if not candidates:
+                break
+            template = self.rng.choice(candidates)
 
-        for attempt in range(max_attempts):
-            template = random.choice(pattern_templates)
+            if isinstance(template, CyclicPattern):
+                problem = self._draw_cyclic_pattern(template, age_group)
+                if problem is not None:
+                    return problem
+                continue
 
-            # Generate the pattern based on the template
             pattern_result = self._generate_pattern_from_template(template)
-
-            if pattern_result:
-                # Create unique key using the actual question text for absolute uniqueness
-                question_text = pattern_result["question"]
-                question_key = f"pattern_{hash(question_text)}_{age_group}"
-
-                if question_key not in self.generated_questions:
-                    self.generated_questions.add(question_key)
-                    return {
-                        "question": pattern_result["question"],
-                        "answer": pattern_result["answer"],
-                        "explanation": pattern_result["explanation"],
-                        "type": "pattern",
-                    }
-
-        # Fallback if unique generation fails
-        return self._generate_fallback_pattern(age_group)
-
-    def _generate_pattern_from_template(self, template: Dict) -> Dict:
-        """Generate a pattern based on a template"""
-        pattern_type = template.get("type", "AB_color")
-
-        if pattern_type.startswith("AB_"):
-            return self._generate_ab_pattern(template)
-        elif pattern_type.startswith("ABC_"):
-            return self._generate_abc_pattern(template)
-        elif pattern_type.startswith("ABCD_") or pattern_type == "ABCD_pattern":
-            return self._generate_abcd_pattern(template)
-        elif pattern_type == "number_sequence":
-            return self._generate_number_sequence_pattern(template)
-        elif pattern_type == "skip_counting" or pattern_type == "large_skip_counting":
-            return self._generate_skip_counting_pattern(template)
-        elif pattern_type == "growing_pattern" or pattern_type == "growing_sequence":
-            return self._generate_growing_pattern(template)
-        elif pattern_type == "fibonacci_like":
-            return self._generate_fibonacci_pattern(template)
-        elif (
-            pattern_type == "complex_visual_pattern" or pattern_type == "complex_visual"
-        ):
-            return self._generate_complex_visual_pattern(template)
-        else:
-            return self._generate_ab_pattern(template)
-            return self._generate_ab_pattern(template)
-
-    def _generate_ab_pattern(self, template: Dict) -> Dict:
-        """Generate a simple AB repeating pattern"""
-        pattern_type = template.get("type", "AB_color")
-
-        if pattern_type == "AB_color":
-            colors = template.get("colors", [])
-            if colors and len(colors) >= 2 and isinstance(colors[0], dict):
-                # New visual format with symbols
-                selected_colors = random.sample(colors, 2)
-                items = [
-                    color.get("symbol", color.get("name", "🔴"))
-                    for color in selected_colors
-                ]
-                names = [color.get("name", "color") for color in selected_colors]
-            else:
-                # Fallback for old format
-                items = random.sample(
-                    colors or ["red", "blue"], min(2, len(colors) if colors else 2)
-                )
-                names = items
-        elif pattern_type == "AB_shape":
-            shapes = template.get("shapes", [])
-            if shapes and len(shapes) >= 2 and isinstance(shapes[0], dict):
-                # New visual format with symbols
-                selected_shapes = random.sample(shapes, 2)
-                items = [
-                    shape.get("symbol", shape.get("unicode", shape.get("name", "●")))
-                    for shape in selected_shapes
-                ]
-                names = [shape.get("name", "shape") for shape in selected_shapes]
-            else:
-                # Fallback for old format
-                items = random.sample(
-                    shapes or ["circle", "square"], min(2, len(shapes) if shapes else 2)
+            # Create unique key using the actual question text for absolute uniqueness
+            if self.registry.add("pattern", pattern_result["question"], age_group):
+                return Problem(
+                    question=pattern_result["question"],
+                    answer=pattern_result["answer"],
+                    explanation=pattern_result["explanation"],
+                    type="pattern",
                 )
-                names = items
-        elif pattern_type == "AB_animal":
-            animals = template.get("animals", [])
-            if animals and len(animals) >= 2 and isinstance(animals[0], dict):
-                # Animal patterns with emojis
-                selected_animals = random.sample(animals, 2)
-                items = [
-                    animal.get("symbol", animal.get("name", "🐱"))
-                    for animal in selected_animals
-                ]
-                names = [animal.get("name", "animal") for animal in selected_animals]
-            else:
-                # Fallback
-                items = ["🐱", "🐶"]
-                names = ["cat", "dog"]
-        elif pattern_type == "AB_number":
-            num_range = template.get("number_range", {"min": 1, "max": 5})
-            start = random.randint(num_range["min"], num_range["max"])
-            items = [str(start), str(start + 1)]
-            names = items
-        else:
-            items = ["🔴", "🔵"]  # fallback with visual symbols
-            names = ["red", "blue"]
-
-        pattern_length = template.get("pattern_length", 6)
-        repeats = pattern_length // 2
-
-        # Create the full sequence
-        sequence = (items * repeats)[:pattern_length]
 
-        # Remove the last item to create the question
-        question_sequence = sequence[:-1]
-        answer = sequence[-1]
-
-        question = f"Complete the pattern: {' - '.join(question_sequence)} - ____"
-        explanation = (
-            f"The pattern repeats {' - '.join(items)}, so the next item is: {answer}"
-        )
-
-        # Create a more unique sequence key that includes pattern order, length, and actual sequence
-        sorted_names = sorted(names)  # Sort to ensure consistent ordering
-        sequence_hash = hash(
-            "_".join(question_sequence)
-        )  # Add sequence hash for uniqueness
-        sequence_key = f"{pattern_type}_{'-'.join(sorted_names)}_{pattern_length}_{answer}_{sequence_hash}"
-
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": explanation,
-            "sequence_key": sequence_key,
-            "visual_items": items,
-            "item_names": names,
-        }
-
-    def _generate_abc_pattern(self, template: Dict) -> Dict:
-        """Generate an ABC repeating pattern"""
-        items_data = template.get("items", {})
-
-        # Randomly choose between colors and shapes
-        if "colors" in items_data and random.choice([True, False]):
-            colors = items_data["colors"]
-            if colors and len(colors) >= 3 and isinstance(colors[0], dict):
-                # New visual format
-                selected_colors = random.sample(colors, 3)
-                items = [
-                    color.get("symbol", color.get("name", "🔴"))
-                    for color in selected_colors
-                ]
-                names = [color.get("name", "color") for color in selected_colors]
-            else:
-                # Fallback for old format
-                items = random.sample(
-                    colors or ["red", "blue", "green"],
-                    min(3, len(colors) if colors else 3),
-                )
-                names = items
-        elif "shapes" in items_data:
-            shapes = items_data["shapes"]
-            if shapes and len(shapes) >= 3 and isinstance(shapes[0], dict):
-                # New visual format
-                selected_shapes = random.sample(shapes, 3)
-                items = [
-                    shape.get("symbol", shape.get("unicode", shape.get("name", "●")))
-                    for shape in selected_shapes
-                ]
-                names = [shape.get("name", "shape") for shape in selected_shapes]
-            else:
-                # Fallback for old format
-                items = random.sample(
-                    shapes or ["circle", "square", "triangle"],
-                    min(3, len(shapes) if shapes else 3),
-                )
-                names = items
-        else:
-            items = ["🔴", "🔵", "🟢"]  # fallback with visual symbols
-            names = ["red", "blue", "green"]
-
-        pattern_length = template.get("pattern_length", 9)
-        repeats = pattern_length // 3
-
-        # Create the full sequence
-        sequence = (items * repeats)[:pattern_length]
-
-        # Remove the last item to create the question
-        question_sequence = sequence[:-1]
-        answer = sequence[-1]
-
-        question = f"Complete the pattern: {' - '.join(question_sequence)} - ____"
-        explanation = (
-            f"The pattern repeats {' - '.join(items)}, so the next item is: {answer}"
-        )
-
-        # Create a more unique sequence key that includes pattern order, length, and actual sequence
-        sorted_names = sorted(names)  # Sort to ensure consistent ordering
-        sequence_hash = hash(
-            "_".join(question_sequence)
-        )  # Add sequence hash for uniqueness
-        sequence_key = (
-            f"ABC_{'-'.join(sorted_names)}_{pattern_length}_{answer}_{sequence_hash}"
-        )
-
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": explanation,
-            "sequence_key": sequence_key,
-            "visual_items": items,
-            "item_names": names,
-        }
-
-    def _generate_abcd_pattern(self, template: Dict) -> Dict:
-        """Generate an ABCD repeating pattern (for advanced children)"""
-        items_data = template.get("items", {})
-
-        if "shapes" in items_data:
-            shapes = items_data["shapes"]
-            if shapes and len(shapes) >= 4 and isinstance(shapes[0], dict):
-                # New visual format
-                selected_shapes = random.sample(shapes, 4)
-                items = [
-                    shape.get("symbol", shape.get("unicode", shape.get("name", "●")))
-                    for shape in selected_shapes
-                ]
-                names = [shape.get("name", "shape") for shape in selected_shapes]
-            else:
-                # Fallback for old format
-                items = random.sample(
-                    shapes or ["circle", "square", "triangle", "star"],
-                    min(4, len(shapes) if shapes else 4),
-                )
-                names = items
-        else:
-            items = ["🔴", "🔵", "🟢", "🟡"]  # fallback with visual symbols
-            names = ["red", "blue", "green", "yellow"]
-
-        pattern_length = template.get("pattern_length", 8)
-        repeats = pattern_length // 4
-
-        # Create the full sequence
-        sequence = (items * repeats)[:pattern_length]
-
-        # Remove the last item to create the question
-        question_sequence = sequence[:-1]
-        answer = sequence[-1]
-
-        question = f"Complete the pattern: {' - '.join(question_sequence)} - ____"
-        explanation = (
-            f"The pattern repeats {' - '.join(items)}, so the next item is: {answer}"
-        )
-
-        # Create a more unique sequence key
-        sorted_names = sorted(names)
-        sequence_hash = hash("_".join(question_sequence))
-        sequence_key = (
-            f"ABCD_{'-'.join(sorted_names)}_{pattern_length}_{answer}_{sequence_hash}"
-        )
+        # Fallback if no template is available or unique generation fails
+        return self._generate_fallback_pattern(age_group)
 
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": explanation,
-            "sequence_key": sequence_key,
-            "visual_items": items,
-            "item_names": names,
+    def _compiled_pattern_templates(self, age_group: str) -> List:
+        """Pattern templates of an age group, compiled once
+
+        Repeating patterns become CyclicPatterns; number sequence templates
+        are kept as they are. Templates are read and recompiled only when the
+        data source's content_version changes (e.g. after a content reload),
+        so a SQLite store is not queried again for every pattern.
+        """
+        version = self.data_source.content_version
+        cached = self._pattern_templates.get(age_group)
+        if cached is None or cached[0] != version:
+            compiled = [
+                template
+                if template.get("type") in NUMBER_PATTERN_GENERATORS
+                else compile_cyclic_pattern(template)
+                for template in self.data_source.get_pattern_templates(age_group)
+            ]
+            cached = (version, compiled)
+            self._pattern_templates[age_group] = cached
+        return cached[1]
+
+    def _pattern_sampler(self, pattern: CyclicPattern) -> SpaceSampler:
+        sampler = self._pattern_samplers.get(pattern.key)
+        if sampler is None:
+            sampler = SpaceSampler(pattern, self.rng)
+            self._pattern_samplers[pattern.key] = sampler
+        return sampler
+
+    def _remaining_patterns(self, pattern: CyclicPattern) -> int:
+        """Patterns of a template not yet drawn in this pass"""
+        sampler = self._pattern_samplers.get(pattern.key)
+        return pattern.size if sampler is None else sampler.remaining
+
+    def _draw_cyclic_pattern(
+        self, pattern: CyclicPattern, age_group: str
+    ) -> Optional[Problem]:
+        """Draw an unused repeating pattern, or None once the template is used up
+
+        Patterns are never drawn twice in one pass; the check only skips
+        questions recorded elsewhere (another template or a batch scope).
+        """
+        sampler = self._pattern_sampler(pattern)
+        for _ in range(sampler.remaining):
+            params = sampler.draw()
+            problem = Problem.lazy(pattern, params, pattern.answer(params), "pattern")
+            if self.registry.add("pattern", problem["question"], age_group):
+                return problem
+        return None
+
+    def get_remaining_patterns(self, age_group: str) -> int:
+        """Repeating patterns left before the age group's templates repeat
+
+        Exact for the current worksheet (or stream): every template's pattern
+        space is counted and each draw takes one pattern out of it. Number
+        sequence templates are not counted.
+        """
+        remaining = {
+            template.key: self._remaining_patterns(template)
+            for template in self._compiled_pattern_templates(age_group)
+            if isinstance(template, CyclicPattern)
         }
+        return sum(remaining.values())
 
-    def _generate_complex_visual_pattern(self, template: Dict) -> Dict:
-        """Generate complex visual patterns combining multiple elements"""
-        visual_elements = template.get("visual_elements", {})
-
-        # Get available colors and shapes
-        colors = visual_elements.get("colors", [])
-        shapes = visual_elements.get("shapes", [])
-        sizes = visual_elements.get("sizes", ["small", "medium", "large"])
-
-        if colors and shapes and len(colors) >= 2 and len(shapes) >= 2:
-            # Create a pattern combining color and shape
-            selected_colors = random.sample(colors, 2)
-            selected_shapes = random.sample(shapes, 2)
-
-            # Create combined items (color + shape)
-            items = []
-            names = []
-            for i in range(2):
-                color = selected_colors[i % len(selected_colors)]
-                shape = selected_shapes[i % len(selected_shapes)]
-
-                # Use shape symbol as base, could be enhanced with color info
-                items.append(shape.get("symbol", shape.get("unicode", "●")))
-                names.append(
-                    f"{color.get('name', 'color')} {shape.get('name', 'shape')}"
-                )
-
-            pattern_length = template.get("pattern_length", 6)
-            sequence = (items * (pattern_length // 2 + 1))[:pattern_length]
-
-            question_sequence = sequence[:-1]
-            answer = sequence[-1]
-
-            question = f"Complete the pattern: {' - '.join(question_sequence)} - ____"
-            explanation = f"The pattern alternates between {names[0]} and {names[1]}, so the next item is: {answer}"
-
-            return {
-                "question": question,
-                "answer": answer,
-                "explanation": explanation,
-                "sequence_key": f"complex_visual_{hash('_'.join(question_sequence))}",
-                "visual_items": items,
-                "item_names": names,
-            }
-        else:
-            # Fallback to simple pattern
-            return self._generate_ab_pattern(template)
+    def _generate_pattern_from_template(self, template: Dict) -> Dict:
+        """Generate a number sequence pattern based on a template"""
+        generate = getattr(self, NUMBER_PATTERN_GENERATORS[template["type"]])
+        return generate(template)
 
     def _generate_fibonacci_pattern(self, template: Dict) -> Dict:
         """Generate a Fibonacci-like pattern"""
         start_range = template.get("start_range", {"min": 1, "max": 3})
-        a = random.randint(start_range["min"], start_range["max"])
-        b = random.randint(start_range["min"] + 1, start_range["max"] + 2)
+        a = self.rng.randint(start_range["min"], start_range["max"])
+        b = self.rng.randint(start_range["min"] + 1, start_range["max"] + 2)
 
         sequence = [a, b, a + b, a + 2 * b]
         question_sequence = sequence[:-1]
@@ -370,8 +183,8 @@ class LogicGenerator:
         start_range = template.get("start_range", {"min": 1, "max": 10})
         step_range = template.get("step_range", {"min": 1, "max": 5})
 
-        start = random.randint(start_range["min"], start_range["max"])
-        step = random.randint(step_range["min"], step_range["max"])
+        start = self.rng.randint(start_range["min"], start_range["max"])
+        step = self.rng.randint(step_range["min"], step_range["max"])
         length = template.get("sequence_length", 5)
 
         sequence = [start + i * step for i in range(length)]
@@ -397,8 +210,8 @@ class LogicGenerator:
         start_range = template.get("start_range", {"min": 1, "max": 8})
         skip_range = template.get("skip_range", {"min": 2, "max": 5})
 
-        start = random.randint(start_range["min"], start_range["max"])
-        skip = random.randint(skip_range["min"], skip_range["max"])
+        start = self.rng.randint(start_range["min"], start_range["max"])
+        skip = self.rng.randint(skip_range["min"], skip_range["max"])
         length = template.get("sequence_length", 4)
 
         sequence = [start + i * skip for i in range(length)]
@@ -422,8 +235,8 @@ class LogicGenerator:
         start_range = template.get("start_range", {"min": 2, "max": 5})
         mult_range = template.get("multiplier_range", {"min": 2, "max": 3})
 
-        start = random.randint(start_range["min"], start_range["max"])
-        multiplier = random.randint(mult_range["min"], mult_range["max"])
+        start = self.rng.randint(start_range["min"], start_range["max"])
+        multiplier = self.rng.randint(mult_range["min"], mult_range["max"])
         length = template.get("sequence_length", 4)
 
         sequence = [start * (multiplier**i) for i in range(length)]
@@ -444,10 +257,10 @@ class LogicGenerator:
             "sequence_key": f"grow_{start}_{multiplier}",
         }
 
-    def _generate_fallback_pattern(self, age_group: str) -> Dict:
+    def _generate_fallback_pattern(self, age_group: str) -> Problem:
         """Generate a simple fallback pattern if templates are not available"""
         # Create variety based on how many pattern questions have been generated
-        pattern_count = len([q for q in self.generated_questions if "pattern" in q])
+        pattern_count = self.registry.family_count("pattern")
 
         # Define different fallback patterns with more variety
         fallback_patterns = [
@@ -494,48 +307,46 @@ class LogicGenerator:
         answer = sequence[-1]
 
         # Create unique tracking key
-        question_key = f"pattern_fallback_{pattern_count}_{hash(question)}_{age_group}"
-        self.generated_questions.add(question_key)
+        self.registry.add("pattern_fallback", pattern_count, question, age_group)
 
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": f"The pattern repeats {description}, so the next item is: {answer}",
-            "type": "pattern",
-        }
+        return Problem(
+            question=question,
+            answer=answer,
+            explanation=f"The pattern repeats {description}, so the next item is: {answer}",
+            type="pattern",
+        )
 
-    def generate_classification(self, age_group: str, max_attempts: int = 10) -> Dict:
+    def generate_classification(self, age_group: str, max_attempts: int = 10) -> Problem:
         """Generate classification and sorting problems"""
         # Get classification problems from data source
         classification_problems = self.data_source.get_classification_problems(
-            age_group
+            age_group, sample=max_attempts, rng=self.rng
         )
 
         if not classification_problems:
             return self._generate_fallback_classification(age_group)
 
-        for attempt in range(max_attempts):
-            problem_template = random.choice(classification_problems)
+        for problem_template in classification_problems:
 
             # Generate the problem based on the template
-            correct_items = random.sample(
+            correct_items = self.rng.sample(
                 problem_template.get("correct_items", ["cat", "dog", "bird"]),
                 min(
                     3,
                     len(problem_template.get("correct_items", ["cat", "dog", "bird"])),
                 ),
             )
-            wrong_item = random.choice(problem_template.get("wrong_items", ["apple"]))
+            wrong_item = self.rng.choice(problem_template.get("wrong_items", ["apple"]))
 
-            # Create unique key for this classification question
+            # Record this classification question by its content
             category_name = problem_template.get("category", "animals")
-            question_key = f"classification_{category_name}_{wrong_item}_{'-'.join(sorted(correct_items))}"
 
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
+            if self.registry.add(
+                "classification", category_name, wrong_item, sorted(correct_items)
+            ):
 
                 items = correct_items + [wrong_item]
-                random.shuffle(items)
+                self.rng.shuffle(items)
 
                 question = (
                     f"Which one doesn't belong with {category_name}? {', '.join(items)}"
@@ -546,83 +357,79 @@ class LogicGenerator:
                     f"{wrong_item} doesn't belong with {category_name}",
                 ).format(item=wrong_item, category=category_name)
 
-                return {
-                    "question": question,
-                    "answer": answer,
-                    "explanation": explanation,
-                    "type": "classification",
-                }
+                return Problem(
+                    question=question,
+                    answer=answer,
+                    explanation=explanation,
+                    type="classification",
+                )
 
         # Fallback if unique generation fails
         return self._generate_fallback_classification(age_group)
 
-    def _generate_fallback_classification(self, age_group: str) -> Dict:
+    def _generate_fallback_classification(self, age_group: str) -> Problem:
         """Generate a simple fallback classification if templates are not available"""
         animals = ["cat", "dog", "bird"]
         wrong_item = "apple"
         items = animals + [wrong_item]
-        random.shuffle(items)
+        self.rng.shuffle(items)
 
         question = f"Which one doesn't belong? {', '.join(items)}"
         answer = wrong_item
         explanation = f"{wrong_item} is not an animal"
 
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": explanation,
-            "type": "classification",
-        }
+        return Problem(
+            question=question,
+            answer=answer,
+            explanation=explanation,
+            type="classification",
+        )
 
     def generate_logical_reasoning(
         self, age_group: str, max_attempts: int = 10
-    ) -> Dict:
+    ) -> Problem:
         """Generate logical reasoning problems"""
         # Get reasoning problems from data source
-        reasoning_problems = self.data_source.get_reasoning_problems(age_group)
+        reasoning_problems = self.data_source.get_reasoning_problems(
+            age_group, sample=max_attempts, rng=self.rng
+        )
 
         if not reasoning_problems:
             return self._generate_fallback_reasoning(age_group)
 
-        for attempt in range(max_attempts):
-            problem = random.choice(reasoning_problems)
+        for problem in reasoning_problems:
 
             # Handle different problem formats
             if "scenarios" in problem:
                 # Multiple choice scenarios
-                scenario = random.choice(problem["scenarios"])
+                scenario = self.rng.choice(problem["scenarios"])
                 question = scenario["question"]
                 answer = scenario["answer"]
                 explanation = scenario.get("explanation", f"Answer: {answer}")
-                # Create more unique key using hash of full question
-                question_key = (
-                    f"reasoning_scenario_{hash(question + answer)}_{age_group}"
-                )
+                question_kind = "reasoning_scenario"
             else:
                 # Single problem format
                 question = problem["question"]
                 answer = problem["answer"]
                 explanation = problem.get("explanation", f"Answer: {answer}")
-                # Create more unique key using hash of full question
-                question_key = f"reasoning_{hash(question + answer)}_{age_group}"
+                question_kind = "reasoning"
 
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
+            if self.registry.add(question_kind, question, answer, age_group):
 
-                return {
-                    "question": question,
-                    "answer": answer,
-                    "explanation": explanation,
-                    "type": "logical_reasoning",
-                }
+                return Problem(
+                    question=question,
+                    answer=answer,
+                    explanation=explanation,
+                    type="logical_reasoning",
+                )
 
         # Fallback if unique generation fails
         return self._generate_fallback_reasoning(age_group)
 
-    def _generate_fallback_reasoning(self, age_group: str) -> Dict:
+    def _generate_fallback_reasoning(self, age_group: str) -> Problem:
         """Generate a simple fallback reasoning problem if templates are not available"""
         # Create a unique fallback question based on current generated questions count
-        question_count = len([q for q in self.generated_questions if "reasoning" in q])
+        question_count = self.registry.family_count("reasoning")
 
         if age_group == "4-5":
             fallback_questions = [
@@ -723,31 +530,28 @@ class LogicGenerator:
                 question = f"What do we drink when thirsty?"
                 answer = "water"
 
-            # Add timestamp to make it even more unique
-            question_key = (
-                f"fallback_reasoning_{question_count}_{hash(question)}_{age_group}"
-            )
         else:
             # Select from predefined questions
             question, answer = fallback_questions[
                 question_count % len(fallback_questions)
             ]
-            question_key = f"fallback_reasoning_{question_count}_{hash(question + answer)}_{age_group}"
 
         # Ensure this question hasn't been used
-        if question_key in self.generated_questions:
+        if not self.registry.add(
+            "reasoning_fallback", question_count, question, answer, age_group
+        ):
             # Create an even more unique variant
             question = f"{question} (version {question_count})"
-            question_key = f"fallback_reasoning_variant_{question_count}_{hash(question)}_{age_group}"
-
-        self.generated_questions.add(question_key)
+            self.registry.add(
+                "reasoning_fallback_variant", question_count, question, age_group
+            )
 
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": f"Answer: {answer}",
-            "type": "logical_reasoning",
-        }
+        return Problem(
+            question=question,
+            answer=answer,
+            explanation=f"Answer: {answer}",
+            type="logical_reasoning",
+        )
 
     def _get_structured_distribution(
         self, age_group: str, count: int
@@ -797,32 +601,221 @@ class LogicGenerator:
 
         return distribution
 
-    def generate_problems(self, age_group: str, count: int) -> List[Dict]:
-        """Generate a structured mix of logic problems for the specified age group"""
-        # Reset questions tracking for each new worksheet
-        self.reset_generated_questions()
+    def get_capacity(self, age_group: str) -> Dict[str, Dict]:
+        """Count the distinct questions each problem type can produce
+
+        Classification and reasoning counts are exact. Pattern counts are
+        summed per template (repeating patterns count their compiled pattern
+        space) and may overcount when two templates can render the same
+        sequence. Fallback questions are not counted.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+
+        Returns:
+            {problem_type: {"available": int, "exact": bool}}
+        """
+        patterns = sum(
+            template.size
+            if isinstance(template, CyclicPattern)
+            else self._pattern_template_capacity(template)
+            for template in self._compiled_pattern_templates(age_group)
+        )
 
-        problems = []
+        classification = 0
+        categories = []
+        for problem_template in self.data_source.get_classification_problems(age_group):
+            correct_items = problem_template.get("correct_items", ["cat", "dog", "bird"])
+            wrong_items = problem_template.get("wrong_items", ["apple"])
+            classification += comb(len(correct_items), min(3, len(correct_items))) * len(
+                wrong_items
+            )
+            categories.append(problem_template.get("category", "animals"))
 
+        reasoning = set()
+        for problem in self.data_source.get_reasoning_problems(age_group):
+            for scenario in problem.get("scenarios", [problem]):
+                reasoning.add((scenario["question"], scenario["answer"]))
+
+        return {
+            "pattern": {"available": patterns, "exact": False},
+            "classification": {
+                "available": classification,
+                "exact": len(set(categories)) == len(categories),
+            },
+            "reasoning": {"available": len(reasoning), "exact": True},
+        }
+
+    def _pattern_template_capacity(self, template: Dict) -> int:
+        """Number of distinct questions a number sequence template can produce
+
+        Mirrors the choices made by _generate_pattern_from_template.
+        """
+
+        def span(value_range, low_offset=0, high_offset=0):
+            low = value_range["min"] + low_offset
+            high = value_range["max"] + high_offset
+            return max(0, high - low + 1)
+
+        pattern_type = template["type"]
+        if pattern_type == "number_sequence":
+            return span(template.get("start_range", {"min": 1, "max": 10})) * span(
+                template.get("step_range", {"min": 1, "max": 5})
+            )
+        if pattern_type in ["skip_counting", "large_skip_counting"]:
+            return span(template.get("start_range", {"min": 1, "max": 8})) * span(
+                template.get("skip_range", {"min": 2, "max": 5})
+            )
+        if pattern_type in ["growing_pattern", "growing_sequence"]:
+            return span(template.get("start_range", {"min": 2, "max": 5})) * span(
+                template.get("multiplier_range", {"min": 2, "max": 3})
+            )
+        start_range = template.get("start_range", {"min": 1, "max": 3})
+        return span(start_range) * span(start_range, 1, 2)
+
+    def _plan_worksheet(
+        self,
+        age_group: str,
+        count: int,
+        on_shortage: str,
+        capacity: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, int]:
+        """Resolve the problem type counts of a worksheet"""
         # Get structured distribution
         distribution = self._get_structured_distribution(age_group, count)
+        if on_shortage != "allow":
+            distribution = apply_shortage_policy(
+                "logic",
+                age_group,
+                distribution,
+                capacity or self.get_capacity(age_group),
+                on_shortage,
+            )
+        return distribution
 
-        print(f"🧩 Logic problem distribution for {count} questions (age {age_group}):")
-        for problem_type, type_count in distribution.items():
-            if type_count > 0:
-                print(f"   • {problem_type.title()}: {type_count} problems")
+    def _generate_of_type(self, age_group: str, problem_type: str) -> Problem:
+        """Generate one problem of the given type"""
+        if problem_type == "pattern":
+            return self.generate_pattern_sequence(age_group)
+        elif problem_type == "classification":
+            return self.generate_classification(age_group)
+        elif problem_type == "reasoning":
+            return self.generate_logical_reasoning(age_group)
+        raise ValueError(f"Unknown logic problem type: {problem_type}")
+
+    def _fill_worksheet(
+        self, age_group: str, distribution: Dict[str, int]
+    ) -> List[Problem]:
+        """Generate one worksheet from a resolved plan"""
+        # Reset questions tracking for each new worksheet
+        self.reset_generated_questions()
+
+        problems = []
 
         # Generate problems according to distribution
         for problem_type, type_count in distribution.items():
             for _ in range(type_count):
-                if problem_type == "pattern":
-                    problems.append(self.generate_pattern_sequence(age_group))
-                elif problem_type == "classification":
-                    problems.append(self.generate_classification(age_group))
-                elif problem_type == "reasoning":
-                    problems.append(self.generate_logical_reasoning(age_group))
+                problems.append(self._generate_of_type(age_group, problem_type))
 
         # Shuffle to mix problem types throughout the worksheet
-        random.shuffle(problems)
+        self.rng.shuffle(problems)
 
         return problems
+
+    def generate_problems(
+        self, age_group: str, count: int, on_shortage: str = "allow"
+    ) -> List[Problem]:
+        """Generate a structured mix of logic problems for the specified age group
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems
+            on_shortage: What to do when a problem type has fewer distinct
+                questions than requested: "allow" (repeat/fall back), "error"
+                (raise CapacityError) or "rebalance" (shift to other types)
+        """
+        distribution = self._plan_worksheet(age_group, count, on_shortage)
+
+        print(f"🧩 Logic problem distribution for {count} questions (age {age_group}):")
+        for problem_type, type_count in distribution.items():
+            if type_count > 0:
+                print(f"   • {problem_type.title()}: {type_count} problems")
+
+        return self._fill_worksheet(age_group, distribution)
+
+    def generate_worksheets(
+        self,
+        age_group: str,
+        count: int,
+        n: int,
+        diverse: bool = True,
+        on_shortage: str = "allow",
+    ) -> List[List[Problem]]:
+        """Generate n worksheets of the same age group and size in one call
+
+        The distribution and the capacity are worked out once for the whole
+        run instead of once per worksheet.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems per worksheet
+            n: Number of worksheets
+            diverse: Avoid repeating a question on different worksheets for
+                as long as the problem space allows (see diversity_window);
+                a scope passed to the generator is used instead if present
+            on_shortage: Shortage policy, as for generate_problems
+
+        Returns:
+            List of n worksheets, each a list of problems
+        """
+        return fill_worksheets(
+            self,
+            "🧩 Logic",
+            lambda capacity: self._plan_worksheet(
+                age_group, count, on_shortage, capacity
+            ),
+            lambda distribution: self._fill_worksheet(age_group, distribution),
+            age_group,
+            count,
+            n,
+            diverse,
+            on_shortage,
+        )
+
+    def iter_problems(
+        self,
+        age_group: str,
+        distribution: Optional[Dict[str, int]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[Dict] = None,
+    ) -> ProblemStream:
+        """Generate logic problems lazily, one at a time
+
+        Types are interleaved as on a shuffled worksheet, but nothing is
+        generated until it is read, so clients that stop early only pay for
+        the problems they used. Questions stay unique for the whole stream
+        for as long as the content allows.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            distribution: Problem type counts per cycle (default: the
+                structured distribution for limit problems, or for
+                DEFAULT_STREAM_CYCLE problems if the stream has no limit)
+            limit: Most problems to yield, or None for an endless stream
+            cursor: stream.cursor of an earlier stream to resume it
+
+        Returns:
+            ProblemStream; read stream.cursor to resume it later
+        """
+        if distribution is None:
+            distribution = self._get_structured_distribution(
+                age_group, limit or DEFAULT_STREAM_CYCLE
+            )
+
+        return open_stream(
+            self,
+            lambda problem_type: self._generate_of_type(age_group, problem_type),
+            distribution,
+            limit,
+            cursor,
+        )
@@ -1,416 +1,595 @@
 import random
-from typing import List, Dict, Tuple, Set
-from ..data.data_loader import data_loader
+from typing import List, Dict, Optional, Tuple
+from ..data.data_loader import DataSourceLoader, data_loader
+from ..utils.capacity import apply_shortage_policy
+from ..utils.sampling import SpaceSampler
+from ..utils.streaming import DEFAULT_STREAM_CYCLE, ProblemStream, open_stream
+from ..utils.uniqueness import UniquenessRegistry, fill_worksheets
+from .difficulty import DifficultyBand, DifficultyIndex, difficulty_index
+from .expressions import (
+    EXPRESSION_TEXT,
+    EXPRESSION_TYPES,
+    ExpressionSpace,
+    canonical,
+    evaluate,
+    space_from_settings,
+    with_blank,
+)
+from .operation_specs import (
+    ANSWERS,
+    AgeSpec,
+    OperationSpec,
+    compile_age_spec,
+    operation_spec,
+)
+from .problem import Problem, TemplateText
+from .word_templates import WordTemplate, compile_word_templates
+from .batch_math import (
+    ARITHMETIC_TEXT,
+    OPERATIONS,
+    ArithmeticBatch,
+    draw_operand_arrays,
+    np,
+    require_numpy,
+)
+
+# Text of the word problem used when an age group has no templates
+FALLBACK_WORD_TEXT = TemplateText(
+    "Sarah has {a} apples. Her friend gives her {b} more apples. How many apples does Sarah have now?",
+    "Answer: {answer}",
+)
+
+
+# Uniqueness registry kind for each arithmetic operation
+OPERATION_KEY_PREFIXES = {
+    "addition": "add",
+    "subtraction": "sub",
+    "multiplication": "mul",
+    "division": "div",
+}
 
 
 class MathGenerator:
     """Generates math problems suitable for primary school children (4-10 years old)"""
 
-    def __init__(self):
-        # Load age group configurations from data source
-        self.data_source = data_loader
-        # Track generated questions to ensure uniqueness
-        self.generated_questions: Set[str] = set()
+    def __init__(
+        self,
+        data_source: Optional[DataSourceLoader] = None,
+        scope=None,
+        seed: Optional[int] = None,
+    ):
+        # Load age group configurations from data source (the shared default bank unless one is injected)
+        self.data_source = data_source if data_source is not None else data_loader
+        # Track generated questions per kind to ensure uniqueness; an optional
+        # batch scope (see utils.uniqueness.batch_scope) spans worksheets
+        self.registry = UniquenessRegistry(scope)
+        # Private random generator: the same seed, age group, count and content
+        # produce the same problems, and threads do not share RNG state
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # OperationSpec.key (or expression space) -> sampler over that space
+        self._operand_samplers: Dict[Tuple, SpaceSampler] = {}
+        # Compiled operation_settings.json per age group (see _age_spec)
+        self._settings_source = None
+        self._age_specs: Dict[str, AgeSpec] = {}
+        # age group -> (source templates, max_num, compiled templates)
+        self._word_templates: Dict[str, Tuple] = {}
+
+    def _age_spec(self, age_group: str) -> AgeSpec:
+        """Compiled settings of an age group, built once
+
+        Recompiled only when the data source serves new settings (e.g. after
+        a content reload).
+        """
+        settings_data = self.data_source.get_math_source("operation_settings")
+        if settings_data is not self._settings_source:
+            self._settings_source = settings_data
+            self._age_specs = {}
+        age_spec = self._age_specs.get(age_group)
+        if age_spec is None:
+            age_spec = compile_age_spec(age_group, settings_data)
+            self._age_specs[age_group] = age_spec
+        return age_spec
+
+    def _draw_operands(
+        self, spec: OperationSpec, band: Optional[DifficultyBand] = None
+    ) -> Tuple[int, int]:
+        """Draw an unused (a, b) operand pair without replacement
+
+        Each operation spec (or difficulty band of it) samples its operand
+        space through a lazy Fisher–Yates permutation, so every draw is O(1)
+        and problems only repeat once the whole space has been used.
+        """
+        sampler_key = spec.key if band is None else (spec.key, band.key)
+        sampler = self._operand_samplers.get(sampler_key)
+        if sampler is None:
+            sampler = SpaceSampler(spec.space if band is None else band, self.rng)
+            self._operand_samplers[sampler_key] = sampler
+
+        prefix = OPERATION_KEY_PREFIXES[spec.operation]
+        # Pairs are never drawn twice in one pass; the check only skips
+        # questions recorded elsewhere (e.g. a batch scope). Once the space
+        # has been used up, repeats are accepted without rescanning it.
+        for _ in range(sampler.remaining + 1):
+            a, b = sampler.draw()
+            if spec.operation == "division":
+                # (divisor, result) -> (dividend, divisor)
+                a, b = a * b, a
+            if self.registry.add(prefix, a, b) or sampler.exhausted:
+                break
+        return a, b
+
+    def _arithmetic_problem(
+        self, spec: OperationSpec, band: Optional[DifficultyBand] = None
+    ) -> Problem:
+        """Generate one problem of an operation spec"""
+        a, b = self._draw_operands(spec, band)
+        operation = spec.operation
+        return Problem.lazy(
+            ARITHMETIC_TEXT[operation], (a, b), ANSWERS[operation](a, b), operation
+        )
 
     def generate_addition(
         self, max_num: int, simple: bool = False, max_attempts: int = 10
-    ) -> Dict:
-        """Generate addition problems"""
-        for attempt in range(max_attempts):
-            if simple:
-                # For younger kids: single digit + single digit <= 10
-                a = random.randint(1, min(5, max_num))
-                b = random.randint(1, min(10 - a, max_num))
-            else:
-                a = random.randint(1, max_num)
-                b = random.randint(1, max_num)
-
-            question_key = f"add_{a}_{b}"
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
-                return {
-                    "question": f"{a} + {b} = ____",
-                    "answer": a + b,
-                    "explanation": f"{a} + {b} = {a + b}",
-                    "type": "addition",
-                }
-
-        # If we couldn't generate unique question, return a random one
-        a = random.randint(1, max_num)
-        b = random.randint(1, max_num)
-        return {
-            "question": f"{a} + {b} = ____",
-            "answer": a + b,
-            "explanation": f"{a} + {b} = {a + b}",
-            "type": "addition",
-        }
+    ) -> Problem:
+        """Generate addition problems
+
+        max_attempts is kept for compatibility; operands are sampled without
+        replacement, so no retries are needed.
+        """
+        spec = operation_spec("addition", max_num, simple)
+        return self._arithmetic_problem(spec)
 
     def generate_subtraction(
         self, max_num: int, simple: bool = False, max_attempts: int = 10
-    ) -> Dict:
-        """Generate subtraction problems"""
-        for attempt in range(max_attempts):
-            if simple:
-                # Ensure positive results for younger kids
-                a = random.randint(5, min(10, max_num))
-                b = random.randint(1, a)
-            else:
-                a = random.randint(10, max_num)
-                b = random.randint(1, a)
-
-            question_key = f"sub_{a}_{b}"
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
-                return {
-                    "question": f"{a} - {b} = ____",
-                    "answer": a - b,
-                    "explanation": f"{a} - {b} = {a - b}",
-                    "type": "subtraction",
-                }
-
-        # Fallback if unique generation fails
-        a = random.randint(10, max_num)
-        b = random.randint(1, a)
-        return {
-            "question": f"{a} - {b} = ____",
-            "answer": a - b,
-            "explanation": f"{a} - {b} = {a - b}",
-            "type": "subtraction",
-        }
+    ) -> Problem:
+        """Generate subtraction problems with positive results"""
+        spec = operation_spec("subtraction", max_num, simple)
+        return self._arithmetic_problem(spec)
 
     def generate_multiplication(
         self, max_num: int, simple: bool = False, max_attempts: int = 10
-    ) -> Dict:
+    ) -> Problem:
         """Generate multiplication problems"""
-        for attempt in range(max_attempts):
-            if simple:
-                # Tables of 2, 3, 5, 10 for beginners
-                tables = [2, 3, 5, 10]
-                a = random.choice(tables)
-                b = random.randint(1, 10)
-            else:
-                a = random.randint(2, min(12, max_num))
-                b = random.randint(2, min(12, max_num))
-
-            question_key = f"mul_{a}_{b}"
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
-                return {
-                    "question": f"{a} × {b} = ____",
-                    "answer": a * b,
-                    "explanation": f"{a} × {b} = {a * b}",
-                    "type": "multiplication",
-                }
-
-        # Fallback
-        a = random.randint(2, min(12, max_num))
-        b = random.randint(2, min(12, max_num))
-        return {
-            "question": f"{a} × {b} = ____",
-            "answer": a * b,
-            "explanation": f"{a} × {b} = {a * b}",
-            "type": "multiplication",
-        }
+        spec = operation_spec("multiplication", max_num, simple)
+        return self._arithmetic_problem(spec)
 
     def generate_division(
         self, max_num: int, simple: bool = False, max_attempts: int = 10
-    ) -> Dict:
+    ) -> Problem:
         """Generate division problems with whole number results"""
-        for attempt in range(max_attempts):
-            if simple:
-                # Simple division with small numbers
-                b = random.randint(2, 5)
-                result = random.randint(2, 10)
-                a = b * result
-            else:
-                b = random.randint(2, 12)
-                result = random.randint(2, max_num // b)
-                a = b * result
-
-            question_key = f"div_{a}_{b}"
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
-                return {
-                    "question": f"{a} ÷ {b} = ____",
-                    "answer": result,
-                    "explanation": f"{a} ÷ {b} = {result}",
-                    "type": "division",
-                }
-
-        # Fallback
-        b = random.randint(2, 12)
-        result = random.randint(2, max_num // b)
-        a = b * result
-        return {
-            "question": f"{a} ÷ {b} = ____",
-            "answer": result,
-            "explanation": f"{a} ÷ {b} = {result}",
-            "type": "division",
-        }
-
-    def generate_word_problem(self, age_group: str, max_attempts: int = 10) -> Dict:
-        """Generate word problems appropriate for age group"""
-        # Get operation settings combined with number ranges for this age group
-        combined_settings = self.data_source.get_operation_settings_with_ranges(
-            age_group
-        )
-        number_range = combined_settings.get("number_range", {"min": 1, "max": 20})
-        max_num = number_range["max"]
-
-        # Get all word problem templates for different operations
-        all_templates = []
-        for operation in ["addition", "subtraction", "multiplication", "division"]:
-            templates = self.data_source.get_word_problems(operation, age_group)
-            for template in templates:
-                template["operation"] = operation
-                all_templates.append(template)
-
-        if not all_templates:
-            # Fallback if no templates found
-            return self._generate_fallback_word_problem(age_group, max_num)
-
-        for attempt in range(max_attempts):
-            template_data = random.choice(all_templates)
-
-            # Generate numbers based on template constraints
-            values = self._generate_numbers_for_template(template_data, max_num)
-
-            # Create a unique key for this word problem
-            if (
-                template_data["operation"] == "division"
-                and "total" in template_data["template"]
-            ):
-                question_key = (
-                    f"word_{template_data['operation']}_{values['total']}_{values['b']}"
-                )
-            else:
-                question_key = (
-                    f"word_{template_data['operation']}_{values['a']}_{values['b']}"
-                )
-
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
-
-                # Calculate answer based on operation
-                if (
-                    template_data["operation"] == "division"
-                    and "total" in template_data["template"]
-                ):
-                    answer = values["total"] // values["b"]
-                else:
-                    answer = self._calculate_answer(
-                        template_data["operation"], values["a"], values["b"]
-                    )
-
-                # Format the question
-                question = template_data["template"].format(**values)
-
-                return {
-                    "question": question,
-                    "answer": answer,
-                    "explanation": f"Answer: {answer}",
-                    "type": "word_problem",
-                }
-
-        # Fallback if unique generation fails
-        template_data = random.choice(all_templates)
-        values = self._generate_numbers_for_template(template_data, max_num)
-
-        if (
-            template_data["operation"] == "division"
-            and "total" in template_data["template"]
-        ):
-            answer = values["total"] // values["b"]
-        else:
-            answer = self._calculate_answer(
-                template_data["operation"], values["a"], values["b"]
+        spec = operation_spec("division", max_num, simple)
+        return self._arithmetic_problem(spec)
+
+    def _expression_space(
+        self, age_spec: AgeSpec, problem_type: str
+    ) -> ExpressionSpace:
+        """Expression space of a multi_step or missing_operand problem type"""
+        if age_spec.expressions is None:
+            raise ValueError(
+                f"Age group {age_spec.age_group} has no expression problems"
             )
+        missing, _ = EXPRESSION_TYPES[problem_type]
+        return space_from_settings(age_spec.expressions, age_spec.max_num, missing)
+
+    def _expression_problem(self, age_spec: AgeSpec, problem_type: str) -> Problem:
+        """Generate one multi-step or missing-operand problem
+
+        Expressions are drawn without replacement from the enumerated space,
+        so they always meet the age group's rules. Uniqueness is checked on
+        the canonical form: once (12 + 7) × 3 is used, 3 × (7 + 12) is
+        skipped as a repeat.
+        """
+        space = self._expression_space(age_spec, problem_type)
+        sampler = self._operand_samplers.get(space)
+        if sampler is None:
+            sampler = SpaceSampler(space, self.rng)
+            self._operand_samplers[space] = sampler
+
+        _, kind = EXPRESSION_TYPES[problem_type]
+        for _ in range(sampler.remaining + 1):
+            tree, blank = sampler.draw()
+            if blank is None:
+                answer = evaluate(tree)
+                added = self.registry.add(kind, canonical(tree))
+            else:
+                # The question shows the result, so it is part of the key
+                blanked, answer = with_blank(tree, blank)
+                added = self.registry.add(kind, canonical(blanked), evaluate(tree))
+            if added or sampler.exhausted:
+                break
+        return Problem.lazy(EXPRESSION_TEXT, (tree, blank), answer, problem_type)
+
+    def generate_expression_problems(
+        self, age_group: str, count: int, missing: bool = False
+    ) -> List[Problem]:
+        """Generate multi-step or missing-operand problems
+
+        Multi-step problems look like ``(12 + 7) × 3 = ____`` and
+        missing-operand problems like ``__ + 8 = 15``. Numbers, results and
+        the number of steps come from the "expressions" settings of the age
+        group in operation_settings.json.
+
+        Args:
+            age_group: Target age group (8-10)
+            count: Number of problems
+            missing: Missing-operand instead of multi-step problems
+
+        Raises:
+            ValueError: If the age group has no "expressions" settings
+        """
+        problem_type = "missing_operand" if missing else "multi_step"
+        age_spec = self._age_spec(age_group)
+        self._expression_space(age_spec, problem_type)
 
-        question = template_data["template"].format(**values)
-
-        return {
-            "question": question,
-            "answer": answer,
-            "explanation": f"Answer: {answer}",
-            "type": "word_problem",
-        }
-
-    def _generate_numbers_for_template(
-        self, template_data: Dict, max_num: int
-    ) -> Dict[str, int]:
-        """Generate appropriate numbers for a word problem template"""
-        setup = template_data.get("setup", {})
-        operation = template_data["operation"]
-
-        # Handle division problems with {total} placeholder
-        if operation == "division" and "total" in template_data["template"]:
-            # For division problems: total = b * result, where result is the answer
-            b_constraints = setup.get("b", {"min": 2, "max": 8})
-            result_constraints = setup.get("result", {"min": 2, "max": 12})
-
-            b = random.randint(b_constraints["min"], min(b_constraints["max"], max_num))
-            result = random.randint(
-                result_constraints["min"], min(result_constraints["max"], max_num)
-            )
-            total = b * result
+        # Reset questions tracking for each new worksheet
+        self.reset_generated_questions()
+        return [self._expression_problem(age_spec, problem_type) for _ in range(count)]
 
-            return {
-                "total": total,
-                "b": b,
-                "result": result,
-                "a": total,
-            }  # a=total for compatibility
+    def generate_word_problem(self, age_group: str, max_attempts: int = 10) -> Problem:
+        """Generate word problems appropriate for age group"""
+        max_num = self._age_spec(age_group).max_num
+        templates = self._compiled_word_templates(age_group, max_num)
 
-        # Handle regular problems with {a} and {b}
-        else:
-            a_constraints = setup.get("a", {"min": 1, "max": max_num})
-            b_constraints = setup.get("b", {"min": 1, "max": max_num})
-
-            a_min = a_constraints["min"]
-            a_max = min(a_constraints["max"], max_num)
-            b_min = b_constraints["min"]
-            b_max = min(b_constraints["max"], max_num)
-
-            # For subtraction, ensure a is large enough to accommodate b_min
-            if operation == "subtraction":
-                a_min = max(a_min, b_min)  # Ensure a is at least as large as b_min
-
-            a = random.randint(a_min, a_max)
-
-            # For subtraction, ensure b <= a for positive results
-            if operation == "subtraction":
-                b_max = min(b_max, a)
-
-            b = random.randint(b_min, b_max)
-
-            return {"a": a, "b": b}
-
-    def _calculate_answer(self, operation: str, a: int, b: int) -> int:
-        """Calculate the answer based on the operation"""
-        if operation == "addition":
-            return a + b
-        elif operation == "subtraction":
-            return a - b
-        elif operation == "multiplication":
-            return a * b
-        elif operation == "division":
-            return a // b
-        else:
-            return a + b  # default to addition
+        if not templates:
+            # Fallback if no templates found (or none fit the number range)
+            return self._generate_fallback_word_problem(age_group, max_num)
 
-    def _generate_fallback_word_problem(self, age_group: str, max_num: int) -> Dict:
+        for attempt in range(max_attempts):
+            template = self.rng.choice(templates)
+            # Numbers come from the template's solved ranges, so this never fails
+            params = template.draw(self.rng)
+
+            # The operands identify this word problem
+            if self.registry.add("word", template.operation, *params):
+                break
+        # If unique generation fails the last draw is used
+
+        # The question is formatted from the params when first read
+        return Problem.lazy(template, params, template.answer(params), "word_problem")
+
+    def _compiled_word_templates(
+        self, age_group: str, max_num: int
+    ) -> Tuple[WordTemplate, ...]:
+        """Word problem templates of an age group, compiled once
+
+        Recompiled only when the data source serves new templates (e.g. after
+        a content reload) or the number range changes.
+        """
+        source = self.data_source.get_word_problem_templates(age_group)
+        cached = self._word_templates.get(age_group)
+        if cached is None or cached[0] is not source or cached[1] != max_num:
+            cached = (source, max_num, compile_word_templates(source, max_num))
+            self._word_templates[age_group] = cached
+        return cached[2]
+
+    def _generate_fallback_word_problem(self, age_group: str, max_num: int) -> Problem:
         """Generate a simple fallback word problem if templates are not available"""
-        a = random.randint(1, max_num // 2)
-        b = random.randint(1, max_num // 2)
+        a = self.rng.randint(1, max(1, max_num // 2))
+        b = self.rng.randint(1, max(1, max_num // 2))
 
-        return {
-            "question": f"Sarah has {a} apples. Her friend gives her {b} more apples. How many apples does Sarah have now?",
-            "answer": a + b,
-            "explanation": f"Answer: {a + b}",
-            "type": "word_problem",
-        }
+        return Problem.lazy(
+            FALLBACK_WORD_TEXT, {"a": a, "b": b}, a + b, "word_problem"
+        )
 
     def reset_generated_questions(self):
         """Reset the tracking of generated questions for a new worksheet"""
-        self.generated_questions.clear()
+        self.registry.clear()
+        self._operand_samplers.clear()
 
     def _get_structured_distribution(
         self, age_group: str, count: int
     ) -> Dict[str, int]:
-        """Get structured distribution of problem types based on age group and count"""
-
-        if age_group == "4-5":
-            # Focus on basic addition and simple concepts
-            base_distribution = {
-                "addition": 0.50,  # 50% addition (most important)
-                "subtraction": 0.25,  # 25% subtraction (simpler)
-                "word": 0.25,  # 25% word problems (context)
-            }
-        elif age_group == "6-7":
-            # Balanced introduction to operations
-            base_distribution = {
-                "addition": 0.30,  # 30% addition
-                "subtraction": 0.25,  # 25% subtraction
-                "multiplication": 0.15,  # 15% multiplication (introduction)
-                "word": 0.30,  # 30% word problems (more context)
-            }
-        else:  # 8-10 years
-            # Full spectrum of operations
-            base_distribution = {
-                "addition": 0.20,  # 20% addition
-                "subtraction": 0.20,  # 20% subtraction
-                "multiplication": 0.25,  # 25% multiplication (focus)
-                "division": 0.15,  # 15% division
-                "word": 0.20,  # 20% word problems
-            }
+        """Get structured distribution of problem types based on age group and count
+
+        The weights come from the "distributions" of operation_settings.json.
+        """
+        return self._age_spec(age_group).distribution(count)
+
+    def get_difficulty_index(self, age_group: str, operation: str) -> DifficultyIndex:
+        """Operand pairs of an age group's operation, grouped by difficulty
+
+        The index is built once per operand space and shared between
+        generators; use its counts() and values() to see which bands exist.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            operation: addition, subtraction, multiplication or division
+        """
+        spec = self._age_spec(age_group).operations.get(operation)
+        if spec is None:
+            raise ValueError(f"Unknown operation: {operation}")
+        return difficulty_index(spec)
+
+    def generate_graded_problems(
+        self, age_group: str, operation: str, count: int, **features
+    ) -> List[Problem]:
+        """Generate arithmetic problems with the given difficulty features
+
+        Problems are drawn directly from the matching band of the difficulty
+        index, e.g. ``generate_graded_problems("8-10", "addition", 10,
+        carries=1)`` or ``("8-10", "subtraction", 10, borrows=(1, None))``.
+        They are unique until the band is used up.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            operation: addition, subtraction, multiplication or division
+            count: Number of problems
+            **features: Feature filters (see DifficultyIndex.band): carries
+                (addition), borrows (subtraction), table (multiplication,
+                division), digits and result_digits
+
+        Raises:
+            ValueError: If a feature does not apply to the operation or no
+                problem of the age group matches the filters
+        """
+        index = self.get_difficulty_index(age_group, operation)
+        band = index.band(**features)
+        if not band.size:
+            raise ValueError(
+                f"No {operation} problems for age {age_group} match {features}"
+            )
 
-        # Convert percentages to actual counts
-        distribution = {}
-        total_assigned = 0
-
-        for problem_type, percentage in base_distribution.items():
-            assigned_count = round(count * percentage)
-            distribution[problem_type] = assigned_count
-            total_assigned += assigned_count
-
-        # Adjust for rounding differences
-        diff = count - total_assigned
-        if diff != 0:
-            # Add/remove from the most appropriate type
-            if age_group == "4-5":
-                distribution["addition"] += diff
-            elif age_group == "6-7":
-                distribution["word"] += diff
+        # Reset questions tracking for each new worksheet
+        self.reset_generated_questions()
+        spec = self._age_spec(age_group).operations[operation]
+        return [self._arithmetic_problem(spec, band) for _ in range(count)]
+
+    def get_capacity(self, age_group: str) -> Dict[str, Dict]:
+        """Count the distinct questions each problem type can produce
+
+        Arithmetic types are counted from their operand spaces and word
+        problems from the templates' number ranges; fallback questions are
+        not counted. Expression types count every enumerated expression, so
+        their capacity is an upper bound (exact False).
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+
+        Returns:
+            {problem_type: {"available": int, "exact": bool}}
+        """
+        age_spec = self._age_spec(age_group)
+
+        capacity = {}
+        for problem_type in age_spec.weights:
+            exact = True
+            if problem_type == "word":
+                word_keys = set()
+                for template in self._compiled_word_templates(
+                    age_group, age_spec.max_num
+                ):
+                    word_keys.update(template.keys())
+                available = len(word_keys)
+            elif problem_type in EXPRESSION_TYPES:
+                # Commutative variants count separately but share a question
+                available = len(self._expression_space(age_spec, problem_type))
+                exact = False
             else:
-                distribution["multiplication"] += diff
-
-        return distribution
-
-    def generate_problems(self, age_group: str, count: int) -> List[Dict]:
-        """Generate a structured mix of math problems for the specified age group"""
-        # Get operation settings combined with number ranges for this age group
-        combined_settings = self.data_source.get_operation_settings_with_ranges(
-            age_group
+                available = len(age_spec.operations[problem_type].space)
+            capacity[problem_type] = {"available": available, "exact": exact}
+        return capacity
+
+    def generate_batch(
+        self,
+        age_group: str,
+        count: int,
+        operations: Optional[List[str]] = None,
+        unique: bool = True,
+    ) -> "ArithmeticBatch":
+        """Generate many arithmetic problems at once with NumPy
+
+        Meant for drill sheets and precomputed problem banks. Operands are
+        drawn per operation with the same ranges as generate_problems. The
+        count is split between operations in the same proportions (word
+        problems excluded), or evenly between the requested operations. The
+        batch does not use the uniqueness registry;
+        with unique=True each operation avoids repeated pairs on its own
+        until its operand space is used up.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems
+            operations: Arithmetic operations to include, with equal shares
+                (default: those of the age group's distribution)
+            unique: Avoid repeated problems while each space allows
+
+        Returns:
+            ArithmeticBatch of count shuffled problems
+        """
+        require_numpy()
+        age_spec = self._age_spec(age_group)
+
+        if operations is None:
+            weights = {
+                problem_type: share
+                for problem_type, share in age_spec.distribution(1000).items()
+                if problem_type in OPERATIONS
+            }
+        else:
+            # Requested operations share the count evenly, whether or not
+            # the age group's worksheets use them
+            for operation in operations:
+                if operation not in OPERATIONS:
+                    raise ValueError(f"Unknown operation: {operation}")
+            weights = dict.fromkeys(operations, 1)
+        total_weight = sum(weights.values())
+
+        # Seeded from the generator's RNG so seeded batches are reproducible
+        np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        codes, first_operands, second_operands = [], [], []
+        remaining = count
+        for position, (operation, weight) in enumerate(weights.items()):
+            if position == len(weights) - 1:
+                operation_count = remaining
+            else:
+                operation_count = round(count * weight / total_weight)
+            operation_count = min(operation_count, remaining)
+            remaining -= operation_count
+
+            space = age_spec.operations[operation].space
+            a, b = draw_operand_arrays(operation, space, operation_count, np_rng, unique)
+            codes.append(np.full(operation_count, OPERATIONS.index(operation), np.int8))
+            first_operands.append(a)
+            second_operands.append(b)
+
+        order = np_rng.permutation(count)
+        return ArithmeticBatch(
+            np.concatenate(codes)[order],
+            np.concatenate(first_operands)[order],
+            np.concatenate(second_operands)[order],
         )
-        if not combined_settings:
-            raise ValueError(f"Age group {age_group} not supported")
 
+    def _plan_worksheet(
+        self,
+        age_group: str,
+        count: int,
+        on_shortage: str,
+        capacity: Optional[Dict[str, Dict]] = None,
+    ) -> Tuple[AgeSpec, Dict[str, int]]:
+        """Resolve the compiled settings and problem type counts of a worksheet"""
+        age_spec = self._age_spec(age_group)
+
+        # Get structured distribution
+        distribution = age_spec.distribution(count)
+        if on_shortage != "allow":
+            distribution = apply_shortage_policy(
+                "math",
+                age_group,
+                distribution,
+                capacity or self.get_capacity(age_group),
+                on_shortage,
+            )
+        return age_spec, distribution
+
+    def _generate_of_type(self, age_spec: AgeSpec, problem_type: str) -> Problem:
+        """Generate one problem of the given type"""
+        if problem_type == "word":
+            return self.generate_word_problem(age_spec.age_group)
+        if problem_type in EXPRESSION_TYPES:
+            return self._expression_problem(age_spec, problem_type)
+        spec = age_spec.operations.get(problem_type)
+        if spec is None:
+            raise ValueError(f"Unknown math problem type: {problem_type}")
+        return self._arithmetic_problem(spec)
+
+    def _fill_worksheet(
+        self, age_spec: AgeSpec, distribution: Dict[str, int]
+    ) -> List[Problem]:
+        """Generate one worksheet from a resolved plan"""
         # Reset questions tracking for each new worksheet
         self.reset_generated_questions()
 
         problems = []
-        number_range = combined_settings.get("number_range", {"min": 1, "max": 20})
-        max_num = number_range["max"]
-
-        # Get structured distribution
-        distribution = self._get_structured_distribution(age_group, count)
-
-        print(f"📊 Math problem distribution for {count} questions (age {age_group}):")
-        for problem_type, type_count in distribution.items():
-            if type_count > 0:
-                print(f"   • {problem_type.title()}: {type_count} problems")
 
         # Generate problems according to distribution
         for problem_type, type_count in distribution.items():
             for _ in range(type_count):
-                if problem_type == "addition":
-                    simple = age_group == "4-5"
-                    problems.append(self.generate_addition(max_num, simple=simple))
-                elif problem_type == "subtraction":
-                    simple = age_group in ["4-5", "6-7"]
-                    problems.append(self.generate_subtraction(max_num, simple=simple))
-                elif problem_type == "multiplication":
-                    simple = True  # Keep multiplication simple for all ages
-                    problems.append(
-                        self.generate_multiplication(max_num, simple=simple)
-                    )
-                elif problem_type == "division":
-                    simple = True  # Keep division simple
-                    problems.append(self.generate_division(max_num, simple=simple))
-                elif problem_type == "word":
-                    problems.append(self.generate_word_problem(age_group))
+                problems.append(self._generate_of_type(age_spec, problem_type))
 
         # Shuffle to mix problem types throughout the worksheet
-        random.shuffle(problems)
+        self.rng.shuffle(problems)
 
         return problems
+
+    def generate_problems(
+        self, age_group: str, count: int, on_shortage: str = "allow"
+    ) -> List[Problem]:
+        """Generate a structured mix of math problems for the specified age group
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems
+            on_shortage: What to do when a problem type has fewer distinct
+                questions than requested: "allow" (repeat/fall back), "error"
+                (raise CapacityError) or "rebalance" (shift to other types)
+        """
+        age_spec, distribution = self._plan_worksheet(age_group, count, on_shortage)
+
+        print(f"📊 Math problem distribution for {count} questions (age {age_group}):")
+        for problem_type, type_count in distribution.items():
+            if type_count > 0:
+                print(f"   • {problem_type.title()}: {type_count} problems")
+
+        return self._fill_worksheet(age_spec, distribution)
+
+    def generate_worksheets(
+        self,
+        age_group: str,
+        count: int,
+        n: int,
+        diverse: bool = True,
+        on_shortage: str = "allow",
+    ) -> List[List[Problem]]:
+        """Generate n worksheets of the same age group and size in one call
+
+        Settings, the distribution and the capacity are worked out once for
+        the whole run instead of once per worksheet.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems per worksheet
+            n: Number of worksheets
+            diverse: Avoid repeating a question on different worksheets for
+                as long as the problem space allows (see diversity_window);
+                a scope passed to the generator is used instead if present
+            on_shortage: Shortage policy, as for generate_problems
+
+        Returns:
+            List of n worksheets, each a list of problems
+        """
+        return fill_worksheets(
+            self,
+            "📊 Math",
+            lambda capacity: self._plan_worksheet(
+                age_group, count, on_shortage, capacity
+            )[1],
+            lambda distribution: self._fill_worksheet(
+                self._age_spec(age_group), distribution
+            ),
+            age_group,
+            count,
+            n,
+            diverse,
+            on_shortage,
+        )
+
+    def iter_problems(
+        self,
+        age_group: str,
+        distribution: Optional[Dict[str, int]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[Dict] = None,
+    ) -> ProblemStream:
+        """Generate math problems lazily, one at a time
+
+        Types are interleaved as on a shuffled worksheet, but nothing is
+        generated until it is read, so clients that stop early only pay for
+        the problems they used. Questions stay unique for the whole stream
+        for as long as the problem space allows.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            distribution: Problem type counts per cycle (default: the
+                structured distribution for limit problems, or for
+                DEFAULT_STREAM_CYCLE problems if the stream has no limit)
+            limit: Most problems to yield, or None for an endless stream
+            cursor: stream.cursor of an earlier stream to resume it
+
+        Returns:
+            ProblemStream; read stream.cursor to resume it later
+        """
+        if distribution is None:
+            age_spec, distribution = self._plan_worksheet(
+                age_group, limit or DEFAULT_STREAM_CYCLE, "allow"
+            )
+        else:
+            age_spec = self._age_spec(age_group)
+
+        return open_stream(
+            self,
+            lambda problem_type: self._generate_of_type(age_spec, problem_type),
+            distribution,
+            limit,
+            cursor,
+        )
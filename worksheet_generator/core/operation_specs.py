@@ -0,0 +1,252 @@
+"""
+Operation specs for the Primary School Worksheet Generator
+Compiles operation_settings.json into operand spaces and problem type weights
+"""
+
+import operator
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..utils.sampling import RowSpace
+
+# Arithmetic operations every age group has a spec for
+ARITHMETIC_OPERATIONS = ("addition", "subtraction", "multiplication", "division")
+
+# Operation -> answer from the (a, b) operands
+ANSWERS = {
+    "addition": operator.add,
+    "subtraction": operator.sub,
+    "multiplication": operator.mul,
+    "division": operator.floordiv,
+}
+
+# Number range of an age group without a "number_ranges" entry
+DEFAULT_NUMBER_RANGE = {"min": 1, "max": 20}
+
+# Times tables of simple multiplication without a "tables" setting
+DEFAULT_TABLES = (2, 3, 5, 10)
+
+# Largest divisor of division without a "max_divisor" setting
+DEFAULT_MAX_DIVISOR = {True: 5, False: 12}
+
+# Settings of an operation an age group does not configure
+UNCONFIGURED_OPERATION = {"simple": True}
+
+
+class OperationSpec:
+    """Compiled settings of one arithmetic operation for one number range
+
+    ``space`` holds every operand pair the operation can produce. Rows are
+    the first operand (the divisor for division) and columns the second
+    operand (the quotient for division). Specs are cached by operation_spec(),
+    so equal settings share one spec, one space and one ``key``.
+    """
+
+    __slots__ = ("operation", "max_num", "simple", "key", "space")
+
+    def __init__(self, key: Tuple, space: RowSpace):
+        self.operation, self.max_num, self.simple = key[:3]
+        self.key = key
+        self.space = space
+
+    def __repr__(self) -> str:
+        return f"OperationSpec{self.key!r} ({len(self.space)} pairs)"
+
+
+@lru_cache(maxsize=None)
+def operation_spec(
+    operation: str,
+    max_num: int,
+    simple: bool = False,
+    tables: Optional[Tuple[int, ...]] = None,
+    max_divisor: Optional[int] = None,
+    ensure_positive: bool = True,
+) -> OperationSpec:
+    """Return the (cached) spec of an operation
+
+    Args:
+        operation: addition, subtraction, multiplication or division
+        max_num: Largest number of the age group
+        simple: Use the beginner ranges of the operation
+        tables: Times tables to draw multiplication from
+        max_divisor: Largest divisor of division
+        ensure_positive: Keep subtraction results positive (b <= a)
+
+    Raises:
+        ValueError: If the operation is unknown
+    """
+    key = (operation, max_num, simple, tables, max_divisor, ensure_positive)
+    return OperationSpec(key, _build_space(*key))
+
+
+def spec_from_settings(
+    operation: str, max_num: int, settings: Mapping[str, Any]
+) -> OperationSpec:
+    """Spec of an operation from its operation_settings.json entry"""
+    tables = settings.get("tables")
+    return operation_spec(
+        operation,
+        max_num,
+        bool(settings.get("simple", False)),
+        tuple(tables) if tables else None,
+        settings.get("max_divisor"),
+        bool(settings.get("ensure_positive", True)),
+    )
+
+
+def _build_space(
+    operation: str,
+    max_num: int,
+    simple: bool,
+    tables: Optional[Tuple[int, ...]],
+    max_divisor: Optional[int],
+    ensure_positive: bool,
+) -> RowSpace:
+    """Enumerate every operand pair an operation can produce"""
+    if operation == "addition":
+        if simple:
+            # For younger kids: single digit + single digit <= 10
+            return RowSpace(
+                (a, 1, min(10 - a, max_num)) for a in range(1, min(5, max_num) + 1)
+            )
+        return RowSpace((a, 1, max_num) for a in range(1, max_num + 1))
+
+    if operation == "subtraction":
+        low, high = (5, min(10, max_num)) if simple else (10, max_num)
+        # b <= a keeps results positive
+        return RowSpace(
+            (a, 1, a if ensure_positive else high) for a in range(low, high + 1)
+        )
+
+    if operation == "multiplication":
+        high = min(12, max_num)
+        if simple or tables:
+            # Times tables, by default 2, 3, 5 and 10 up to × 10
+            rows = tables or DEFAULT_TABLES
+            return RowSpace((a, 1, 10) if simple else (a, 2, high) for a in rows)
+        return RowSpace((a, 2, high) for a in range(2, high + 1))
+
+    if operation == "division":
+        # Whole number results: a = b * result, kept within max_num
+        if max_divisor is None:
+            max_divisor = DEFAULT_MAX_DIVISOR[simple]
+        high = 10 if simple else max_num
+        return RowSpace(
+            (b, 2, min(high, max_num // b)) for b in range(2, max_divisor + 1)
+        )
+
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+class AgeSpec:
+    """Compiled math settings of one age group
+
+    Holds the number range, an OperationSpec for every arithmetic operation
+    (operations the age group does not configure use the simple ranges), the
+    "expressions" settings of multi-step problems (None if the age group has
+    none) and the weights of the problem types on a worksheet.
+    """
+
+    __slots__ = (
+        "age_group",
+        "min_num",
+        "max_num",
+        "operations",
+        "expressions",
+        "weights",
+        "remainder",
+    )
+
+    def __init__(
+        self,
+        age_group: str,
+        number_range: Mapping[str, int],
+        operations: Dict[str, OperationSpec],
+        weights: Dict[str, float],
+        remainder: str,
+        expressions: Optional[Mapping[str, Any]] = None,
+    ):
+        self.age_group = age_group
+        self.min_num = number_range["min"]
+        self.max_num = number_range["max"]
+        self.operations = operations
+        self.expressions = expressions
+        self.weights = weights
+        self.remainder = remainder
+
+    def distribution(self, count: int) -> Dict[str, int]:
+        """Problem type counts of a worksheet of count problems
+
+        Each type gets its rounded share; the rounding difference goes to the
+        remainder type.
+        """
+        total_weight = sum(self.weights.values())
+        distribution = {
+            problem_type: round(count * weight / total_weight)
+            for problem_type, weight in self.weights.items()
+        }
+        distribution[self.remainder] += count - sum(distribution.values())
+        return distribution
+
+    def __repr__(self) -> str:
+        return f"AgeSpec({self.age_group!r}, {self.min_num}-{self.max_num})"
+
+
+def compile_age_spec(age_group: str, settings_data: Mapping[str, Any]) -> AgeSpec:
+    """Compile the operation_settings.json entries of an age group
+
+    Args:
+        age_group: Target age group (4-5, 6-7, 8-10)
+        settings_data: Contents of operation_settings.json
+
+    Raises:
+        ValueError: If the age group has no settings, or its distribution
+            names an unknown remainder type
+    """
+    operation_settings = settings_data.get("operation_settings", {})
+    number_ranges = settings_data.get("number_ranges", {})
+    distributions = settings_data.get("distributions", {})
+    if not any(
+        age_group in section
+        for section in (operation_settings, number_ranges, distributions)
+    ):
+        raise ValueError(f"Age group {age_group} not supported")
+
+    configured = operation_settings.get(age_group, {})
+    number_range = number_ranges.get(age_group, DEFAULT_NUMBER_RANGE)
+    operations = {
+        operation: spec_from_settings(
+            operation,
+            number_range["max"],
+            configured.get(operation, UNCONFIGURED_OPERATION),
+        )
+        for operation in ARITHMETIC_OPERATIONS
+    }
+
+    # Without a distribution every configured operation and word problems
+    # get the same weight
+    distribution = distributions.get(age_group, {})
+    weights = dict(
+        distribution.get("weights")
+        or {
+            **{
+                operation: 1
+                for operation in ARITHMETIC_OPERATIONS
+                if operation in configured
+            },
+            "word": 1,
+        }
+    )
+    remainder = distribution.get("remainder") or max(weights, key=weights.get)
+    if remainder not in weights:
+        raise ValueError(
+            f"Remainder type {remainder!r} of age group {age_group} has no weight"
+        )
+    return AgeSpec(
+        age_group,
+        number_range,
+        operations,
+        weights,
+        remainder,
+        configured.get("expressions"),
+    )
@@ -0,0 +1,244 @@
+"""
+Problem records for the Primary School Worksheet Generator
+Compact storage for generated problems that still reads like a dict
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Keys stored in slots, in the order they are listed
+FIELDS = ("question", "answer", "explanation", "type", "subject")
+
+# Fields holding a small, closed set of names (interned, shared by every problem)
+INTERNED_FIELDS = ("type", "subject")
+
+# Text fields a lazy problem renders on first access
+TEXT_FIELDS = ("question", "explanation")
+
+
+class ArithmeticText:
+    """Renders "a <symbol> b = ____" questions from (a, b) params"""
+
+    __slots__ = ("symbol",)
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+    def question(self, params) -> str:
+        return f"{params[0]} {self.symbol} {params[1]} = ____"
+
+    def explanation(self, params, answer) -> str:
+        return f"{params[0]} {self.symbol} {params[1]} = {answer}"
+
+
+class TemplateText:
+    """Renders str.format templates from a dict of params
+
+    The explanation template can also use ``{answer}``.
+    """
+
+    __slots__ = ("question_template", "explanation_template")
+
+    def __init__(self, question_template: str, explanation_template: str):
+        self.question_template = question_template
+        self.explanation_template = explanation_template
+
+    def question(self, params: Dict[str, Any]) -> str:
+        return self.question_template.format(**params)
+
+    def explanation(self, params: Dict[str, Any], answer) -> str:
+        return self.explanation_template.format(answer=answer, **params)
+
+
+class Problem(MutableMapping):
+    """One generated problem
+
+    The usual fields live in ``__slots__`` instead of a per-problem dict, and
+    ``type``/``subject`` are interned, so a bank of millions of problems keeps
+    a single copy of each type and subject name. A Problem reads and writes
+    like the dicts the generators used to return: ``problem["question"]``,
+    ``problem.get("subject")``, ``"explanation" in problem``, ``dict(problem)``
+    and comparison with plain dicts all work. Keys outside FIELDS go to a
+    side dict that is only created when needed. Use to_dict() before
+    json.dumps().
+
+    Problems made with Problem.lazy() keep their structured ``params`` and a
+    text renderer instead of strings; question and explanation are rendered
+    the first time they are read and then cached. Checking whether a key is
+    present never renders it.
+    """
+
+    __slots__ = (
+        "_question",
+        "answer",
+        "_explanation",
+        "type",
+        "subject",
+        "_extra",
+        "_text",
+        "params",
+    )
+
+    def __init__(
+        self, question: str, answer: Any, explanation: str, type: str, **extra
+    ):
+        """Initialize the problem
+
+        Args:
+            question: Question text
+            answer: Expected answer
+            explanation: Worked explanation for the answer key
+            type: Problem type, e.g. "addition" or "vocabulary"
+            **extra: Further keys, e.g. subject
+        """
+        self._question = question
+        self._explanation = explanation
+        self._init(answer, type, None, None, extra)
+
+    def _init(self, answer, type, text, params, extra):
+        self.answer = answer
+        self.type = sys.intern(type)
+        self._text = text
+        self.params = params
+        self._extra = None
+        for key, value in extra.items():
+            self[key] = value
+
+    @classmethod
+    def lazy(cls, text, params: Any, answer: Any, type: str, **extra) -> "Problem":
+        """Build a problem whose text is rendered on first access
+
+        Args:
+            text: Renderer with question(params) and explanation(params,
+                answer) methods, e.g. ArithmeticText or TemplateText
+            params: Structured values of the problem (operands, template
+                fields)
+            answer: Expected answer
+            type: Problem type
+            **extra: Further keys, e.g. subject
+        """
+        problem = cls.__new__(cls)
+        problem._init(answer, type, text, params, extra)
+        return problem
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Problem":
+        """Build a problem from a dict (e.g. one read back from JSON)"""
+        fields = dict(data)
+        return cls(
+            fields.pop("question"),
+            fields.pop("answer"),
+            fields.pop("explanation", ""),
+            fields.pop("type"),
+            **fields,
+        )
+
+    def to_dict(self, keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Plain dict copy, e.g. for json.dumps()
+
+        Args:
+            keys: Only copy these keys (if present); e.g. leaving out
+                "explanation" means it is never rendered
+        """
+        if keys is None:
+            return dict(self)
+        return {key: self[key] for key in keys if key in self}
+
+    @property
+    def question(self) -> str:
+        try:
+            return self._question
+        except AttributeError:
+            if self._text is None:
+                raise
+            self._question = self._text.question(self.params)
+            return self._question
+
+    @question.setter
+    def question(self, value: str):
+        self._question = value
+
+    @question.deleter
+    def question(self):
+        self._render_all()
+        del self._question
+
+    @property
+    def explanation(self) -> str:
+        try:
+            return self._explanation
+        except AttributeError:
+            if self._text is None:
+                raise
+            self._explanation = self._text.explanation(self.params, self.answer)
+            return self._explanation
+
+    @explanation.setter
+    def explanation(self, value: str):
+        self._explanation = value
+
+    @explanation.deleter
+    def explanation(self):
+        self._render_all()
+        del self._explanation
+
+    def _render_all(self):
+        """Render every text field and drop the renderer"""
+        if self._text is not None:
+            for key in TEXT_FIELDS:
+                getattr(self, key)
+            self._text = None
+
+    def _has(self, key: str) -> bool:
+        if key in TEXT_FIELDS and self._text is not None:
+            return True
+        return hasattr(self, "_" + key if key in TEXT_FIELDS else key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in FIELDS:
+            if key in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in FIELDS:
+            if not self._has(key):
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in FIELDS:
+            return self._has(key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if self._has(key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Problem({dict(self)!r})"
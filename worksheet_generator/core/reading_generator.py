@@ -1,33 +1,47 @@
 import random
-from typing import List, Dict, Set
-from ..data.data_loader import data_loader
+from typing import List, Dict, Optional
+from ..data.data_loader import DataSourceLoader, data_loader
+from ..utils.capacity import apply_shortage_policy
+from ..utils.streaming import DEFAULT_STREAM_CYCLE, ProblemStream, open_stream
+from ..utils.uniqueness import UniquenessRegistry, fill_worksheets
+from .problem import Problem
 
 
 class ReadingGenerator:
     """Generates reading comprehension exercises for primary school children"""
 
-    def __init__(self):
-        # Load data from data source
-        self.data_source = data_loader
-        # Track generated questions to ensure uniqueness
-        self.generated_questions: Set[str] = set()
+    def __init__(
+        self,
+        data_source: Optional[DataSourceLoader] = None,
+        scope=None,
+        seed: Optional[int] = None,
+    ):
+        # Load data from data source (the shared default bank unless one is injected)
+        self.data_source = data_source if data_source is not None else data_loader
+        # Track generated questions per kind to ensure uniqueness; an optional
+        # batch scope (see utils.uniqueness.batch_scope) spans worksheets
+        self.registry = UniquenessRegistry(scope)
+        # Private random generator, seeded for reproducible worksheets
+        self.seed = seed
+        self.rng = random.Random(seed)
 
     def reset_generated_questions(self):
         """Reset the tracking of generated questions for a new worksheet"""
-        self.generated_questions.clear()
+        self.registry.clear()
 
     def generate_vocabulary_exercise(
         self, age_group: str, max_attempts: int = 10
-    ) -> Dict:
+    ) -> Problem:
         """Generate vocabulary exercises"""
         # Get vocabulary exercises from data source
-        vocab_exercises = self.data_source.get_vocabulary_exercises(age_group)
+        vocab_exercises = self.data_source.get_vocabulary_exercises(
+            age_group, sample=max_attempts, rng=self.rng
+        )
 
         if not vocab_exercises:
             return self._generate_fallback_vocabulary(age_group)
 
-        for attempt in range(max_attempts):
-            exercise = random.choice(vocab_exercises)
+        for exercise in vocab_exercises:
             word = exercise["word"]
             correct_answer = exercise.get(
                 "correct_answer", exercise["choices"][0]
@@ -35,30 +49,30 @@ class ReadingGenerator:
 
             # Create unique key using sorted choices to avoid choice order issues
             choices_sorted = sorted(exercise["choices"])
-            question_key = f"vocab_{word}_{correct_answer}_{hash(''.join(choices_sorted))}_{age_group}"
 
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
+            if self.registry.add(
+                "vocab", word, correct_answer, choices_sorted, age_group
+            ):
 
-                choices = exercise[
-                    "choices"
-                ].copy()  # Make a copy to avoid modifying original
-                random.shuffle(choices)
+                choices = list(
+                    exercise["choices"]
+                )  # Make a copy to avoid modifying original
+                self.rng.shuffle(choices)
 
-                return {
-                    "question": f"Which word means the same as '{word}'? Choose from: {', '.join(choices)}",
-                    "answer": correct_answer,
-                    "explanation": f"'{word}' means the same as '{correct_answer}'",
-                    "type": "vocabulary",
-                }
+                return Problem(
+                    question=f"Which word means the same as '{word}'? Choose from: {', '.join(choices)}",
+                    answer=correct_answer,
+                    explanation=f"'{word}' means the same as '{correct_answer}'",
+                    type="vocabulary",
+                )
 
         # Fallback if unique generation fails
         return self._generate_fallback_vocabulary(age_group)
 
-    def _generate_fallback_vocabulary(self, age_group: str) -> Dict:
+    def _generate_fallback_vocabulary(self, age_group: str) -> Problem:
         """Generate a simple fallback vocabulary exercise if templates are not available"""
         # Create variety based on how many vocab questions have been generated
-        vocab_count = len([q for q in self.generated_questions if "vocab" in q])
+        vocab_count = self.registry.family_count("vocab")
 
         if age_group == "4-5":
             fallback_exercises = [
@@ -131,27 +145,25 @@ class ReadingGenerator:
 
             # Create unique tracking key using sorted choices to avoid order issues
             choices_sorted = sorted(choices)
-            question_key = f"vocab_fallback_{word}_{correct_answer}_{hash(''.join(choices_sorted))}_{age_group}"
 
             # Check if this word/answer combination has already been used
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
+            if self.registry.add(
+                "vocab_fallback", word, correct_answer, choices_sorted, age_group
+            ):
 
                 choices_copy = choices.copy()
-                random.shuffle(choices_copy)
+                self.rng.shuffle(choices_copy)
 
-                return {
-                    "question": f"Which word means the same as '{word}'? Choose from: {', '.join(choices_copy)}",
-                    "answer": correct_answer,
-                    "explanation": f"'{word}' means the same as '{correct_answer}'",
-                    "type": "vocabulary",
-                }
+                return Problem(
+                    question=f"Which word means the same as '{word}'? Choose from: {', '.join(choices_copy)}",
+                    answer=correct_answer,
+                    explanation=f"'{word}' means the same as '{correct_answer}'",
+                    type="vocabulary",
+                )
 
         # If all attempts failed, generate a truly unique dynamic question
         # Use a timestamp-based approach to ensure uniqueness
-        fallback_count = len(
-            [q for q in self.generated_questions if "vocab_fallback" in q]
-        )
+        fallback_count = self.registry.count("vocab_fallback")
         question_variation = fallback_count % 4
         if question_variation == 0:
             word, choices, correct_answer = (
@@ -180,37 +192,39 @@ class ReadingGenerator:
 
         # Create unique tracking key using sorted choices and fallback count
         choices_sorted = sorted(choices)
-        question_key = f"vocab_dynamic_{word}_{correct_answer}_{fallback_count}_{hash(''.join(choices_sorted))}_{age_group}"
-        self.generated_questions.add(question_key)
+        self.registry.add(
+            "vocab_dynamic", word, correct_answer, fallback_count, choices_sorted, age_group
+        )
 
         choices_copy = choices.copy()
-        random.shuffle(choices_copy)
+        self.rng.shuffle(choices_copy)
 
-        return {
-            "question": f"Which word means the same as '{word}'? Choose from: {', '.join(choices_copy)}",
-            "answer": correct_answer,
-            "explanation": f"'{word}' means the same as '{correct_answer}'",
-            "type": "vocabulary",
-        }
+        return Problem(
+            question=f"Which word means the same as '{word}'? Choose from: {', '.join(choices_copy)}",
+            answer=correct_answer,
+            explanation=f"'{word}' means the same as '{correct_answer}'",
+            type="vocabulary",
+        )
 
     def generate_story_comprehension(
         self, age_group: str, max_attempts: int = 10
-    ) -> Dict:
+    ) -> Problem:
         """Generate story-based comprehension questions"""
         # Get stories from data source
-        stories = self.data_source.get_stories(age_group)
+        stories = self.data_source.get_stories(
+            age_group, sample=max_attempts, rng=self.rng
+        )
 
         if not stories:
             return self._generate_fallback_story_comprehension(age_group)
 
-        for attempt in range(max_attempts):
-            story_data = random.choice(stories)
+        for story_data in stories:
 
             # Ensure the story has questions
             if "questions" not in story_data or not story_data["questions"]:
                 continue
 
-            question_data = random.choice(story_data["questions"])
+            question_data = self.rng.choice(story_data["questions"])
 
             # Handle different question formats
             if isinstance(question_data, dict):
@@ -222,25 +236,23 @@ class ReadingGenerator:
 
             # Create unique key for this question
             story_title = story_data.get("title", "Story")
-            question_key = f"story_{story_title}_{question_text[:20]}"
 
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
+            if self.registry.add("story", story_title, question_text[:20]):
 
                 story_text = story_data.get("text", story_data.get("story", ""))
                 full_question = f"{story_text}\n\nQuestion: {question_text}"
 
-                return {
-                    "question": full_question,
-                    "answer": answer,
-                    "explanation": f"The answer can be found in the story: {answer}",
-                    "type": "story_comprehension",
-                }
+                return Problem(
+                    question=full_question,
+                    answer=answer,
+                    explanation=f"The answer can be found in the story: {answer}",
+                    type="story_comprehension",
+                )
 
         # Fallback if unique generation fails
         return self._generate_fallback_story_comprehension(age_group)
 
-    def _generate_fallback_story_comprehension(self, age_group: str) -> Dict:
+    def _generate_fallback_story_comprehension(self, age_group: str) -> Problem:
         """Generate a simple fallback story comprehension if templates are not available"""
         story_text = "Mimi is a small black cat. She likes to play with a red ball. Every morning, Mimi drinks milk and eats fish."
         question_text = "What color is Mimi?"
@@ -248,58 +260,57 @@ class ReadingGenerator:
 
         full_question = f"{story_text}\n\nQuestion: {question_text}"
 
-        return {
-            "question": full_question,
-            "answer": answer,
-            "explanation": f"The answer can be found in the story: {answer}",
-            "type": "story_comprehension",
-        }
+        return Problem(
+            question=full_question,
+            answer=answer,
+            explanation=f"The answer can be found in the story: {answer}",
+            type="story_comprehension",
+        )
 
     def generate_sentence_building(
         self, age_group: str, max_attempts: int = 10
-    ) -> Dict:
+    ) -> Problem:
         """Generate sentence building exercises"""
         # Get sentence building exercises from data source
-        sentence_exercises = self.data_source.get_sentence_building_exercises(age_group)
+        sentence_exercises = self.data_source.get_sentence_building_exercises(
+            age_group, sample=max_attempts, rng=self.rng
+        )
 
         if not sentence_exercises:
             return self._generate_fallback_sentence_building(age_group)
 
-        for attempt in range(max_attempts):
-            exercise = random.choice(sentence_exercises)
+        for exercise in sentence_exercises:
             sentence = exercise["sentence"]
 
-            # Create unique key using hash to handle choice order variations
-            choices_sorted = sorted(
-                exercise["choices"]
-            )  # Sort to ensure consistent ordering
+            # Sorted choices make the fingerprint independent of choice order
+            choices_sorted = sorted(exercise["choices"])
             correct_answer = exercise.get(
                 "correct_answer", exercise["choices"][0]
             )  # Use provided correct answer or first option
-            question_key = f"sentence_{hash(sentence + correct_answer + ''.join(choices_sorted))}_{age_group}"
 
-            if question_key not in self.generated_questions:
-                self.generated_questions.add(question_key)
+            if self.registry.add(
+                "sentence", sentence, correct_answer, choices_sorted, age_group
+            ):
 
-                options = exercise[
-                    "choices"
-                ].copy()  # Make a copy to avoid modifying original
-                random.shuffle(options)
+                options = list(
+                    exercise["choices"]
+                )  # Make a copy to avoid modifying original
+                self.rng.shuffle(options)
 
-                return {
-                    "question": f"Complete the sentence: {sentence} Choose from: {', '.join(options)}",
-                    "answer": correct_answer,
-                    "explanation": f"The correct answer is '{correct_answer}'",
-                    "type": "sentence_building",
-                }
+                return Problem(
+                    question=f"Complete the sentence: {sentence} Choose from: {', '.join(options)}",
+                    answer=correct_answer,
+                    explanation=f"The correct answer is '{correct_answer}'",
+                    type="sentence_building",
+                )
 
         # Fallback if unique generation fails
         return self._generate_fallback_sentence_building(age_group)
 
-    def _generate_fallback_sentence_building(self, age_group: str) -> Dict:
+    def _generate_fallback_sentence_building(self, age_group: str) -> Problem:
         """Generate a simple fallback sentence building exercise if templates are not available"""
         # Create variety based on how many sentence questions have been generated
-        sentence_count = len([q for q in self.generated_questions if "sentence" in q])
+        sentence_count = self.registry.family_count("sentence")
 
         if age_group == "4-5":
             fallback_exercises = [
@@ -471,18 +482,19 @@ class ReadingGenerator:
             ]
 
         # Create unique tracking key
-        question_key = f"sentence_fallback_{sentence_count}_{hash(sentence + correct_answer)}_{age_group}"
-        self.generated_questions.add(question_key)
+        self.registry.add(
+            "sentence_fallback", sentence_count, sentence, correct_answer, age_group
+        )
 
         options_copy = options.copy()
-        random.shuffle(options_copy)
+        self.rng.shuffle(options_copy)
 
-        return {
-            "question": f"Complete the sentence: {sentence} Choose from: {', '.join(options_copy)}",
-            "answer": correct_answer,
-            "explanation": f"The correct answer is '{correct_answer}'",
-            "type": "sentence_building",
-        }
+        return Problem(
+            question=f"Complete the sentence: {sentence} Choose from: {', '.join(options_copy)}",
+            answer=correct_answer,
+            explanation=f"The correct answer is '{correct_answer}'",
+            type="sentence_building",
+        )
 
     def _get_structured_distribution(
         self, age_group: str, count: int
@@ -532,15 +544,115 @@ class ReadingGenerator:
 
         return distribution
 
-    def generate_problems(self, age_group: str, count: int) -> List[Dict]:
-        """Generate a structured mix of reading problems for the specified age group"""
+    def get_capacity(self, age_group: str) -> Dict[str, Dict]:
+        """Count the distinct questions each problem type can produce
+
+        Counts follow the uniqueness keys used by the generators, so they are
+        exact; fallback questions are not counted.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+
+        Returns:
+            {problem_type: {"available": int, "exact": bool}}
+        """
+        vocabulary = {
+            (
+                exercise["word"],
+                exercise.get("correct_answer", exercise["choices"][0]),
+                tuple(sorted(exercise["choices"])),
+            )
+            for exercise in self.data_source.get_vocabulary_exercises(age_group)
+        }
+
+        sentences = {
+            (
+                exercise["sentence"],
+                exercise.get("correct_answer", exercise["choices"][0]),
+                tuple(sorted(exercise["choices"])),
+            )
+            for exercise in self.data_source.get_sentence_building_exercises(age_group)
+        }
+
+        story_questions = set()
+        for story_data in self.data_source.get_stories(age_group):
+            for question_data in story_data.get("questions") or []:
+                if isinstance(question_data, dict):
+                    question_text = question_data["question"]
+                else:
+                    question_text = question_data[0]
+                story_questions.add(
+                    (story_data.get("title", "Story"), question_text[:20])
+                )
+
+        return {
+            "vocabulary": {"available": len(vocabulary), "exact": True},
+            "sentence": {"available": len(sentences), "exact": True},
+            "story": {"available": len(story_questions), "exact": True},
+        }
+
+    def _plan_worksheet(
+        self,
+        age_group: str,
+        count: int,
+        on_shortage: str,
+        capacity: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, int]:
+        """Resolve the problem type counts of a worksheet"""
+        # Get structured distribution
+        distribution = self._get_structured_distribution(age_group, count)
+        if on_shortage != "allow":
+            distribution = apply_shortage_policy(
+                "reading",
+                age_group,
+                distribution,
+                capacity or self.get_capacity(age_group),
+                on_shortage,
+            )
+        return distribution
+
+    def _generate_of_type(self, age_group: str, problem_type: str) -> Problem:
+        """Generate one problem of the given type"""
+        if problem_type == "story":
+            return self.generate_story_comprehension(age_group)
+        elif problem_type == "vocabulary":
+            return self.generate_vocabulary_exercise(age_group)
+        elif problem_type == "sentence":
+            return self.generate_sentence_building(age_group)
+        raise ValueError(f"Unknown reading problem type: {problem_type}")
+
+    def _fill_worksheet(
+        self, age_group: str, distribution: Dict[str, int]
+    ) -> List[Problem]:
+        """Generate one worksheet from a resolved plan"""
         # Reset questions tracking for each new worksheet
         self.reset_generated_questions()
 
         problems = []
 
-        # Get structured distribution
-        distribution = self._get_structured_distribution(age_group, count)
+        # Generate problems according to distribution
+        for problem_type, type_count in distribution.items():
+            for _ in range(type_count):
+                problems.append(self._generate_of_type(age_group, problem_type))
+
+        # Shuffle to mix problem types throughout the worksheet
+        self.rng.shuffle(problems)
+
+        return problems
+
+    def generate_problems(
+        self, age_group: str, count: int, on_shortage: str = "allow"
+    ) -> List[Problem]:
+        """Generate a structured mix of reading problems for the specified age group
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems
+            on_shortage: What to do when a problem type has fewer distinct
+                questions than requested: "allow" (repeat/fall back), "error"
+                (raise CapacityError) or "rebalance" (shift to other types)
+        """
+        distribution = self._plan_worksheet(age_group, count, on_shortage)
 
         print(
             f"📚 Reading problem distribution for {count} questions (age {age_group}):"
@@ -549,17 +661,81 @@ class ReadingGenerator:
             if type_count > 0:
                 print(f"   • {problem_type.title()}: {type_count} problems")
 
-        # Generate problems according to distribution
-        for problem_type, type_count in distribution.items():
-            for _ in range(type_count):
-                if problem_type == "story":
-                    problems.append(self.generate_story_comprehension(age_group))
-                elif problem_type == "vocabulary":
-                    problems.append(self.generate_vocabulary_exercise(age_group))
-                elif problem_type == "sentence":
-                    problems.append(self.generate_sentence_building(age_group))
+        return self._fill_worksheet(age_group, distribution)
+
+    def generate_worksheets(
+        self,
+        age_group: str,
+        count: int,
+        n: int,
+        diverse: bool = True,
+        on_shortage: str = "allow",
+    ) -> List[List[Problem]]:
+        """Generate n worksheets of the same age group and size in one call
+
+        The distribution and the capacity are worked out once for the whole
+        run instead of once per worksheet.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            count: Number of problems per worksheet
+            n: Number of worksheets
+            diverse: Avoid repeating a question on different worksheets for
+                as long as the problem space allows (see diversity_window);
+                a scope passed to the generator is used instead if present
+            on_shortage: Shortage policy, as for generate_problems
+
+        Returns:
+            List of n worksheets, each a list of problems
+        """
+        return fill_worksheets(
+            self,
+            "📚 Reading",
+            lambda capacity: self._plan_worksheet(
+                age_group, count, on_shortage, capacity
+            ),
+            lambda distribution: self._fill_worksheet(age_group, distribution),
+            age_group,
+            count,
+            n,
+            diverse,
+            on_shortage,
+        )
 
-        # Shuffle to mix problem types throughout the worksheet
-        random.shuffle(problems)
+    def iter_problems(
+        self,
+        age_group: str,
+        distribution: Optional[Dict[str, int]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[Dict] = None,
+    ) -> ProblemStream:
+        """Generate reading problems lazily, one at a time
+
+        Types are interleaved as on a shuffled worksheet, but nothing is
+        generated until it is read, so clients that stop early only pay for
+        the problems they used. Questions stay unique for the whole stream
+        for as long as the content allows.
+
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            distribution: Problem type counts per cycle (default: the
+                structured distribution for limit problems, or for
+                DEFAULT_STREAM_CYCLE problems if the stream has no limit)
+            limit: Most problems to yield, or None for an endless stream
+            cursor: stream.cursor of an earlier stream to resume it
+
+        Returns:
+            ProblemStream; read stream.cursor to resume it later
+        """
+        if distribution is None:
+            distribution = self._get_structured_distribution(
+                age_group, limit or DEFAULT_STREAM_CYCLE
+            )
 
-        return problems
+        return open_stream(
+            self,
+            lambda problem_type: self._generate_of_type(age_group, problem_type),
+            distribution,
+            limit,
+            cursor,
+        )
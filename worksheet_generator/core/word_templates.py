@@ -0,0 +1,177 @@
+"""
+Compiled word problem templates for the Primary School Worksheet Generator
+Solves each template's number ranges once so drawing a problem never fails
+"""
+
+import operator
+import random
+from string import Formatter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from ..utils.fingerprint import fingerprint
+from ..utils.sampling import RowSpace
+from .operation_specs import ANSWERS
+
+# Template field -> position in the values of an (a, b) problem
+OPERAND_FIELDS = {"a": 0, "b": 1}
+
+# Template field -> position in the values of a (total, b) division problem,
+# whose values are (total, b, result); "a" is kept as an alias of total
+TOTAL_FIELDS = {"total": 0, "a": 0, "b": 1, "result": 2}
+
+# Ranges used when a template leaves out a setup entry
+DEFAULT_DIVISOR_RANGE = {"min": 2, "max": 8}
+DEFAULT_RESULT_RANGE = {"min": 2, "max": 12}
+
+
+class WordTemplate:
+    """A word problem template compiled for one number range
+
+    The template text is parsed once into a %-style pattern, and the setup
+    constraints are solved into the RowSpace of every feasible operand pair:
+    operands are clamped to max_num, subtraction keeps b <= a and "total"
+    division keeps total = b * result <= max_num. ``len(template)`` is the
+    exact number of distinct problems and draw() picks one of them with a
+    single randrange, so sampling never hits an empty range.
+
+    A compiled template is also the problem's text renderer (see
+    Problem.lazy); its params are the operand pair (a, b), or (total, b) for
+    division by a total.
+    """
+
+    __slots__ = ("operation", "template", "space", "_pattern", "_slots", "_total")
+
+    def __init__(self, template_data: Mapping[str, Any], max_num: int):
+        """Compile a template
+
+        Args:
+            template_data: Template entry with "template", "operation" and an
+                optional "setup" of {"min", "max"} ranges per operand
+            max_num: Largest number of the age group
+
+        Raises:
+            ValueError: If the template uses a field it cannot be given
+        """
+        self.operation = template_data["operation"]
+        self.template = template_data["template"]
+        setup = template_data.get("setup", {})
+
+        parsed = list(Formatter().parse(self.template))
+        self._total = self.operation == "division" and any(
+            name == "total" for _, name, _, _ in parsed
+        )
+        self._compile_text(parsed, TOTAL_FIELDS if self._total else OPERAND_FIELDS)
+
+        if self._total:
+            self.space = self._solve_division(setup, max_num)
+        else:
+            self.space = self._solve_operands(setup, max_num)
+
+    def _compile_text(self, parsed: List[Tuple], positions: Dict[str, int]):
+        """Turn the parsed template into a %-style pattern and value positions"""
+        pattern = []
+        slots = []
+        for literal, name, spec, conversion in parsed:
+            pattern.append(literal.replace("%", "%%"))
+            if name is None:
+                continue
+            if name not in positions or conversion:
+                raise ValueError(
+                    f"Unsupported field {{{name}}} in word problem template: "
+                    f"{self.template!r}"
+                )
+            pattern.append("%s")
+            slots.append((positions[name], spec))
+        self._pattern = "".join(pattern)
+        self._slots = tuple(slots)
+
+    def _solve_operands(self, setup: Mapping[str, Any], max_num: int) -> RowSpace:
+        """Feasible (a, b) pairs; rows are a, columns b"""
+        a_range = setup.get("a", {"min": 1, "max": max_num})
+        b_range = setup.get("b", {"min": 1, "max": max_num})
+        b_min = b_range["min"]
+        if self.operation == "division":
+            b_min = max(1, b_min)
+        b_max = min(b_range["max"], max_num)
+        a_values = range(a_range["min"], min(a_range["max"], max_num) + 1)
+        if self.operation == "subtraction":
+            # b <= a keeps the answer positive; rows with a < b_min are empty
+            return RowSpace((a, b_min, min(b_max, a)) for a in a_values)
+        return RowSpace((a, b_min, b_max) for a in a_values)
+
+    def _solve_division(self, setup: Mapping[str, Any], max_num: int) -> RowSpace:
+        """Feasible (b, result) pairs; total = b * result stays <= max_num"""
+        b_range = setup.get("b", DEFAULT_DIVISOR_RANGE)
+        result_range = setup.get("result", DEFAULT_RESULT_RANGE)
+        return RowSpace(
+            (b, result_range["min"], min(result_range["max"], max_num // b))
+            for b in range(max(1, b_range["min"]), min(b_range["max"], max_num) + 1)
+        )
+
+    def __len__(self) -> int:
+        return self.space.size
+
+    def _params(self, pair: Tuple[int, int]) -> Tuple[int, int]:
+        if self._total:
+            b, result = pair
+            return b * result, b
+        return pair
+
+    def draw(self, rng: random.Random) -> Tuple[int, int]:
+        """Return the params of a random problem (each equally likely)"""
+        return self._params(self.space.unrank(rng.randrange(self.space.size)))
+
+    def params(self) -> Iterator[Tuple[int, int]]:
+        """Params of every distinct problem"""
+        for index in range(self.space.size):
+            yield self._params(self.space.unrank(index))
+
+    def keys(self) -> Iterator[int]:
+        """Uniqueness key of every distinct problem"""
+        for params in self.params():
+            yield fingerprint("word", self.operation, *params)
+
+    def answer(self, params: Tuple[int, int]) -> int:
+        """Answer of the problem with these params"""
+        if self._total:
+            return params[0] // params[1]
+        # Unknown operations add
+        return ANSWERS.get(self.operation, operator.add)(*params)
+
+    def question(self, params: Tuple[int, int]) -> str:
+        if self._total:
+            values = (params[0], params[1], params[0] // params[1])
+        else:
+            values = params
+        return self._pattern % tuple(
+            [format(values[i], spec) if spec else values[i] for i, spec in self._slots]
+        )
+
+    def explanation(self, params: Tuple[int, int], answer) -> str:
+        return f"Answer: {answer}"
+
+    def __repr__(self) -> str:
+        return (
+            f"WordTemplate({self.operation!r}, {self.template!r}, "
+            f"{len(self)} problems)"
+        )
+
+
+def compile_word_templates(
+    templates: Iterable[Mapping[str, Any]], max_num: int
+) -> Tuple[WordTemplate, ...]:
+    """Compile templates for one number range, dropping infeasible ones
+
+    Args:
+        templates: Template entries, e.g. from get_word_problem_templates()
+        max_num: Largest number of the age group
+
+    Returns:
+        Compiled templates that can produce at least one problem
+    """
+    compiled: List[WordTemplate] = []
+    for template_data in templates:
+        template = WordTemplate(template_data, max_num)
+        if len(template):
+            compiled.append(template)
+    return tuple(compiled)
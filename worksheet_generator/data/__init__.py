@@ -2,6 +2,30 @@
 Data loading and management utilities.
 """
 
-from .data_loader import DataSourceLoader, data_loader
+from .data_loader import (
+    DataSourceLoader,
+    LoaderRegistry,
+    data_loader,
+    get_loader,
+    loader_registry,
+)
+from .frozen import FrozenDict, freeze
+from .history_store import HistoryScope, QuestionHistory
+from .jsonl_bank import JSONLContentBank, convert_json_to_jsonl, convert_story_files
+from .sqlite_store import SQLiteContentStore
 
-__all__ = ["DataSourceLoader", "data_loader"]
+__all__ = [
+    "DataSourceLoader",
+    "data_loader",
+    "LoaderRegistry",
+    "loader_registry",
+    "get_loader",
+    "FrozenDict",
+    "freeze",
+    "JSONLContentBank",
+    "convert_json_to_jsonl",
+    "convert_story_files",
+    "SQLiteContentStore",
+    "QuestionHistory",
+    "HistoryScope",
+]
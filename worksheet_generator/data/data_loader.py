@@ -7,69 +7,486 @@ Loads content templates and configurations from JSON files
 import json
 import os
 import glob
-from typing import Dict, List, Any
+import hashlib
+import gc
+import marshal
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 import random
 
+from .frozen import FrozenDict, freeze
+from .jsonl_bank import JSONLContentBank
+
+
+# Bundled content bank, resolved relative to the package rather than the CWD
+DEFAULT_DATA_SOURCE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data_source",
+)
+
+# Content subdirectory for each subject under the data_source directory
+SUBJECT_DIRECTORIES = {
+    "math": "math_source",
+    "logic": "logic_source",
+    "reading": "reading_source",
+}
+
+# Pre-parsed content snapshot written inside the data_source directory
+SNAPSHOT_FILENAME = ".content_snapshot.bin"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Operations whose word problem templates take the {a}/{b} or {total}/{b} form
+WORD_PROBLEM_OPERATIONS = ("addition", "subtraction", "multiplication", "division")
+
+# Age group each story level is written for
+STORY_AGE_GROUPS = {
+    "simple": "4-5",
+    "intermediate": "6-7",
+    "advanced": "8-10",
+}
+
+# Per-age category names used by the logic source files
+PATTERN_CATEGORIES = {
+    "4-5": "simple_patterns",
+    "6-7": "intermediate_patterns",
+    "8-10": "advanced_patterns",
+}
+CLASSIFICATION_CATEGORIES = {
+    "4-5": "simple_categories",
+    "6-7": "intermediate_categories",
+    "8-10": "advanced_categories",
+}
+REASONING_CATEGORIES = {
+    "4-5": "simple_logic",
+    "6-7": "simple_deduction",
+    "8-10": "complex_reasoning",
+}
+
+# Derived index name -> (subject, source_name) it is built from
+INDEX_DEPENDENCIES = {
+    "word_problems": ("math", "word_problems"),
+}
 
-class DataSourceLoader:
-    """Utility class to load and manage content from data_source folder"""
 
-    def __init__(self, data_source_path: str = "data_source"):
+class DataSourceLoader:
+    """Utility class to load and manage content from data_source folder
+
+    Content is loaded lazily: nothing is read from disk until a subject (or a
+    single file within it) is first requested. Long-running processes can call
+    ``preload()`` to pay the loading cost up front.
+
+    With ``use_snapshot=True`` the whole content bank is read from a single
+    pre-parsed snapshot file instead of parsing every JSON file. The snapshot
+    is validated against the source files' mtimes, sizes and content hashes and
+    is rebuilt transparently whenever it is missing or stale.
+
+    An optional ``SQLiteContentStore`` can serve the reading and logic item
+    banks (stories, vocabulary, sentences, patterns, classification and
+    reasoning) instead of the in-memory JSON content.
+
+    Story banks can also be stored as JSON Lines (``<type>_stories.jsonl``
+    with a sidecar offset index, see ``jsonl_bank``). Stories are then read
+    one line at a time by byte offset, optionally through ``mmap``, so large
+    banks are sampled without loading the whole file.
+
+    ``freeze()`` / ``prepare_for_fork()`` turn the content into immutable
+    structures that forked worker processes can share.
+    """
+
+    def __init__(
+        self,
+        data_source_path: Optional[str] = None,
+        use_snapshot: bool = False,
+        store=None,
+        use_mmap: bool = False,
+    ):
         """Initialize the data loader
 
         Args:
-            data_source_path: Path to the data_source directory
+            data_source_path: Path to the data_source directory (defaults to
+                the content bank shipped next to the package)
+            use_snapshot: Load content through the compiled snapshot file
+            store: Optional SQLiteContentStore serving reading and logic items
+            use_mmap: Read JSONL story banks through a memory map
         """
-        self.data_source_path = data_source_path
+        self.data_source_path = data_source_path or DEFAULT_DATA_SOURCE_PATH
+        self.use_snapshot = use_snapshot
+        self.store = store
+        self.use_mmap = use_mmap
+        self.frozen = False
         self._cache = {}
+        # subject -> {source_name: json_file_path}, discovered on first access
+        self._source_files = {}
+        self._snapshot_loaded = False
+        # (subject, source_name) -> (mtime_ns, size) of each loaded file
+        self._file_stats = {}
+        # Derived, immutable query indexes built once from the loaded content
+        self._indexes = {}
+        # story source name -> JSONLContentBank, or None if there is no .jsonl
+        self._story_banks = {}
+        # Bumped by every reload that changes content (see content_version)
+        self._version = 0
+        self._lock = threading.RLock()
+
+    @property
+    def content_version(self) -> Tuple[int, int]:
+        """Changes whenever a reload (or a store import) changes the content
+
+        Callers caching values derived from the content can compare this
+        instead of re-reading it.
+        """
+        store_version = self.store.version if self.store is not None else 0
+        return self._version, store_version
+
+    def preload(self):
+        """Eagerly load every subject and file (useful for long-running servers)
+
+        Returns:
+            The loader itself, so ``DataSourceLoader(path).preload()`` can be chained
+        """
         self._load_all_sources()
+        return self
 
     def _load_all_sources(self):
         """Load all JSON files from the data_source directory"""
         print("📁 Loading data sources...")
 
-        # Load math sources
-        math_path = os.path.join(self.data_source_path, "math_source")
-        self._cache["math"] = self._load_source_directory(math_path)
+        if self.use_snapshot:
+            self._load_from_snapshot()
+        else:
+            for subject in SUBJECT_DIRECTORIES:
+                self._load_subject(subject)
 
-        # Load logic sources
-        logic_path = os.path.join(self.data_source_path, "logic_source")
-        self._cache["logic"] = self._load_source_directory(logic_path)
+        print(f"✅ Loaded data sources: {list(self._cache.keys())}")
 
-        # Load reading sources
-        reading_path = os.path.join(self.data_source_path, "reading_source")
-        self._cache["reading"] = self._load_source_directory(reading_path)
+    @property
+    def snapshot_path(self) -> str:
+        """Path of the compiled content snapshot for this data source"""
+        return os.path.join(self.data_source_path, SNAPSHOT_FILENAME)
 
-        print(f"✅ Loaded data sources: {list(self._cache.keys())}")
+    def _source_manifest(self) -> Dict[str, Dict[str, int]]:
+        """Stat every source file without reading it
 
-    def _load_source_directory(self, directory_path: str) -> Dict[str, Any]:
-        """Load all JSON files from a directory
+        Returns:
+            Dict mapping "subject/source_name" to its mtime (ns) and size
+        """
+        manifest = {}
+        for subject in SUBJECT_DIRECTORIES:
+            for source_name, json_file in self._discover_subject_files(subject).items():
+                stat = os.stat(json_file)
+                manifest[f"{subject}/{source_name}"] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                }
+        return manifest
+
+    def _file_digest(self, key: str) -> str:
+        """Compute the content hash of a source file
 
         Args:
-            directory_path: Path to the source directory
+            key: Manifest key in the form "subject/source_name"
 
         Returns:
-            Dict containing all loaded JSON data
+            Hex SHA-256 digest of the file contents
         """
-        sources = {}
+        subject, source_name = key.split("/", 1)
+        json_file = self._discover_subject_files(subject)[source_name]
+        with open(json_file, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
 
-        if not os.path.exists(directory_path):
-            print(f"⚠️  Directory not found: {directory_path}")
-            return sources
+    def compile_snapshot(self) -> str:
+        """Parse every JSON source and write them as one pre-parsed snapshot
+
+        The snapshot is written atomically, so concurrent readers never see a
+        partially written file.
+
+        Returns:
+            Path of the written snapshot file
+        """
+        with self._lock:
+            self._source_files.clear()
+            manifest = self._source_manifest()
+            content = {}
+            for key in manifest:
+                subject, source_name = key.split("/", 1)
+                json_file = self._source_files[subject][source_name]
+                with open(json_file, "rb") as f:
+                    raw = f.read()
+                manifest[key]["sha256"] = hashlib.sha256(raw).hexdigest()
+                try:
+                    data = json.loads(raw.decode("utf-8"))
+                except ValueError as e:
+                    print(f"  ❌ Failed to load {json_file}: {e}")
+                    data = {}
+                content.setdefault(subject, {})[source_name] = data
+
+            self._write_snapshot(manifest, content)
+            return self.snapshot_path
+
+    def _write_snapshot(self, manifest: Dict[str, Dict], content: Dict[str, Any]):
+        """Atomically write the snapshot file
+
+        Args:
+            manifest: Per-file mtime, size and hash of the sources
+            content: Parsed content keyed by subject and source name
+        """
+        snapshot = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            # marshal's format is tied to the interpreter version
+            "python": tuple(sys.version_info[:2]),
+            "files": manifest,
+            "content": content,
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.data_source_path, prefix=SNAPSHOT_FILENAME, suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(marshal.dumps(snapshot))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"  ⚠️  Could not write content snapshot: {e}")
+
+    def _read_valid_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Read the snapshot if it still matches the source files
+
+        Files whose mtime or size changed are re-hashed; the snapshot remains
+        valid when their content is unchanged (e.g. after a fresh checkout).
+
+        Returns:
+            The snapshot (manifest and content), or None if missing or stale
+        """
+        gc_was_enabled = gc.isenabled()
+        # The snapshot is one large allocation burst of acyclic containers;
+        # pausing the cyclic GC avoids repeated useless collections
+        gc.disable()
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != SNAPSHOT_FORMAT_VERSION
+            or snapshot.get("python") != tuple(sys.version_info[:2])
+        ):
+            return None
+
+        recorded = snapshot["files"]
+        current = self._source_manifest()
+        if set(recorded) != set(current):
+            return None
+
+        touched = False
+        for key, stat in current.items():
+            entry = recorded[key]
+            if entry["mtime_ns"] == stat["mtime_ns"] and entry["size"] == stat["size"]:
+                continue
+            if entry["size"] != stat["size"] or entry["sha256"] != self._file_digest(key):
+                return None
+            entry["mtime_ns"] = stat["mtime_ns"]
+            touched = True
+
+        if touched:
+            # Content is unchanged; refresh the mtimes so the next start is fast
+            self._write_snapshot(recorded, snapshot["content"])
+
+        return snapshot
+
+    def _load_from_snapshot(self):
+        """Populate the cache from the snapshot, rebuilding it when stale"""
+        with self._lock:
+            if self._snapshot_loaded:
+                return
+
+            snapshot = self._read_valid_snapshot()
+            if snapshot is None:
+                self.compile_snapshot()
+                snapshot = self._read_valid_snapshot()
+
+            if snapshot is None:
+                # Snapshot could not be written (e.g. read-only data directory)
+                for subject in SUBJECT_DIRECTORIES:
+                    self._load_subject(subject)
+            else:
+                for subject, sources in snapshot["content"].items():
+                    self._cache.setdefault(subject, {}).update(
+                        (name, self._prepare_content(data)) for name, data in sources.items()
+                    )
+                for key, entry in snapshot["files"].items():
+                    subject, source_name = key.split("/", 1)
+                    self._file_stats[(subject, source_name)] = (
+                        entry["mtime_ns"],
+                        entry["size"],
+                    )
+
+            self._snapshot_loaded = True
+
+    def _discover_subject_files(self, subject: str) -> Dict[str, str]:
+        """Find the JSON files available for a subject without reading them
+
+        Args:
+            subject: Subject name (math, logic, reading)
+
+        Returns:
+            Dict mapping source name (file name without .json) to file path
+        """
+        files = self._source_files.get(subject)
+        if files is not None:
+            return files
 
-        json_files = glob.glob(os.path.join(directory_path, "*.json"))
+        with self._lock:
+            files = self._source_files.get(subject)
+            if files is None:
+                files = self._scan_subject_directory(subject)
+                self._source_files[subject] = files
+        return files
+
+    def _scan_subject_directory(self, subject: str, warn: bool = True) -> Dict[str, str]:
+        """List the JSON files currently present in a subject directory
+
+        Args:
+            subject: Subject name (math, logic, reading)
+            warn: Print a warning if the directory does not exist
+
+        Returns:
+            Dict mapping source name (file name without .json) to file path
+        """
+        directory_path = os.path.join(self.data_source_path, SUBJECT_DIRECTORIES[subject])
+        files = {}
+        if not os.path.exists(directory_path):
+            if warn:
+                print(f"⚠️  Directory not found: {directory_path}")
+            return files
 
-        for json_file in json_files:
+        for json_file in sorted(glob.glob(os.path.join(directory_path, "*.json"))):
             filename = os.path.basename(json_file).replace(".json", "")
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    sources[filename] = data
-                    print(f"  📄 Loaded {filename}.json")
-            except Exception as e:
-                print(f"  ❌ Failed to load {json_file}: {e}")
+            files[filename] = json_file
+        return files
+
+    def _load_subject(self, subject: str) -> Dict[str, Any]:
+        """Load every file of a subject that has not been loaded yet
 
-        return sources
+        Args:
+            subject: Subject name (math, logic, reading)
+
+        Returns:
+            Dict containing all loaded JSON data for the subject
+        """
+        for source_name in self._discover_subject_files(subject):
+            self._load_source(subject, source_name)
+        return self._cache.get(subject, {})
+
+    def _load_source(self, subject: str, source_name: str) -> Dict[str, Any]:
+        """Load a single source file on first access
+
+        Args:
+            subject: Subject name (math, logic, reading)
+            source_name: Source file name (without .json)
+
+        Returns:
+            Loaded JSON data, or an empty dict if the file is missing or invalid
+        """
+        sources = self._cache.get(subject)
+        if sources is not None and source_name in sources:
+            return sources[source_name]
+
+        json_file = self._discover_subject_files(subject).get(source_name)
+        if json_file is None:
+            return {}
+
+        with self._lock:
+            sources = self._cache.setdefault(subject, {})
+            if source_name not in sources:
+                # Stat before reading so a concurrent edit is caught by the next reload
+                self._file_stats[(subject, source_name)] = _stat_signature(json_file)
+                sources[source_name] = self._load_json_file(json_file)
+            return sources[source_name]
+
+    def _load_json_file(self, json_file: str) -> Dict[str, Any]:
+        """Parse a single JSON file
+
+        Args:
+            json_file: Path to the JSON file
+
+        Returns:
+            Parsed JSON data, or an empty dict if the file could not be loaded
+        """
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                return self._prepare_content(json.load(f))
+        except Exception as e:
+            print(f"  ❌ Failed to load {json_file}: {e}")
+            return {}
+
+    def _prepare_content(self, data: Any) -> Any:
+        """Freeze newly loaded content when the loader is frozen"""
+        return freeze(data) if self.frozen else data
+
+    def freeze(self):
+        """Load all content and convert it to immutable structures
+
+        After freezing, every dict in the content is a read-only FrozenDict and
+        every list a tuple; content loaded later (lazily or by a reload) is
+        frozen as well. Generators only read content, so frozen content can be
+        shared safely between threads and forked processes.
+
+        Returns:
+            The loader itself
+        """
+        with self._lock:
+            self.frozen = True
+            for subject in SUBJECT_DIRECTORIES:
+                sources = self._get_source(subject)
+                self._cache[subject] = {
+                    name: freeze(data) for name, data in sources.items()
+                }
+            # Indexes built before freezing point at the old mutable content
+            self._indexes.clear()
+        return self
+
+    def prepare_for_fork(self):
+        """Freeze content and build indexes so forked workers can share them
+
+        Call this in the parent process before creating a fork-based process
+        pool. All content is loaded, frozen and indexed up front, and the
+        objects are moved out of the cyclic garbage collector's reach with
+        gc.freeze(). Collections in the workers then never write to these
+        objects, which keeps their memory pages shared copy-on-write instead
+        of being duplicated in every worker.
+
+        Returns:
+            The loader itself
+        """
+        self.freeze()
+        self._get_index("word_problems", self._build_word_problem_index)
+        gc.collect()
+        gc.freeze()
+        return self
+
+    def _get_source(self, subject: str, source_name: str = None) -> Dict[str, Any]:
+        """Get source data for a subject, loading it on first access
+
+        Args:
+            subject: Subject name (math, logic, reading)
+            source_name: Specific source file name (without .json), or None for all
+
+        Returns:
+            Source data for the subject
+        """
+        if self.use_snapshot and not self._snapshot_loaded:
+            self._load_from_snapshot()
+        if source_name:
+            return self._load_source(subject, source_name)
+        return self._load_subject(subject)
 
     def get_math_source(self, source_name: str = None) -> Dict[str, Any]:
         """Get math source data
@@ -80,9 +497,7 @@ class DataSourceLoader:
         Returns:
             Math source data
         """
-        if source_name:
-            return self._cache.get("math", {}).get(source_name, {})
-        return self._cache.get("math", {})
+        return self._get_source("math", source_name)
 
     def get_logic_source(self, source_name: str = None) -> Dict[str, Any]:
         """Get logic source data
@@ -93,9 +508,7 @@ class DataSourceLoader:
         Returns:
             Logic source data
         """
-        if source_name:
-            return self._cache.get("logic", {}).get(source_name, {})
-        return self._cache.get("logic", {})
+        return self._get_source("logic", source_name)
 
     def get_reading_source(self, source_name: str = None) -> Dict[str, Any]:
         """Get reading source data
@@ -106,9 +519,7 @@ class DataSourceLoader:
         Returns:
             Reading source data
         """
-        if source_name:
-            return self._cache.get("reading", {}).get(source_name, {})
-        return self._cache.get("reading", {})
+        return self._get_source("reading", source_name)
 
     def get_word_problems(self, operation: str, age_group: str) -> List[Dict[str, Any]]:
         """Get word problems for a specific operation and age group
@@ -120,16 +531,86 @@ class DataSourceLoader:
         Returns:
             List of matching word problem templates
         """
-        word_problems = self.get_math_source("word_problems")
-        problems = word_problems.get("word_problems", {}).get(operation, [])
+        return list(self.get_word_problem_templates(age_group, operation))
+
+    def _get_index(self, name: str, builder) -> Any:
+        """Return a derived index, building it on first use
+
+        Args:
+            name: Index name
+            builder: Callable that builds the index from the loaded content
+
+        Returns:
+            The cached index
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(name)
+                if index is None:
+                    index = builder()
+                    self._indexes[name] = index
+        return index
+
+    def _build_word_problem_index(self) -> Dict[str, Any]:
+        """Index word problem templates by age group and operation
+
+        Every template is copied once with its operation attached and exposed
+        read-only, so callers never mutate the shared source data.
+
+        Returns:
+            Dict with "by_operation" (age group -> operation -> tuple of
+            templates) and "all" (age group -> tuple of templates for the
+            basic operations, in WORD_PROBLEM_OPERATIONS order)
+        """
+        word_problems = self.get_math_source("word_problems").get("word_problems", {})
+
+        by_operation = {}
+        for operation, templates in word_problems.items():
+            for template in templates:
+                entry = freeze({**template, "operation": operation})
+                for age_group in template.get("age_groups", []):
+                    by_operation.setdefault(age_group, {}).setdefault(
+                        operation, []
+                    ).append(entry)
+
+        all_templates = {}
+        for age_group, operations in by_operation.items():
+            all_templates[age_group] = tuple(
+                entry
+                for operation in WORD_PROBLEM_OPERATIONS
+                for entry in operations.get(operation, ())
+            )
+
+        return {
+            "by_operation": {
+                age_group: FrozenDict(
+                    {operation: tuple(entries) for operation, entries in operations.items()}
+                )
+                for age_group, operations in by_operation.items()
+            },
+            "all": all_templates,
+        }
+
+    def get_word_problem_templates(
+        self, age_group: str, operation: str = None
+    ) -> Tuple[Mapping[str, Any], ...]:
+        """Get read-only word problem templates for an age group
+
+        Templates carry their "operation" and are served from an index built
+        once, so repeated calls cost a couple of dict lookups.
 
-        # Filter by age group
-        filtered_problems = []
-        for problem in problems:
-            if age_group in problem.get("age_groups", []):
-                filtered_problems.append(problem)
+        Args:
+            age_group: Target age group (4-5, 6-7, 8-10)
+            operation: Math operation, or None for all basic operations
 
-        return filtered_problems
+        Returns:
+            Tuple of read-only template mappings
+        """
+        index = self._get_index("word_problems", self._build_word_problem_index)
+        if operation is None:
+            return index["all"].get(age_group, ())
+        return index["by_operation"].get(age_group, {}).get(operation, ())
 
     def get_operation_settings(self, age_group: str) -> Dict[str, Any]:
         """Get operation settings for an age group
@@ -166,14 +647,74 @@ class DataSourceLoader:
 
         return combined_settings
 
+    def _select_items(
+        self,
+        subject: str,
+        age_group: str,
+        item_type: str,
+        load_items,
+        sample: Optional[int],
+        rng: Optional[random.Random] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return all items, or a random sample, from the active backend
+
+        Args:
+            subject: Subject name (logic, reading)
+            age_group: Age group key the items are stored under
+            item_type: Item type within the subject
+            load_items: Callable returning the full item list from JSON
+            sample: Number of items to draw with replacement, or None for all
+            rng: Random generator for the sample (defaults to the random module)
+
+        Returns:
+            List of items
+        """
+        if self.store is not None:
+            if sample is None:
+                return self.store.get_items(subject, age_group, item_type)
+            return self.store.sample(subject, age_group, item_type, sample, rng)
+
+        items = load_items()
+        if sample is None:
+            return items
+        rng = rng or random
+        return [rng.choice(items) for _ in range(sample)] if items else []
+
+    def _story_bank_path(self, story_source_name: str) -> str:
+        return os.path.join(
+            self.data_source_path,
+            SUBJECT_DIRECTORIES["reading"],
+            f"{story_source_name}.jsonl",
+        )
+
+    def _get_story_bank(self, story_source_name: str) -> Optional[JSONLContentBank]:
+        """Open the JSONL bank for a story file, or None if it has no .jsonl"""
+        if story_source_name in self._story_banks:
+            return self._story_banks[story_source_name]
+
+        with self._lock:
+            if story_source_name not in self._story_banks:
+                path = self._story_bank_path(story_source_name)
+                bank = None
+                if os.path.exists(path):
+                    bank = JSONLContentBank(path, use_mmap=self.use_mmap)
+                self._story_banks[story_source_name] = bank
+            return self._story_banks[story_source_name]
+
     def get_stories(
-        self, age_group: str, story_type: str = None
+        self,
+        age_group: str,
+        story_type: str = None,
+        sample: int = None,
+        rng: Optional[random.Random] = None,
     ) -> List[Dict[str, Any]]:
         """Get stories for a specific age group
 
         Args:
             age_group: Target age group (4-5, 6-7, 8-10)
             story_type: Type of stories (simple, intermediate, advanced) or None for auto-detect
+            sample: Number of random stories to draw (with replacement), or None for all
+            rng: Random generator for the sample (defaults to the random module)
 
         Returns:
             List of stories suitable for the age group
@@ -188,101 +729,299 @@ class DataSourceLoader:
                 story_type = "advanced"
 
         story_source_name = f"{story_type}_stories"
-        stories_data = self.get_reading_source(story_source_name)
 
-        # Handle different JSON structures
-        if story_type + "_stories" in stories_data:
-            return stories_data[story_type + "_stories"]
-        elif "stories" in stories_data:
-            return stories_data["stories"]
-        else:
-            return list(stories_data.values())[0] if stories_data else []
+        bank = self._get_story_bank(story_source_name) if self.store is None else None
+        if bank is not None:
+            stories = bank.get_items() if sample is None else bank.sample(sample, rng)
+            return [self._prepare_content(story) for story in stories]
+
+        def load_stories():
+            stories_data = self.get_reading_source(story_source_name)
+
+            # Handle different JSON structures
+            if story_source_name in stories_data:
+                return stories_data[story_source_name]
+            elif "stories" in stories_data:
+                return stories_data["stories"]
+            else:
+                return list(stories_data.values())[0] if stories_data else []
+
+        return self._select_items(
+            "reading",
+            STORY_AGE_GROUPS.get(story_type, story_type),
+            story_source_name,
+            load_stories,
+            sample,
+            rng,
+        )
 
-    def get_vocabulary_exercises(self, age_group: str) -> List[Dict[str, Any]]:
+    def get_vocabulary_exercises(
+        self, age_group: str, sample: int = None, rng: Optional[random.Random] = None
+    ) -> List[Dict[str, Any]]:
         """Get vocabulary exercises for an age group
 
         Args:
             age_group: Target age group (4-5, 6-7, 8-10)
+            sample: Number of random exercises to draw (with replacement), or None for all
+            rng: Random generator for the sample (defaults to the random module)
 
         Returns:
             List of vocabulary exercises
         """
-        vocab_data = self.get_reading_source("vocabulary_exercises")
-        return vocab_data.get("vocabulary_exercises", {}).get(age_group, [])
+        return self._select_items(
+            "reading",
+            age_group,
+            "vocabulary_exercises",
+            lambda: self.get_reading_source("vocabulary_exercises")
+            .get("vocabulary_exercises", {})
+            .get(age_group, []),
+            sample,
+            rng,
+        )
 
-    def get_sentence_building_exercises(self, age_group: str) -> List[Dict[str, Any]]:
+    def get_sentence_building_exercises(
+        self, age_group: str, sample: int = None, rng: Optional[random.Random] = None
+    ) -> List[Dict[str, Any]]:
         """Get sentence building exercises for an age group
 
         Args:
             age_group: Target age group (4-5, 6-7, 8-10)
+            sample: Number of random exercises to draw (with replacement), or None for all
+            rng: Random generator for the sample (defaults to the random module)
 
         Returns:
             List of sentence building exercises
         """
-        vocab_data = self.get_reading_source("vocabulary_exercises")
-        return vocab_data.get("sentence_building", {}).get(age_group, [])
+        return self._select_items(
+            "reading",
+            age_group,
+            "sentence_building",
+            lambda: self.get_reading_source("vocabulary_exercises")
+            .get("sentence_building", {})
+            .get(age_group, []),
+            sample,
+            rng,
+        )
+
+    def _get_leveled_items(
+        self,
+        source_name: str,
+        top_key: str,
+        categories: Dict[str, str],
+        age_group: str,
+        sample: Optional[int],
+        rng: Optional[random.Random] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get logic items stored per age group under a level-specific category
+
+        Unknown age groups fall back to the 8-10 content, as before.
+        """
+        age_key = age_group if age_group in categories else "8-10"
+        category = categories[age_key]
+        return self._select_items(
+            "logic",
+            age_key,
+            category,
+            lambda: self.get_logic_source(source_name)
+            .get(top_key, {})
+            .get(age_key, {})
+            .get(category, []),
+            sample,
+            rng,
+        )
 
-    def get_pattern_templates(self, age_group: str) -> List[Dict[str, Any]]:
+    def get_pattern_templates(
+        self, age_group: str, sample: int = None, rng: Optional[random.Random] = None
+    ) -> List[Dict[str, Any]]:
         """Get pattern templates for an age group
 
         Args:
             age_group: Target age group (4-5, 6-7, 8-10)
+            sample: Number of random templates to draw (with replacement), or None for all
+            rng: Random generator for the sample (defaults to the random module)
 
         Returns:
             List of pattern templates
         """
-        patterns_data = self.get_logic_source("patterns")
-        pattern_templates = patterns_data.get("pattern_templates", {})
-
-        if age_group == "4-5":
-            return pattern_templates.get("4-5", {}).get("simple_patterns", [])
-        elif age_group == "6-7":
-            return pattern_templates.get("6-7", {}).get("intermediate_patterns", [])
-        else:  # 8-10
-            return pattern_templates.get("8-10", {}).get("advanced_patterns", [])
+        return self._get_leveled_items(
+            "patterns",
+            "pattern_templates",
+            PATTERN_CATEGORIES,
+            age_group,
+            sample,
+            rng,
+        )
 
-    def get_classification_problems(self, age_group: str) -> List[Dict[str, Any]]:
+    def get_classification_problems(
+        self, age_group: str, sample: int = None, rng: Optional[random.Random] = None
+    ) -> List[Dict[str, Any]]:
         """Get classification problems for an age group
 
         Args:
             age_group: Target age group (4-5, 6-7, 8-10)
+            sample: Number of random problems to draw (with replacement), or None for all
+            rng: Random generator for the sample (defaults to the random module)
 
         Returns:
             List of classification problems
         """
-        classification_data = self.get_logic_source("classification")
-        problems = classification_data.get("classification_problems", {})
-
-        if age_group == "4-5":
-            return problems.get("4-5", {}).get("simple_categories", [])
-        elif age_group == "6-7":
-            return problems.get("6-7", {}).get("intermediate_categories", [])
-        else:  # 8-10
-            return problems.get("8-10", {}).get("advanced_categories", [])
+        return self._get_leveled_items(
+            "classification",
+            "classification_problems",
+            CLASSIFICATION_CATEGORIES,
+            age_group,
+            sample,
+            rng,
+        )
 
-    def get_reasoning_problems(self, age_group: str) -> List[Dict[str, Any]]:
+    def get_reasoning_problems(
+        self, age_group: str, sample: int = None, rng: Optional[random.Random] = None
+    ) -> List[Dict[str, Any]]:
         """Get reasoning problems for an age group
 
         Args:
             age_group: Target age group (4-5, 6-7, 8-10)
+            sample: Number of random problems to draw (with replacement), or None for all
+            rng: Random generator for the sample (defaults to the random module)
 
         Returns:
             List of reasoning problems
         """
-        reasoning_data = self.get_logic_source("reasoning")
-        problems = reasoning_data.get("reasoning_problems", {})
+        return self._get_leveled_items(
+            "reasoning",
+            "reasoning_problems",
+            REASONING_CATEGORIES,
+            age_group,
+            sample,
+            rng,
+        )
 
-        if age_group == "4-5":
-            return problems.get("4-5", {}).get("simple_logic", [])
-        elif age_group == "6-7":
-            return problems.get("6-7", {}).get("simple_deduction", [])
-        else:  # 8-10
-            return problems.get("8-10", {}).get("complex_reasoning", [])
+    def reload_sources(self, incremental: bool = False):
+        """Reload data sources from files
 
-    def reload_sources(self):
-        """Reload all data sources from files"""
-        self._cache.clear()
-        self._load_all_sources()
+        Args:
+            incremental: Only re-parse files whose mtime or size changed
+                (see reload_changed_sources) instead of reloading everything
+
+        Returns:
+            List of changed "subject/source_name" keys when incremental
+        """
+        if incremental:
+            return self.reload_changed_sources()
+
+        with self._lock:
+            self._cache.clear()
+            self._source_files.clear()
+            self._file_stats.clear()
+            self._snapshot_loaded = False
+            self._indexes.clear()
+            self._story_banks.clear()
+            self._version += 1
+            self._load_all_sources()
+
+    def reload_changed_sources(self) -> List[str]:
+        """Re-parse only the source files that changed on disk
+
+        Every known file is stat'ed; files whose mtime or size changed are
+        parsed again, and files that appeared or disappeared are picked up.
+        Each affected subject gets a new dict swapped in with one assignment,
+        so callers holding previously returned content keep a consistent
+        view, and only the indexes built from changed files are dropped.
+
+        Returns:
+            List of changed "subject/source_name" keys
+        """
+        changed = []
+        with self._lock:
+            for subject in SUBJECT_DIRECTORIES:
+                if subject not in self._source_files:
+                    # Never accessed: it will be discovered lazily anyway
+                    continue
+
+                current_files = self._scan_subject_directory(subject, warn=False)
+                old_sources = self._cache.get(subject, {})
+                new_sources = dict(old_sources)
+                subject_changed = []
+
+                for source_name in set(old_sources) - set(current_files):
+                    del new_sources[source_name]
+                    self._file_stats.pop((subject, source_name), None)
+                    subject_changed.append(source_name)
+
+                for source_name, json_file in current_files.items():
+                    if source_name not in old_sources:
+                        if source_name not in self._source_files[subject]:
+                            subject_changed.append(source_name)
+                        continue
+                    try:
+                        signature = _stat_signature(json_file)
+                    except OSError:
+                        continue
+                    if signature == self._file_stats.get((subject, source_name)):
+                        continue
+                    self._file_stats[(subject, source_name)] = signature
+                    new_sources[source_name] = self._load_json_file(json_file)
+                    subject_changed.append(source_name)
+
+                self._source_files[subject] = current_files
+                if subject_changed:
+                    self._cache[subject] = new_sources
+                    changed.extend(f"{subject}/{name}" for name in sorted(subject_changed))
+
+            changed.extend(self._drop_changed_story_banks())
+            self._invalidate_indexes(changed)
+            if changed:
+                self._version += 1
+
+        return changed
+
+    def _drop_changed_story_banks(self) -> List[str]:
+        """Forget JSONL story banks that changed, appeared or disappeared
+
+        Banks are reopened (and their index revalidated) on next access.
+        Dropped banks are not closed here, so readers still using them finish
+        safely; each bank releases its file and memory map once the last
+        reader lets go of it.
+
+        Returns:
+            List of changed "reading/<name>.jsonl" keys
+        """
+        changed = []
+        for story_source_name, bank in list(self._story_banks.items()):
+            try:
+                signature = _stat_signature(self._story_bank_path(story_source_name))
+            except OSError:
+                signature = None
+            current = bank.signature if bank is not None else None
+            if signature != current:
+                del self._story_banks[story_source_name]
+                changed.append(f"reading/{story_source_name}.jsonl")
+        return sorted(changed)
+
+    def _invalidate_indexes(self, changed: List[str]):
+        """Drop the derived indexes built from any of the changed sources
+
+        Args:
+            changed: List of "subject/source_name" keys
+        """
+        changed_sources = {tuple(key.split("/", 1)) for key in changed}
+        for name, dependency in INDEX_DEPENDENCIES.items():
+            if dependency in changed_sources:
+                self._indexes.pop(name, None)
+
+    def start_watching(self, interval: float = 2.0, on_reload=None) -> "ContentWatcher":
+        """Start a background thread that polls for changed content files
+
+        Args:
+            interval: Seconds between polls
+            on_reload: Optional callback receiving the list of changed keys
+
+        Returns:
+            The running ContentWatcher; call stop() to end it
+        """
+        watcher = ContentWatcher(self, interval=interval, on_reload=on_reload)
+        watcher.start()
+        return watcher
 
     def get_random_item(self, items: List[Any]) -> Any:
         """Get a random item from a list
@@ -298,11 +1037,13 @@ class DataSourceLoader:
     def get_cache_info(self) -> Dict[str, Any]:
         """Get information about loaded cache
 
+        Only subjects and files that have actually been loaded are reported.
+
         Returns:
             Dictionary with cache statistics
         """
         info = {}
-        for subject, sources in self._cache.items():
+        for subject, sources in list(self._cache.items()):
             info[subject] = {
                 "source_files": list(sources.keys()),
                 "total_files": len(sources),
@@ -310,5 +1051,117 @@ class DataSourceLoader:
         return info
 
 
-# Global instance for easy access
+def _stat_signature(path: str) -> Tuple[int, int]:
+    """Return the (mtime_ns, size) pair used to detect changed files"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ContentWatcher(threading.Thread):
+    """Daemon thread that polls a DataSourceLoader for changed content files"""
+
+    def __init__(self, loader: DataSourceLoader, interval: float = 2.0, on_reload=None):
+        """Initialize the watcher
+
+        Args:
+            loader: Loader whose content files are watched
+            interval: Seconds between polls
+            on_reload: Optional callback receiving the list of changed keys
+        """
+        super().__init__(name="content-watcher", daemon=True)
+        self.loader = loader
+        self.interval = interval
+        self.on_reload = on_reload
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """Poll until stopped, reloading only the changed files"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                changed = self.loader.reload_changed_sources()
+            except Exception as e:
+                print(f"  ❌ Content reload failed: {e}")
+                continue
+            if changed and self.on_reload is not None:
+                self.on_reload(changed)
+
+    def stop(self, timeout: float = None):
+        """Stop polling and wait for the thread to finish"""
+        self._stop_event.set()
+        self.join(timeout)
+
+
+class LoaderRegistry:
+    """Bounded LRU cache of DataSourceLoaders keyed by content root
+
+    Lets one long-running process serve several content packs (e.g. one per
+    school) without reloading a pack for every request. When more than
+    ``max_loaders`` roots are in use, the least recently used loader is
+    dropped and its content is freed once no generator references it.
+    """
+
+    def __init__(self, max_loaders: int = 8):
+        """Initialize the registry
+
+        Args:
+            max_loaders: Maximum number of content roots kept loaded
+        """
+        if max_loaders < 1:
+            raise ValueError("max_loaders must be at least 1")
+        self.max_loaders = max_loaders
+        self._loaders: "OrderedDict[str, DataSourceLoader]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data_source_path: Optional[str] = None, **options) -> DataSourceLoader:
+        """Return the loader for a content root, creating it on first use
+
+        Args:
+            data_source_path: Path to the data_source directory (defaults to
+                the bundled content bank)
+            **options: DataSourceLoader options (use_snapshot, store, use_mmap), only
+                used when the loader is created
+
+        Returns:
+            The shared loader for that content root
+        """
+        key = os.path.realpath(data_source_path or DEFAULT_DATA_SOURCE_PATH)
+        with self._lock:
+            loader = self._loaders.get(key)
+            if loader is not None:
+                self._loaders.move_to_end(key)
+                return loader
+
+            loader = DataSourceLoader(key, **options)
+            self._loaders[key] = loader
+            while len(self._loaders) > self.max_loaders:
+                self._loaders.popitem(last=False)
+            return loader
+
+    def evict(self, data_source_path: str) -> bool:
+        """Drop the loader for a content root
+
+        Returns:
+            True if a loader was registered for that root
+        """
+        with self._lock:
+            return self._loaders.pop(os.path.realpath(data_source_path), None) is not None
+
+    def roots(self) -> List[str]:
+        """Registered content roots, least recently used first"""
+        with self._lock:
+            return list(self._loaders)
+
+    def __len__(self) -> int:
+        return len(self._loaders)
+
+
+# Global instance for easy access (no files are read until content is requested)
 data_loader = DataSourceLoader()
+
+# Shared registry of per-tenant content roots
+loader_registry = LoaderRegistry()
+
+
+def get_loader(data_source_path: Optional[str] = None, **options) -> DataSourceLoader:
+    """Return the shared loader for a content root from the global registry"""
+    return loader_registry.get(data_source_path, **options)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Immutable content structures for Primary School Worksheet Generator
+Frozen content can be loaded once and shared between forked worker processes
+"""
+
+import sys
+from typing import Any
+
+
+class FrozenDict(dict):
+    """Read-only dict used for frozen content records
+
+    It is still a ``dict`` (so ``isinstance`` checks, ``.get`` and JSON
+    serialisation keep working), but every mutating method raises
+    ``TypeError``. ``copy()`` returns an ordinary, mutable dict.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def copy(self) -> dict:
+        """Return a mutable shallow copy"""
+        return dict(self)
+
+    def __reduce__(self):
+        # The default dict pickling path calls __setitem__, which is disabled
+        return (type(self), (dict(self),))
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert JSON-like content into immutable structures
+
+    dicts become FrozenDicts with interned keys and lists become tuples;
+    everything else is returned unchanged. Already frozen values are reused.
+
+    Args:
+        value: Parsed JSON content
+
+    Returns:
+        Immutable equivalent of value
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict(
+            (sys.intern(key) if isinstance(key, str) else key, freeze(item))
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
@@ -0,0 +1,239 @@
+"""
+Question History Store for Primary School Worksheet Generator
+Remembers which questions each student has seen, across worksheets
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_history (
+    student_id TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (student_id, fingerprint)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS question_history_seen_at
+    ON question_history (seen_at);
+"""
+
+_SECONDS_PER_DAY = 86400
+
+
+def _to_signed(key: int) -> int:
+    """Map an unsigned 64-bit fingerprint to SQLite's signed INTEGER range"""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class QuestionHistory:
+    """Per-student question fingerprints in a single SQLite database file
+
+    Each row is (student ID, question fingerprint, time seen). A student's
+    history is read with one query per worksheet and extended in one
+    transaction once the worksheet has been produced. Two eviction policies
+    keep the file small for large schools:
+
+    - max_age_days: entries older than this are ignored and pruned, so
+      questions can come back after e.g. a school year
+    - max_per_student: only the most recent entries of each student are kept
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_age_days: Optional[float] = None,
+        max_per_student: Optional[int] = None,
+    ):
+        """Open (or create) a history store
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_age_days: Forget questions seen longer ago than this
+            max_per_student: Keep at most this many questions per student
+        """
+        self.db_path = db_path
+        self.max_age_days = max_age_days
+        self.max_per_student = max_per_student
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Close the database connection"""
+        self._connection.close()
+
+    def _cutoff(self, now: float) -> Optional[float]:
+        if self.max_age_days is None:
+            return None
+        return now - self.max_age_days * _SECONDS_PER_DAY
+
+    def load(self, student_id: str) -> Set[int]:
+        """Return the fingerprints a student has already seen (one query)"""
+        query = "SELECT fingerprint FROM question_history WHERE student_id = ?"
+        params = (student_id,)
+        cutoff = self._cutoff(time.time())
+        if cutoff is not None:
+            query += " AND seen_at >= ?"
+            params += (cutoff,)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return {_to_unsigned(row[0]) for row in rows}
+
+    def record(
+        self, student_id: str, fingerprints: Iterable[int], seen_at: Optional[float] = None
+    ) -> int:
+        """Add fingerprints to a student's history in one transaction
+
+        The student's history is pruned by the store's policies in the same
+        transaction, so a failure leaves the history unchanged.
+
+        Args:
+            student_id: Student the worksheet was made for
+            fingerprints: Question fingerprints on the worksheet
+            seen_at: Unix timestamp (defaults to now)
+
+        Returns:
+            Number of fingerprints recorded
+        """
+        now = time.time()
+        seen_at = now if seen_at is None else seen_at
+        rows = [(student_id, _to_signed(key), seen_at) for key in fingerprints]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO question_history (student_id, fingerprint, seen_at) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._prune(student_id, now)
+        return len(rows)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Apply the eviction policies to every student
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock, self._connection:
+            return self._prune(None, time.time() if now is None else now)
+
+    def _prune(self, student_id: Optional[str], now: float) -> int:
+        """Delete entries outside the policies (caller holds the transaction)"""
+        student_filter = "" if student_id is None else "WHERE student_id = ?"
+        params = () if student_id is None else (student_id,)
+        removed = 0
+
+        cutoff = self._cutoff(now)
+        if cutoff is not None:
+            condition = "seen_at < ?" if student_id is None else "student_id = ? AND seen_at < ?"
+            removed += self._connection.execute(
+                f"DELETE FROM question_history WHERE {condition}", params + (cutoff,)
+            ).rowcount
+
+        if self.max_per_student is not None:
+            removed += self._connection.execute(
+                "DELETE FROM question_history WHERE (student_id, fingerprint) IN ("
+                "  SELECT student_id, fingerprint FROM ("
+                "    SELECT student_id, fingerprint, ROW_NUMBER() OVER ("
+                "      PARTITION BY student_id ORDER BY seen_at DESC"
+                f"    ) AS recency FROM question_history {student_filter}"
+                "  ) WHERE recency > ?"
+                ")",
+                params + (self.max_per_student,),
+            ).rowcount
+
+        return removed
+
+    def forget(self, student_id: str) -> int:
+        """Remove a student's whole history
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM question_history WHERE student_id = ?", (student_id,)
+            ).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of students and entries in the store"""
+        with self._lock:
+            students, entries = self._connection.execute(
+                "SELECT COUNT(DISTINCT student_id), COUNT(*) FROM question_history"
+            ).fetchone()
+        return {"students": students, "entries": entries}
+
+    def scope(self, student_id: str, parent=None) -> "HistoryScope":
+        """Load a student's history as a uniqueness scope for their worksheets"""
+        return HistoryScope(self, student_id, parent)
+
+
+class HistoryScope:
+    """Uniqueness scope of one student's worksheet
+
+    Pass it as ``scope`` to the generators (it can wrap a batch scope as
+    ``parent``); questions the student has seen before are then avoided.
+    New questions are kept in memory until commit() writes them to the
+    history, which should happen once the worksheet has been produced.
+    """
+
+    kind = "history"
+
+    def __init__(self, history: QuestionHistory, student_id: str, parent=None):
+        self.history = history
+        self.student_id = student_id
+        self.parent = parent
+        self.seen = history.load(student_id)
+        self.pending: Set[int] = set()
+
+    def add(self, key: int) -> bool:
+        """Record a fingerprint; False if the student has seen it"""
+        if key in self.seen or key in self.pending:
+            return False
+        if self.parent is not None and not self.parent.add(key):
+            return False
+        self.pending.add(key)
+        return True
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.seen or key in self.pending
+
+    def __len__(self) -> int:
+        return len(self.seen) + len(self.pending)
+
+    def commit(self) -> int:
+        """Write the new questions to the student's history
+
+        Returns:
+            Number of fingerprints recorded
+        """
+        recorded = self.history.record(self.student_id, self.pending)
+        self.seen |= self.pending
+        self.pending = set()
+        return recorded
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the scope"""
+        return (
+            sys.getsizeof(self.seen)
+            + sys.getsizeof(self.pending)
+            + len(self) * sys.getsizeof(2**63)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """History size and pending questions of the scope"""
+        return {
+            "kind": self.kind,
+            "student_id": self.student_id,
+            "seen": len(self.seen),
+            "pending": len(self.pending),
+            "memory_bytes": self.memory_bytes,
+        }
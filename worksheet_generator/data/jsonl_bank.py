@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+JSON Lines Content Bank for Primary School Worksheet Generator
+Random access into large item banks through a sidecar byte-offset index
+"""
+
+import glob
+import json
+import mmap
+import os
+import random
+import struct
+import tempfile
+import threading
+import weakref
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"WSJLIDX1"
+# magic, size and mtime_ns of the JSONL file the offsets were computed for
+INDEX_HEADER = struct.Struct("<8sQQ")
+
+
+class JSONLContentBank:
+    """Read-only bank of JSON items stored one per line
+
+    A sidecar ``<file>.jsonl.idx`` holds the byte range of every line, so a
+    single item can be read and parsed without touching the rest of the file.
+    The index is rebuilt automatically when it is missing or was written for
+    a different version of the JSONL file.
+
+    Reads use ``os.pread`` (or slices of a shared ``mmap`` when ``use_mmap``
+    is set), so one bank can be used from several threads, and from forked
+    processes, without a shared file position. The file and memory map are
+    released by close(), or once the bank is no longer referenced.
+    """
+
+    def __init__(self, path: str, use_mmap: bool = False):
+        """Open a JSONL bank
+
+        Args:
+            path: Path to the .jsonl file
+            use_mmap: Map the file into memory instead of reading with pread
+        """
+        self.path = path
+        self.use_mmap = use_mmap
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self._offsets = _load_index(path, self.signature)
+        if self._offsets is None:
+            self._offsets = build_index(path)
+        self._mmap = None
+        if use_mmap and stat.st_size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._lock = threading.Lock()
+        self._release = weakref.finalize(self, _release_handles, self._file, self._mmap)
+
+    def close(self):
+        """Release the file handle and memory map"""
+        with self._lock:
+            self._mmap = None
+            self._release()
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+
+    def _read_line(self, position: int) -> bytes:
+        start = self._offsets[2 * position]
+        end = self._offsets[2 * position + 1]
+        if self._mmap is not None:
+            return self._mmap[start:end]
+        return os.pread(self._file.fileno(), end - start, start)
+
+    def get(self, position: int) -> Dict[str, Any]:
+        """Parse and return the item at a position"""
+        if not 0 <= position < len(self):
+            raise IndexError("JSONL bank index out of range")
+        return json.loads(self._read_line(position))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self.get(position)
+
+    def get_items(self) -> List[Dict[str, Any]]:
+        """Parse and return every item, in file order"""
+        return list(self)
+
+    def sample(self, k: int, rng: random.Random = None) -> List[Dict[str, Any]]:
+        """Draw k random items (with replacement)
+
+        Only the sampled lines are read and parsed.
+
+        Args:
+            k: Number of items to draw
+            rng: Random generator to use (defaults to the random module)
+
+        Returns:
+            List of k items, or an empty list if the bank is empty
+        """
+        total = len(self)
+        if total == 0 or k <= 0:
+            return []
+        rng = rng or random
+        positions = [rng.randrange(total) for _ in range(k)]
+        items = {position: self.get(position) for position in sorted(set(positions))}
+        return [items[position] for position in positions]
+
+
+def _release_handles(file, mapped: Optional[mmap.mmap]):
+    """Close a bank's memory map and file (runs once per bank)"""
+    if mapped is not None:
+        mapped.close()
+    file.close()
+
+
+def _load_index(path: str, signature: Tuple[int, int]) -> Optional[array]:
+    """Read the sidecar offset index, or None if missing or stale"""
+    try:
+        with open(path + INDEX_SUFFIX, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+            payload = f.read()
+    except OSError:
+        return None
+
+    if len(header) != INDEX_HEADER.size:
+        return None
+    magic, size, mtime_ns = INDEX_HEADER.unpack(header)
+    if magic != INDEX_MAGIC or (mtime_ns, size) != signature:
+        return None
+
+    offsets = array("Q")
+    try:
+        offsets.frombytes(payload)
+    except ValueError:
+        return None
+    if len(offsets) % 2 or (offsets and offsets[-1] > size):
+        return None
+    return offsets
+
+
+def build_index(path: str) -> array:
+    """Compute line offsets of a JSONL file and write its sidecar index
+
+    The index stores a (start, end) byte pair for every non-blank line, so
+    item ``i`` spans ``offsets[2 * i]:offsets[2 * i + 1]``.
+
+    Args:
+        path: Path to the .jsonl file
+
+    Returns:
+        The offsets array
+    """
+    offsets = array("Q")
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        position = 0
+        for line in f:
+            if line.strip():
+                offsets.append(position)
+                offsets.append(position + len(line))
+            position += len(line)
+
+    header = INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns)
+    try:
+        _atomic_write(path + INDEX_SUFFIX, header + offsets.tobytes())
+    except OSError as e:
+        # Read-only content directories still work, just without a cached index
+        print(f"  ⚠️ Could not write index for {path}: {e}")
+    return offsets
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write a file through a temporary file and an atomic rename"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _extract_items(source_name: str, data: Any) -> List[Any]:
+    """Return the item list of a JSON content file (story file layout)"""
+    if isinstance(data, list):
+        return data
+    if source_name in data:
+        return data[source_name]
+    if "stories" in data:
+        return data["stories"]
+    lists = [value for value in data.values() if isinstance(value, list)]
+    if len(lists) != 1:
+        raise ValueError(f"Cannot find a single item list in {source_name}.json")
+    return lists[0]
+
+
+def convert_json_to_jsonl(json_path: str, jsonl_path: str = None) -> int:
+    """Convert a JSON item file to JSONL and write its offset index
+
+    Args:
+        json_path: Path to the .json file (e.g. simple_stories.json)
+        jsonl_path: Output path, defaults to the same name with .jsonl
+
+    Returns:
+        Number of converted items
+    """
+    source_name = os.path.splitext(os.path.basename(json_path))[0]
+    jsonl_path = jsonl_path or os.path.splitext(json_path)[0] + ".jsonl"
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        items = _extract_items(source_name, json.load(f))
+
+    lines = [json.dumps(item, ensure_ascii=False) + "\n" for item in items]
+    _atomic_write(jsonl_path, "".join(lines).encode("utf-8"))
+    build_index(jsonl_path)
+    return len(items)
+
+
+def convert_story_files(data_source_path: str) -> Dict[str, int]:
+    """Convert every reading_source/*_stories.json file of a data source
+
+    Args:
+        data_source_path: Path to the data_source directory
+
+    Returns:
+        Mapping of written .jsonl path to number of stories
+    """
+    converted = {}
+    pattern = os.path.join(data_source_path, "reading_source", "*_stories.json")
+    for json_path in sorted(glob.glob(pattern)):
+        jsonl_path = os.path.splitext(json_path)[0] + ".jsonl"
+        converted[jsonl_path] = convert_json_to_jsonl(json_path, jsonl_path)
+    return converted
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+SQLite Content Store for Primary School Worksheet Generator
+Optional backend that keeps large reading and logic content banks on disk
+"""
+
+import glob
+import json
+import os
+import random
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .data_loader import STORY_AGE_GROUPS
+from .jsonl_bank import JSONLContentBank
+
+# Subjects ingested by the importer. Math content is small and
+# configuration-like, so it always stays in the JSON backend.
+STORE_SUBJECTS = {
+    "logic": "logic_source",
+    "reading": "reading_source",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_items (
+    subject TEXT NOT NULL,
+    age_group TEXT NOT NULL,
+    type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (subject, age_group, type, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS content_counts (
+    subject TEXT NOT NULL,
+    age_group TEXT NOT NULL,
+    type TEXT NOT NULL,
+    item_count INTEGER NOT NULL,
+    PRIMARY KEY (subject, age_group, type)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteContentStore:
+    """Indexed content store backed by a single SQLite database file
+
+    Items are keyed by (subject, age group, type) plus a dense position
+    within that group, so random sampling only touches the sampled rows
+    instead of materialising the whole table.
+    """
+
+    def __init__(self, db_path: str):
+        """Open (or create) a content store
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._counts: Optional[Dict[Tuple[str, str, str], int]] = None
+        # Bumped whenever the contents are replaced
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_data_source(cls, db_path: str, data_source_path: str) -> "SQLiteContentStore":
+        """Create a store and import a data_source directory into it
+
+        Args:
+            db_path: Path to the SQLite database file
+            data_source_path: Path to the data_source directory
+
+        Returns:
+            The populated store
+        """
+        store = cls(db_path)
+        store.import_data_source(data_source_path)
+        return store
+
+    def close(self):
+        """Close the database connection"""
+        self._connection.close()
+
+    def import_data_source(self, data_source_path: str) -> int:
+        """Replace the store contents with the JSON files of a data_source
+
+        Args:
+            data_source_path: Path to the data_source directory
+
+        Returns:
+            Number of imported items
+        """
+        counts: Dict[Tuple[str, str, str], int] = {}
+        rows = []
+
+        for subject, directory in STORE_SUBJECTS.items():
+            pattern = os.path.join(data_source_path, directory, "*.json")
+            json_files = sorted(glob.glob(pattern))
+            # Story banks that only exist in JSON Lines form
+            json_files += sorted(
+                path
+                for path in glob.glob(pattern + "l")
+                if path[: -len("l")] not in json_files
+            )
+            for json_file in json_files:
+                source_name = os.path.splitext(os.path.basename(json_file))[0]
+                if json_file.endswith(".jsonl"):
+                    bank = JSONLContentBank(json_file)
+                    data = {source_name: bank.get_items()}
+                    bank.close()
+                else:
+                    with open(json_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+
+                for age_group, item_type, item in _iter_source_items(source_name, data):
+                    key = (subject, age_group, item_type)
+                    position = counts.get(key, 0)
+                    counts[key] = position + 1
+                    rows.append(
+                        (
+                            subject,
+                            age_group,
+                            item_type,
+                            position,
+                            json.dumps(item, ensure_ascii=False),
+                        )
+                    )
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM content_items")
+            self._connection.execute("DELETE FROM content_counts")
+            self._connection.executemany(
+                "INSERT INTO content_items VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._connection.executemany(
+                "INSERT INTO content_counts VALUES (?, ?, ?, ?)",
+                [key + (count,) for key, count in counts.items()],
+            )
+            self._counts = None
+            self.version += 1
+
+        return len(rows)
+
+    def count(self, subject: str, age_group: str, item_type: str) -> int:
+        """Number of items stored for a (subject, age group, type)"""
+        if self._counts is None:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT subject, age_group, type, item_count FROM content_counts"
+                ).fetchall()
+            self._counts = {tuple(row[:3]): row[3] for row in rows}
+        return self._counts.get((subject, age_group, item_type), 0)
+
+    def get_items(
+        self, subject: str, age_group: str, item_type: str
+    ) -> List[Dict[str, Any]]:
+        """Return every item for a (subject, age group, type), in import order"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT payload FROM content_items "
+                "WHERE subject = ? AND age_group = ? AND type = ? ORDER BY position",
+                (subject, age_group, item_type),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def sample(
+        self,
+        subject: str,
+        age_group: str,
+        item_type: str,
+        k: int,
+        rng: Optional[random.Random] = None,
+    ) -> List[Dict[str, Any]]:
+        """Draw k random items (with replacement) for a (subject, age group, type)
+
+        Only the sampled rows are read from the database.
+
+        Args:
+            subject: Subject name (logic, reading)
+            age_group: Target age group (4-5, 6-7, 8-10)
+            item_type: Item type within the subject (e.g. "vocabulary_exercises")
+            k: Number of items to draw
+            rng: Random generator to use (defaults to the random module)
+
+        Returns:
+            List of k items, or an empty list if nothing is stored
+        """
+        total = self.count(subject, age_group, item_type)
+        if total == 0 or k <= 0:
+            return []
+
+        rng = rng or random
+        positions = [rng.randrange(total) for _ in range(k)]
+        wanted = sorted(set(positions))
+        placeholders = ", ".join("?" * len(wanted))
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT position, payload FROM content_items "
+                "WHERE subject = ? AND age_group = ? AND type = ? "
+                f"AND position IN ({placeholders})",
+                (subject, age_group, item_type, *wanted),
+            ).fetchall()
+
+        items = {position: json.loads(payload) for position, payload in rows}
+        return [items[position] for position in positions]
+
+
+def _iter_source_items(
+    source_name: str, data: Dict[str, Any]
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Yield (age_group, type, item) for every item of a JSON source file
+
+    Story files hold a flat list per story level; every other reading and
+    logic file maps age groups either to a list of items or to named
+    categories of items.
+    """
+    if source_name.endswith("_stories"):
+        story_type = source_name[: -len("_stories")]
+        age_group = STORY_AGE_GROUPS.get(story_type, story_type)
+        stories = data.get(source_name, data.get("stories", []))
+        for story in stories:
+            yield age_group, source_name, story
+        return
+
+    for top_key, by_age in data.items():
+        if not isinstance(by_age, dict):
+            continue
+        for age_group, value in by_age.items():
+            if isinstance(value, list):
+                for item in value:
+                    yield age_group, top_key, item
+            elif isinstance(value, dict):
+                for category, items in value.items():
+                    if isinstance(items, list):
+                        for item in items:
+                            yield age_group, category, item
@@ -8,6 +8,10 @@ from .config import (
     VISUAL_SETTINGS,
     PDF_SETTINGS,
 )
+from .capacity import CapacityError, capacity_report
+from .fingerprint import fingerprint
+from .streaming import ProblemStream
+from .uniqueness import BloomScope, ExactScope, UniquenessRegistry, batch_scope
 from .educational_utils import (
     EducationalUtils,
     MathUtils,
@@ -32,6 +36,14 @@ __all__ = [
     "MathUtils",
     "format_time_estimate",
     "get_encouragement_message",
+    "CapacityError",
+    "capacity_report",
+    "fingerprint",
+    "ProblemStream",
+    "UniquenessRegistry",
+    "ExactScope",
+    "BloomScope",
+    "batch_scope",
     "visual_generator",
     "VISUAL_AVAILABLE",
 ]
@@ -0,0 +1,195 @@
+"""
+Capacity planning for the Primary School Worksheet Generator
+How many distinct questions each subject, age group and problem type can produce
+"""
+
+from typing import Any, Dict, List, Optional
+
+AGE_GROUPS = ["4-5", "6-7", "8-10"]
+SUBJECTS = ["math", "logic", "reading"]
+
+# What generate_problems does when a problem type has fewer distinct
+# questions than requested
+SHORTAGE_POLICIES = ("allow", "error", "rebalance")
+
+
+class CapacityError(ValueError):
+    """Raised when a worksheet asks for more distinct questions than exist"""
+
+    def __init__(self, message: str, shortfalls: Dict[str, int]):
+        super().__init__(message)
+        self.shortfalls = shortfalls
+
+
+def find_shortfalls(
+    distribution: Dict[str, int], capacity: Dict[str, Dict[str, Any]]
+) -> Dict[str, int]:
+    """Return how many questions each problem type is short of
+
+    Args:
+        distribution: Requested count per problem type
+        capacity: Output of a generator's get_capacity()
+
+    Returns:
+        {problem_type: missing question count} for every type over capacity
+    """
+    shortfalls = {}
+    for problem_type, requested in distribution.items():
+        available = capacity.get(problem_type, {}).get("available", 0)
+        if requested > available:
+            shortfalls[problem_type] = requested - available
+    return shortfalls
+
+
+def rebalance_distribution(
+    distribution: Dict[str, int], capacity: Dict[str, Dict[str, Any]]
+) -> Dict[str, int]:
+    """Move requests from exhausted problem types to types with spare capacity
+
+    Overflow is handed out one question at a time to the type with the most
+    spare capacity, which keeps the mix as close to the requested one as
+    possible. If the total request exceeds the total capacity, the remaining
+    overflow stays on its original type.
+
+    Args:
+        distribution: Requested count per problem type
+        capacity: Output of a generator's get_capacity()
+
+    Returns:
+        New distribution with the same total count
+    """
+    available = {
+        problem_type: capacity.get(problem_type, {}).get("available", 0)
+        for problem_type in distribution
+    }
+    balanced = {
+        problem_type: min(requested, available[problem_type])
+        for problem_type, requested in distribution.items()
+    }
+    overflow = sum(distribution.values()) - sum(balanced.values())
+
+    while overflow > 0:
+        spare_type = max(balanced, key=lambda t: available[t] - balanced[t], default=None)
+        if spare_type is None or available[spare_type] <= balanced[spare_type]:
+            break
+        balanced[spare_type] += 1
+        overflow -= 1
+
+    # Whatever cannot be placed stays where it was requested
+    for problem_type, shortfall in find_shortfalls(distribution, capacity).items():
+        if overflow <= 0:
+            break
+        extra = min(shortfall, overflow)
+        balanced[problem_type] += extra
+        overflow -= extra
+
+    return balanced
+
+
+def diversity_window(
+    distribution: Dict[str, int], capacity: Dict[str, Dict[str, Any]]
+) -> int:
+    """How many worksheets in a row can avoid sharing any question
+
+    Limited by the problem type that runs out first; beyond this many
+    worksheets questions have to come back (or fall back to generic ones).
+
+    Args:
+        distribution: Requested count per problem type on one worksheet
+        capacity: Output of a generator's get_capacity()
+
+    Returns:
+        Number of worksheets, at least 1
+    """
+    windows = [
+        capacity.get(problem_type, {}).get("available", 0) // requested
+        for problem_type, requested in distribution.items()
+        if requested > 0
+    ]
+    return max(1, min(windows, default=1))
+
+
+def apply_shortage_policy(
+    subject: str,
+    age_group: str,
+    distribution: Dict[str, int],
+    capacity: Dict[str, Dict[str, Any]],
+    on_shortage: str,
+) -> Dict[str, int]:
+    """Check a distribution against capacity before generating anything
+
+    Args:
+        subject: Subject name, used in messages
+        age_group: Target age group, used in messages
+        distribution: Requested count per problem type
+        capacity: Output of a generator's get_capacity()
+        on_shortage: "allow" (keep the distribution; fallbacks and duplicates
+            fill the gap), "error" (raise CapacityError) or "rebalance"
+
+    Returns:
+        The distribution to generate
+
+    Raises:
+        CapacityError: With on_shortage="error" when any type is over capacity
+    """
+    if on_shortage not in SHORTAGE_POLICIES:
+        raise ValueError(
+            f"on_shortage must be one of {', '.join(SHORTAGE_POLICIES)}, not {on_shortage!r}"
+        )
+
+    shortfalls = find_shortfalls(distribution, capacity)
+    if not shortfalls or on_shortage == "allow":
+        return distribution
+
+    details = ", ".join(
+        f"{problem_type} needs {distribution[problem_type]} but has "
+        f"{capacity.get(problem_type, {}).get('available', 0)}"
+        for problem_type in shortfalls
+    )
+    if on_shortage == "error":
+        raise CapacityError(
+            f"Not enough distinct {subject} questions for ages {age_group}: {details}",
+            shortfalls,
+        )
+
+    balanced = rebalance_distribution(distribution, capacity)
+    remaining = find_shortfalls(balanced, capacity)
+    if remaining:
+        print(
+            f"⚠️ Only {sum(distribution.values()) - sum(remaining.values())} distinct "
+            f"{subject} questions available for ages {age_group}; the rest may repeat"
+        )
+    return balanced
+
+
+def capacity_report(
+    subjects: Optional[List[str]] = None,
+    age_groups: Optional[List[str]] = None,
+    data_source=None,
+) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+    """Distinct question capacity for every subject, age group and problem type
+
+    Args:
+        subjects: Subjects to include (default: math, logic, reading)
+        age_groups: Age groups to include (default: 4-5, 6-7, 8-10)
+        data_source: Optional DataSourceLoader (content pack) to plan for
+
+    Returns:
+        {subject: {age_group: {problem_type: {"available": int, "exact": bool}}}}
+    """
+    from ..core import LogicGenerator, MathGenerator, ReadingGenerator
+
+    generator_classes = {
+        "math": MathGenerator,
+        "logic": LogicGenerator,
+        "reading": ReadingGenerator,
+    }
+
+    report = {}
+    for subject in subjects or SUBJECTS:
+        generator = generator_classes[subject](data_source)
+        report[subject] = {
+            age_group: generator.get_capacity(age_group)
+            for age_group in age_groups or AGE_GROUPS
+        }
+    return report
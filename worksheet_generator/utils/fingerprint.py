@@ -0,0 +1,42 @@
+"""
+Question fingerprints for the Primary School Worksheet Generator
+Stable 64-bit identifiers for uniqueness tracking
+"""
+
+from hashlib import blake2b
+from typing import Any
+
+# Separators that cannot appear in the tagged encoding of numbers
+_FIELD_SEPARATOR = "\x1e"
+_ITEM_SEPARATOR = "\x1f"
+
+
+def _canonical(part: Any) -> str:
+    """Type-tagged text form of one fingerprint component"""
+    if isinstance(part, str):
+        return "s" + part
+    if isinstance(part, bool):
+        return "b1" if part else "b0"
+    if isinstance(part, int):
+        return "i" + str(part)
+    if isinstance(part, (tuple, list)):
+        return "(" + _ITEM_SEPARATOR.join(_canonical(item) for item in part) + ")"
+    return "r" + repr(part)
+
+
+def fingerprint(*parts: Any) -> int:
+    """Return a stable 64-bit fingerprint of a problem's canonical parts
+
+    Unlike ``hash()``, the value does not depend on PYTHONHASHSEED, so it can
+    be persisted, shared between worker processes and compared across runs.
+    The first part is conventionally the question kind (e.g. "add", "vocab").
+
+    Args:
+        *parts: Strings, integers, or tuples/lists of them
+
+    Returns:
+        Unsigned 64-bit integer
+    """
+    text = _FIELD_SEPARATOR.join(_canonical(part) for part in parts)
+    digest = blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
@@ -0,0 +1,137 @@
+"""
+Sampling helpers for the Primary School Worksheet Generator
+Draw problems from enumerated problem spaces without replacement
+"""
+
+import random
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+
+class LazyPermutation:
+    """Random permutation of range(n), produced one element at a time
+
+    This is a Fisher–Yates shuffle where only the swapped positions are
+    stored, so each draw is O(1) and memory grows with the number of draws
+    rather than with n. Every index is returned exactly once.
+    """
+
+    def __init__(self, n: int, rng: random.Random = None):
+        """Initialize the permutation
+
+        Args:
+            n: Size of the index range
+            rng: Random generator to use (defaults to the random module)
+        """
+        self.n = n
+        self.rng = rng or random
+        self._drawn = 0
+        self._swaps: Dict[int, int] = {}
+
+    @property
+    def remaining(self) -> int:
+        """Number of indices not drawn yet"""
+        return self.n - self._drawn
+
+    def draw(self) -> int:
+        """Return the next index of the permutation
+
+        Raises:
+            IndexError: If every index has been drawn
+        """
+        if self._drawn >= self.n:
+            raise IndexError("permutation exhausted")
+
+        i = self._drawn
+        j = self.rng.randrange(i, self.n)
+        value = self._swaps.get(j, j)
+        # Position j now holds what was at position i
+        self._swaps[j] = self._swaps.pop(i, i)
+        self._drawn += 1
+        return value
+
+    def __iter__(self):
+        while self.remaining:
+            yield self.draw()
+
+
+class RowSpace:
+    """Finite space of (row, column) pairs with a column range per row
+
+    Each row value has an inclusive ``[low, high]`` range of column values,
+    e.g. the first and second operand of an arithmetic problem. Pairs are
+    numbered 0..size-1 row by row and ``unrank`` maps a number back to its
+    pair with a binary search over the cumulative row widths.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, int, int]]):
+        """Initialize the space
+
+        Args:
+            rows: (row value, lowest column, highest column) triples; rows
+                with an empty column range are ignored
+        """
+        self._rows: List[Tuple[int, int]] = []
+        self._starts: List[int] = []
+        size = 0
+        for row, low, high in rows:
+            if high < low:
+                continue
+            self._rows.append((row, low))
+            self._starts.append(size)
+            size += high - low + 1
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def segments(self) -> List[Tuple[int, int, int]]:
+        """(first pair number, row value, lowest column) of every row"""
+        return [
+            (start, row, low) for start, (row, low) in zip(self._starts, self._rows)
+        ]
+
+    def unrank(self, index: int) -> Tuple[int, int]:
+        """Return the pair with the given number"""
+        if not 0 <= index < self.size:
+            raise IndexError("pair index out of range")
+        position = bisect_right(self._starts, index) - 1
+        row, low = self._rows[position]
+        return row, low + index - self._starts[position]
+
+
+class SpaceSampler:
+    """Draws pairs of a RowSpace without replacement
+
+    Once every pair has been drawn a new permutation is started, so repeats
+    only happen after the whole space has been used.
+    """
+
+    def __init__(self, space: RowSpace, rng: random.Random = None):
+        self.space = space
+        self.rng = rng or random
+        self._permutation = LazyPermutation(space.size, self.rng)
+        self._restarts = 0
+
+    @property
+    def remaining(self) -> int:
+        """Pairs left before the space is exhausted"""
+        return self._permutation.remaining
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every pair has been drawn at least once"""
+        return self._restarts > 0 or self._permutation.remaining == 0
+
+    def draw(self) -> Tuple[int, int]:
+        """Return the next pair
+
+        Raises:
+            ValueError: If the space is empty
+        """
+        if self.space.size == 0:
+            raise ValueError("cannot sample from an empty problem space")
+        if self._permutation.remaining == 0:
+            self._permutation = LazyPermutation(self.space.size, self.rng)
+            self._restarts += 1
+        return self.space.unrank(self._permutation.draw())
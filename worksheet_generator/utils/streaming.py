@@ -0,0 +1,139 @@
+"""
+Problem streams for the Primary School Worksheet Generator
+Lazily generated problems for clients that read one at a time and stop early
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+# Problems per cycle of an unbounded stream (a typical worksheet)
+DEFAULT_STREAM_CYCLE = 20
+
+
+class ProblemStream:
+    """Iterator over problems of one generator, interleaved by problem type
+
+    Types are drawn without replacement from a cycle of type counts (by
+    default the generator's structured distribution), so every complete
+    cycle has exactly those counts in random order, as a shuffled worksheet
+    would. A problem is only generated when it is read and the generator's
+    uniqueness registry keeps growing for the whole stream.
+
+    ``cursor`` records where the stream is; passing it to the generator's
+    iter_problems() later resumes the stream (see open_stream).
+    """
+
+    def __init__(
+        self,
+        make_problem: Callable[[str], Dict],
+        distribution: Dict[str, int],
+        rng,
+        seed: int,
+    ):
+        """Initialize the stream
+
+        Args:
+            make_problem: Generates one problem of the given type
+            distribution: Problem type counts per cycle
+            rng: random.Random used by the generator
+            seed: Seed the generator's rng was started from
+        """
+        self.distribution = {
+            problem_type: count
+            for problem_type, count in distribution.items()
+            if count > 0
+        }
+        if not self.distribution:
+            raise ValueError("distribution must request at least one problem")
+
+        self._make_problem = make_problem
+        self._rng = rng
+        self.seed = seed
+        self.position = 0
+        self.limit: Optional[int] = None
+        self._remaining: Dict[str, int] = {}
+
+    @property
+    def cursor(self) -> Dict[str, Any]:
+        """JSON-serialisable position of the stream"""
+        return {
+            "seed": self.seed,
+            "position": self.position,
+            "distribution": dict(self.distribution),
+        }
+
+    def __iter__(self) -> "ProblemStream":
+        return self
+
+    def __next__(self) -> Dict:
+        if self.limit is not None and self.position >= self.limit:
+            raise StopIteration
+        problem = self._make_problem(self._next_type())
+        self.position += 1
+        return problem
+
+    def _next_type(self) -> str:
+        """Draw the next problem type from what is left of the cycle"""
+        if not self._remaining:
+            self._remaining = dict(self.distribution)
+
+        pick = self._rng.randrange(sum(self._remaining.values()))
+        for problem_type, count in self._remaining.items():
+            if pick < count:
+                break
+            pick -= count
+
+        if count == 1:
+            del self._remaining[problem_type]
+        else:
+            self._remaining[problem_type] = count - 1
+        return problem_type
+
+
+def open_stream(
+    generator,
+    make_problem: Callable[[str], Dict],
+    distribution: Dict[str, int],
+    limit: Optional[int] = None,
+    cursor: Optional[Dict[str, Any]] = None,
+) -> ProblemStream:
+    """Start or resume a generator's problem stream
+
+    A new stream draws its seed from the generator's rng (so seeded
+    generators give reproducible streams) and resets the generator's
+    uniqueness tracking. Resuming reseeds the generator and replays the
+    first ``position`` problems to rebuild the uniqueness state, so it costs
+    O(position) problems. The replay runs with the batch scope detached:
+    the original stream's keys are already in a shared scope and would make
+    the replay diverge. Only problems after the cursor are added to it.
+    The replay matches the original stream when the scope rejected none of
+    its first ``position`` problems, e.g. when it held no other questions.
+
+    Args:
+        generator: MathGenerator, LogicGenerator or ReadingGenerator
+        make_problem: Generates one problem of the given type
+        distribution: Problem type counts per cycle (ignored when resuming;
+            the cursor's distribution is used)
+        limit: Most problems to yield from here, or None for no end
+        cursor: ProblemStream.cursor of an earlier stream
+
+    Returns:
+        The stream, positioned at the cursor
+    """
+    if cursor is None:
+        seed, position = generator.rng.getrandbits(64), 0
+    else:
+        seed, position = cursor["seed"], cursor["position"]
+        distribution = cursor["distribution"]
+
+    generator.rng.seed(seed)
+    generator.reset_generated_questions()
+    stream = ProblemStream(make_problem, distribution, generator.rng, seed)
+    scope, generator.registry.scope = generator.registry.scope, None
+    try:
+        for _ in range(position):
+            next(stream)
+    finally:
+        generator.registry.scope = scope
+    if limit is not None:
+        stream.limit = position + limit
+    return stream
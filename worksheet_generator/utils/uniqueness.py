@@ -0,0 +1,322 @@
+"""
+Uniqueness tracking for the Primary School Worksheet Generator
+Per-type registry of the questions generated for a worksheet, and scopes
+that keep questions unique across every worksheet of a batch
+"""
+
+import math
+import sys
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .capacity import diversity_window
+from .fingerprint import fingerprint
+
+# Batches expected to hold more questions than this use a Bloom filter
+EXACT_SCOPE_LIMIT = 100_000
+
+
+class ExactScope:
+    """Batch-wide set of question fingerprints
+
+    Never rejects a new question by mistake; memory grows by roughly 60
+    bytes per question.
+    """
+
+    kind = "exact"
+
+    def __init__(self, capacity: Optional[int] = None):
+        """Initialize the scope
+
+        Args:
+            capacity: Expected number of questions, only used to report
+                saturation
+        """
+        self.capacity = capacity
+        self._keys: Set[int] = set()
+
+    def add(self, key: int) -> bool:
+        """Record a fingerprint; False if the batch already has it"""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the scope"""
+        return sys.getsizeof(self._keys) + len(self._keys) * sys.getsizeof(2**63)
+
+    @property
+    def saturation(self) -> float:
+        """Questions recorded relative to the expected capacity"""
+        return len(self._keys) / self.capacity if self.capacity else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory use and saturation of the scope"""
+        return {
+            "kind": self.kind,
+            "questions": len(self),
+            "capacity": self.capacity,
+            "memory_bytes": self.memory_bytes,
+            "saturation": self.saturation,
+            "false_positive_rate": 0.0,
+        }
+
+
+class BloomScope:
+    """Batch-wide Bloom filter of question fingerprints
+
+    Memory is fixed when the scope is created: about 1.44 * log2(1 / p)
+    bits per expected question. A question is reported as already used
+    with probability p even when it is new, which only means a different
+    question gets picked. Fingerprints are already uniform 64-bit values,
+    so the bit positions come from splitting them into two halves (double
+    hashing) instead of hashing again.
+    """
+
+    kind = "bloom"
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001):
+        """Initialize the filter
+
+        Args:
+            capacity: Expected number of questions in the batch
+            false_positive_rate: Target rate of new questions wrongly
+                rejected once the filter holds capacity questions
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.target_false_positive_rate = false_positive_rate
+        self.bit_count = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self._bits_set = 0
+        self._count = 0
+
+    def _positions(self, key: int):
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, key: int) -> bool:
+        """Record a fingerprint; False if the batch (probably) has it"""
+        bits = self._bits
+        new = False
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                self._bits_set += 1
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def __contains__(self, key: int) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def __len__(self) -> int:
+        """Questions accepted so far"""
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory held by the bit array"""
+        return sys.getsizeof(self._bits)
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of bits set (about 0.5 at the designed capacity)"""
+        return self._bits_set / self.bit_count
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Current probability of rejecting a new question"""
+        return self.saturation**self.hash_count
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory use and saturation of the scope"""
+        return {
+            "kind": self.kind,
+            "questions": len(self),
+            "capacity": self.capacity,
+            "memory_bytes": self.memory_bytes,
+            "saturation": self.saturation,
+            "false_positive_rate": self.false_positive_rate,
+        }
+
+
+def batch_scope(
+    expected_questions: int,
+    false_positive_rate: float = 0.001,
+    exact_limit: int = EXACT_SCOPE_LIMIT,
+):
+    """Create a uniqueness scope to share across a batch of worksheets
+
+    Pass the scope to every MathGenerator, LogicGenerator and
+    ReadingGenerator of the batch; a question used on one worksheet is then
+    avoided on all the others for as long as the problem space allows.
+
+    Args:
+        expected_questions: Total questions across the batch
+        false_positive_rate: Target error rate if a Bloom filter is used
+        exact_limit: Largest batch that gets an exact set
+
+    Returns:
+        ExactScope for batches up to exact_limit questions, else BloomScope
+    """
+    if expected_questions <= exact_limit:
+        return ExactScope(expected_questions)
+    return BloomScope(expected_questions, false_positive_rate)
+
+
+def fill_worksheets(
+    generator,
+    subject: str,
+    plan: Callable[[Optional[Dict[str, Dict]]], Dict[str, int]],
+    fill: Callable[[Dict[str, int]], List],
+    age_group: str,
+    count: int,
+    n: int,
+    diverse: bool = True,
+    on_shortage: str = "allow",
+) -> List[List]:
+    """Generate n worksheets of one generator from a single plan
+
+    The distribution and the capacity are worked out once for the whole run
+    instead of once per worksheet. With ``diverse``, worksheets share a
+    batch scope while every problem type still has unused questions; then a
+    new scope starts, so later worksheets repeat earlier questions instead
+    of filling up with fallbacks. A scope passed to the generator is used
+    instead if present.
+
+    Args:
+        generator: MathGenerator, LogicGenerator or ReadingGenerator
+        subject: Subject shown in the printed distribution, e.g. "📊 Math"
+        plan: Problem type counts of a worksheet, given the capacity (or
+            None when it is not needed)
+        fill: Generates one worksheet from the problem type counts
+        age_group: Target age group (4-5, 6-7, 8-10)
+        count: Number of problems per worksheet
+        n: Number of worksheets
+        diverse: Avoid repeating a question on different worksheets for as
+            long as the problem space allows (see diversity_window)
+        on_shortage: Shortage policy, as for generate_problems
+
+    Returns:
+        List of n worksheets, each a list of problems
+    """
+    # Capacity is only needed to plan diversity or a shortage policy
+    own_scope = diverse and generator.registry.scope is None
+    capacity = (
+        generator.get_capacity(age_group)
+        if own_scope or on_shortage != "allow"
+        else None
+    )
+    distribution = plan(capacity)
+
+    print(
+        f"{subject} problem distribution for {n} worksheets of {count} questions "
+        f"(age {age_group}):"
+    )
+    for problem_type, type_count in distribution.items():
+        if type_count > 0:
+            print(f"   • {problem_type.title()}: {type_count} problems")
+
+    if not own_scope:
+        return [fill(distribution) for _ in range(n)]
+
+    window = diversity_window(distribution, capacity)
+    worksheets = []
+    try:
+        for index in range(n):
+            if index % window == 0:
+                generator.registry.scope = batch_scope(count * min(window, n - index))
+            worksheets.append(fill(distribution))
+    finally:
+        generator.registry.scope = None
+    return worksheets
+
+
+class UniquenessRegistry:
+    """Fingerprints of generated questions, kept per question kind
+
+    Kinds are short names such as "vocab" or "vocab_fallback". The part
+    before the first underscore is the kind's family, so "vocab_fallback"
+    and "vocab_dynamic" are also counted as "vocab". Every count is kept up
+    to date on insert, so reading one is O(1) however many questions the
+    worksheet already has.
+
+    An optional batch scope is consulted as well: questions already used on
+    another worksheet of the batch count as duplicates. clear() only resets
+    the worksheet, never the scope.
+    """
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self._keys: Dict[str, Set[int]] = defaultdict(set)
+        self._family_counts: Counter = Counter()
+
+    def add(self, kind: str, *parts) -> bool:
+        """Record a question of the given kind
+
+        Args:
+            kind: Question kind, e.g. "add" or "reasoning_fallback"
+            *parts: Canonical parts of the question (see fingerprint())
+
+        Returns:
+            True if the question is new, False if it was already recorded
+            on this worksheet or in the batch scope
+        """
+        keys = self._keys[kind]
+        question_key = fingerprint(kind, *parts)
+        if question_key in keys:
+            return False
+        if self.scope is not None and not self.scope.add(question_key):
+            return False
+        keys.add(question_key)
+        self._family_counts[kind.split("_", 1)[0]] += 1
+        return True
+
+    def count(self, kind: str) -> int:
+        """Number of questions recorded with exactly this kind"""
+        keys = self._keys.get(kind)
+        return len(keys) if keys else 0
+
+    def family_count(self, family: str) -> int:
+        """Number of questions whose kind belongs to the family"""
+        return self._family_counts[family]
+
+    def keys(self, kind: str) -> Set[int]:
+        """Fingerprints recorded for a kind (read-only view by convention)"""
+        return self._keys.get(kind, set())
+
+    def kinds(self) -> Dict[str, int]:
+        """{kind: count} for every kind recorded so far"""
+        return {kind: len(keys) for kind, keys in self._keys.items() if keys}
+
+    def clear(self):
+        """Forget every recorded question"""
+        self._keys.clear()
+        self._family_counts.clear()
+
+    def __len__(self) -> int:
+        return sum(self._family_counts.values())